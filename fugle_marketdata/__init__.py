@@ -1,7 +1,7 @@
-from .rest import RestClientFactory as RestClient
-from .websocket import WebSocketClientFactory as WebSocketClient, HealthCheckConfig
+from .rest import RestClientFactory as RestClient, AsyncRestClientFactory as AsyncRestClient, ConnectionPoolConfig, RateLimitConfig, RetryConfig, CacheConfig, ConditionalConfig
+from .websocket import WebSocketClientFactory as WebSocketClient, AsyncWebSocketClientFactory as AsyncWebSocketClient, HealthCheckConfig, ReconnectConfig, DispatchConfig, ConflationConfig, WebSocketPool
 from .exceptions import FugleAPIError
 
 __version__ = '2.4.1'
 
-__all__ = ['RestClient', 'WebSocketClient', 'HealthCheckConfig', 'FugleAPIError', '__version__']
+__all__ = ['RestClient', 'AsyncRestClient', 'ConnectionPoolConfig', 'RateLimitConfig', 'RetryConfig', 'CacheConfig', 'ConditionalConfig', 'WebSocketClient', 'AsyncWebSocketClient', 'HealthCheckConfig', 'ReconnectConfig', 'DispatchConfig', 'ConflationConfig', 'WebSocketPool', 'FugleAPIError', '__version__']
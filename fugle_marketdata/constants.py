@@ -1,6 +1,9 @@
+from datetime import timedelta, timezone
+
 FUGLE_MARKETDATA_API_REST_BASE_URL = 'https://api.fugle.tw/marketdata'
 FUGLE_MARKETDATA_API_WEBSOCKET_BASE_URL = 'wss://api.fugle.tw/marketdata'
 FUGLE_MARKETDATA_API_VERSION = 'v1.0'
+FUGLE_MARKETDATA_TIMEZONE = timezone(timedelta(hours=8))
 
 CONNECT_EVENT = 'connect'
 DISCONNECT_EVENT = 'disconnect'
@@ -8,6 +11,10 @@ MESSAGE_EVENT = 'message'
 ERROR_EVENT = 'error'
 AUTHENTICATED_EVENT = 'authenticated'
 UNAUTHENTICATED_EVENT = 'unauthenticated'
+RECONNECT_EVENT = 'reconnect'
+BACKFILL_EVENT = 'backfill'
 UNAUTHENTICATED_MESSAGE = 'Invalid authentication credentials'
 AUTHENTICATION_TIMEOUT_MESSAGE = 'authentication timeout'
 MISSING_CREDENTIALS_MESSAGE= 'missing authentication credentials'
+CONNECTION_TIMEOUT_MESSAGE = 'connection timeout'
+CONNECTION_CLOSED_MESSAGE = 'connection closed before authentication'
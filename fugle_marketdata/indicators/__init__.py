@@ -0,0 +1,3 @@
+from .engine import LocalTechnical
+from .streaming import IndicatorStream, SMA, EMA, RSI, KDJ, MACD, BB
+from . import functions
@@ -0,0 +1,237 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import List
+from ..constants import FUGLE_MARKETDATA_TIMEZONE
+from ..exceptions import FugleAPIError
+from ..rest.batch import BatchResult, pop_batch_options
+from ..rest.chunking import INTRADAY_TIMEFRAMES
+from ..store.candle_store import date_to_ms
+from . import functions
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# 每個指標的參數預設值、輸出欄位，以及計算所需的暖機 K 棒數
+INDICATORS = {
+    'sma': {
+        'params': {'period': 20},
+        'fields': ('sma',),
+        'warmup': lambda p: p['period'],
+    },
+    'rsi': {
+        'params': {'period': 6},
+        'fields': ('rsi',),
+        # Wilder 平滑需要較長的資料才會收斂
+        'warmup': lambda p: max(p['period'] * 10, 100),
+    },
+    'kdj': {
+        'params': {'rPeriod': 9, 'kPeriod': 3, 'dPeriod': 3},
+        'fields': ('k', 'd', 'j'),
+        'warmup': lambda p: p['rPeriod'] + max(p['kPeriod'], p['dPeriod']) * 20,
+    },
+    'macd': {
+        'params': {'fast': 12, 'slow': 26, 'signal': 9},
+        'fields': ('macdLine', 'signalLine'),
+        'warmup': lambda p: (max(p['fast'], p['slow']) + p['signal']) * 5,
+    },
+    'bb': {
+        'params': {'period': 20, 'stdDev': 2},
+        'fields': ('upper', 'middle', 'lower'),
+        'warmup': lambda p: p['period'],
+    },
+}
+
+CANDLE_FIELDS = 'open,high,low,close,volume'
+# 一個交易日約 270 分鐘
+TRADING_MINUTES = 270
+
+
+def warmup_days(bars: int, timeframe: str) -> int:
+    """將暖機 K 棒數換算成需往前多抓的日曆天數 (含週末與假日)"""
+    if timeframe == 'W':
+        return bars * 7 + 7
+    if timeframe == 'M':
+        return bars * 31 + 31
+    if timeframe in INTRADAY_TIMEFRAMES:
+        bars = math.ceil(bars * int(timeframe) / TRADING_MINUTES)
+    return bars * 7 // 5 + 10
+
+
+def _parse_date(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def _format_dates(dates_ms, timeframe):
+    if timeframe in INTRADAY_TIMEFRAMES:
+        return [
+            datetime.fromtimestamp(ms / 1000, FUGLE_MARKETDATA_TIMEZONE).isoformat(timespec='milliseconds')
+            for ms in dates_ms.tolist()
+        ]
+    # 日 K 以台北時間 00:00 存放
+    offset = np.timedelta64(8, 'h')
+    return np.datetime_as_string(np.asarray(dates_ms, dtype='datetime64[ms]') + offset, unit='D').tolist()
+
+
+class LocalTechnical:
+    """
+    以本地 K 線計算技術指標，參數名稱與回傳格式與 client.stock.technical 相同
+
+    資料來源為 historical (client.stock.historical) 或 store (CandleStore)，
+    *_many 方法會先取得所有 symbol 的 K 線，再以 2 維陣列一次計算
+    """
+
+    def __init__(self, historical=None, store=None, concurrency: int = 8):
+        if np is None:
+            raise ImportError('LocalTechnical requires numpy, install it with "pip install fugle-marketdata[numpy]"')
+        if historical is None and store is None:
+            raise ValueError('either historical or store is required')
+        self.historical = historical
+        self.store = store
+        self.concurrency = concurrency
+
+    def _load(self, symbol, start, end, timeframe, warmup):
+        # 回傳 (dates_ms, high, low, close)，依時間排序
+        fetch_start = None if start is None else start - timedelta(days=warmup_days(warmup, timeframe))
+        if self.store is not None:
+            columns = self.store.query(symbol, fetch_start, end, timeframe)
+            if columns is None:
+                raise FugleAPIError(f'no candles stored for {symbol}', params={'symbol': symbol, 'timeframe': timeframe})
+            return (np.asarray(columns['date']), np.asarray(columns['high']),
+                    np.asarray(columns['low']), np.asarray(columns['close']))
+
+        params = {'symbol': symbol, 'timeframe': timeframe, 'fields': CANDLE_FIELDS, 'sort': 'asc'}
+        if fetch_start is not None:
+            params['from'] = fetch_start.isoformat()
+        if end is not None:
+            params['to'] = end.isoformat()
+        columns = self.historical.candles(format='columnar', **params)
+        if 'date' not in columns:
+            empty = np.empty(0)
+            return np.empty(0, dtype=np.int64), empty, empty, empty
+        order = np.argsort(columns['date'], kind='stable')
+        return columns['date'][order], columns['high'][order], columns['low'][order], columns['close'][order]
+
+    @staticmethod
+    def _compute(name, high, low, close, params):
+        if name == 'kdj':
+            return functions.kdj(high, low, close, **params)
+        if name in ('sma', 'rsi'):
+            return {name: getattr(functions, name)(close, **params)}
+        return getattr(functions, name)(close, **params)
+
+    @staticmethod
+    def _split(params):
+        params = dict(params)
+        timeframe = str(params.pop('timeframe', 'D'))
+        start = params.pop('from', None)
+        end = params.pop('to', None)
+        start = _parse_date(start) if start is not None else None
+        end = _parse_date(end) if end is not None else None
+        return timeframe, start, end, params
+
+    def _indicator_params(self, name, params):
+        spec = INDICATORS[name]
+        unknown = set(params) - set(spec['params'])
+        if unknown:
+            raise ValueError(f'unsupported {name} params: {", ".join(sorted(unknown))}')
+        return {**spec['params'], **params}
+
+    def _build(self, name, symbol, loaded, values, timeframe, start, end, indicator_params):
+        dates_ms = loaded[0]
+        fields = INDICATORS[name]['fields']
+        valid = ~np.isnan(values[fields[0]])
+        for field in fields[1:]:
+            valid &= ~np.isnan(values[field])
+        if start is not None:
+            valid &= dates_ms >= date_to_ms(start)
+        index = np.flatnonzero(valid)
+        dates = _format_dates(dates_ms[index], timeframe)
+        columns = [values[field][index].tolist() for field in fields]
+        data = [{'date': d, **{field: column[i] for field, column in zip(fields, columns)}} for i, d in enumerate(dates)]
+
+        response = {'symbol': symbol}
+        if start is not None:
+            response['from'] = start.isoformat()
+        if end is not None:
+            response['to'] = end.isoformat()
+        response['timeframe'] = timeframe
+        response.update(indicator_params)
+        response['data'] = data
+        return response
+
+    def _calculate(self, name, **params):
+        symbol = params.pop('symbol')
+        timeframe, start, end, indicator_params = self._split(params)
+        indicator_params = self._indicator_params(name, indicator_params)
+        loaded = self._load(symbol, start, end, timeframe, INDICATORS[name]['warmup'](indicator_params))
+        values = self._compute(name, loaded[1], loaded[2], loaded[3], indicator_params)
+        return self._build(name, symbol, loaded, values, timeframe, start, end, indicator_params)
+
+    def _calculate_many(self, name, **params) -> List[BatchResult]:
+        params = {'concurrency': self.concurrency, **params}
+        symbols, concurrency, _ = pop_batch_options(params)
+        timeframe, start, end, indicator_params = self._split(params)
+        indicator_params = self._indicator_params(name, indicator_params)
+        warmup = INDICATORS[name]['warmup'](indicator_params)
+
+        def load(symbol):
+            try:
+                return symbol, self._load(symbol, start, end, timeframe, warmup), None
+            except FugleAPIError as error:
+                return symbol, None, error
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            loaded = list(executor.map(load, symbols))
+
+        # 依 K 棒數分組，同組的 symbol 疊成 2 維陣列一次計算
+        groups = {}
+        for position, (symbol, candles, error) in enumerate(loaded):
+            if candles is not None:
+                groups.setdefault(len(candles[0]), []).append(position)
+
+        results = [BatchResult(symbol, error=error) for symbol, _, error in loaded]
+        for positions in groups.values():
+            high = np.stack([loaded[p][1][1] for p in positions])
+            low = np.stack([loaded[p][1][2] for p in positions])
+            close = np.stack([loaded[p][1][3] for p in positions])
+            values = self._compute(name, high, low, close, indicator_params)
+            for row, position in enumerate(positions):
+                symbol, candles, _ = loaded[position]
+                row_values = {field: array[row] for field, array in values.items()}
+                results[position] = BatchResult(symbol, data=self._build(
+                    name, symbol, candles, row_values, timeframe, start, end, indicator_params
+                ))
+        return results
+
+    def sma(self, **params):
+        return self._calculate('sma', **params)
+
+    def sma_many(self, **params):
+        return self._calculate_many('sma', **params)
+
+    def rsi(self, **params):
+        return self._calculate('rsi', **params)
+
+    def rsi_many(self, **params):
+        return self._calculate_many('rsi', **params)
+
+    def kdj(self, **params):
+        return self._calculate('kdj', **params)
+
+    def kdj_many(self, **params):
+        return self._calculate_many('kdj', **params)
+
+    def macd(self, **params):
+        return self._calculate('macd', **params)
+
+    def macd_many(self, **params):
+        return self._calculate_many('macd', **params)
+
+    def bb(self, **params):
+        return self._calculate('bb', **params)
+
+    def bb_many(self, **params):
+        return self._calculate_many('bb', **params)
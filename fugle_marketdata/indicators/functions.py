@@ -0,0 +1,130 @@
+"""
+向量化技術指標
+
+輸入為依時間排序 (舊到新) 的 1 維陣列，或 (symbol 數, K 棒數) 的 2 維陣列，
+沿最後一個維度計算；資料不足的位置為 NaN
+"""
+from typing import Dict
+
+try:
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def _as_array(values):
+    return np.asarray(values, dtype=np.float64)
+
+
+def _check_period(period, name='period'):
+    if period < 1:
+        raise ValueError(f'{name} must be at least 1')
+
+
+def sma(close, period: int = 20):
+    _check_period(period)
+    close = _as_array(close)
+    out = np.full(close.shape, np.nan)
+    if close.shape[-1] < period:
+        return out
+    total = np.cumsum(close, axis=-1)
+    out[..., period - 1] = total[..., period - 1]
+    out[..., period:] = total[..., period:] - total[..., :-period]
+    out[..., period - 1:] /= period
+    return out
+
+
+def smooth(values, alpha: float, start: int, seed):
+    """遞迴平滑 y[t] = alpha * x[t] + (1 - alpha) * y[t - 1]，y[start] = seed，沿時間逐步、跨 symbol 向量化"""
+    values = _as_array(values)
+    out = np.full(values.shape, np.nan)
+    if start >= values.shape[-1]:
+        return out
+    # 轉成時間在第一維的連續陣列，逐步計算時每一步都是連續記憶體
+    series = np.ascontiguousarray(np.moveaxis(values, -1, 0))
+    result = np.moveaxis(out, -1, 0).copy()
+    previous = result[start] = seed
+    decay = 1 - alpha
+    for t in range(start + 1, series.shape[0]):
+        previous = alpha * series[t] + decay * previous
+        result[t] = previous
+    return np.moveaxis(result, 0, -1)
+
+
+def ema(close, period: int, offset: int = 0):
+    # 以前 period 筆的 SMA 作為起始值; offset: 前面無效 (NaN) 資料的筆數
+    _check_period(period)
+    close = _as_array(close)
+    start = offset + period - 1
+    if start >= close.shape[-1]:
+        return np.full(close.shape, np.nan)
+    seed = close[..., offset:start + 1].mean(axis=-1)
+    return smooth(close, 2 / (period + 1), start, seed)
+
+
+def rsi(close, period: int = 6):
+    # Wilder 平滑: 以前 period 筆漲跌的平均為起始值
+    _check_period(period)
+    close = _as_array(close)
+    out = np.full(close.shape, np.nan)
+    if close.shape[-1] <= period:
+        return out
+    change = np.diff(close, axis=-1)
+    gain = np.where(change > 0, change, 0.0)
+    loss = np.where(change < 0, -change, 0.0)
+    alpha = 1 / period
+    avg_gain = smooth(gain, alpha, period - 1, gain[..., :period].mean(axis=-1))
+    avg_loss = smooth(loss, alpha, period - 1, loss[..., :period].mean(axis=-1))
+    total = avg_gain + avg_loss
+    with np.errstate(invalid='ignore', divide='ignore'):
+        value = np.where(total > 0, 100 * avg_gain / total, 50.0)
+    out[..., 1:] = np.where(np.isnan(avg_gain), np.nan, value)
+    return out
+
+
+def kdj(high, low, close, rPeriod: int = 9, kPeriod: int = 3, dPeriod: int = 3) -> Dict[str, 'np.ndarray']:
+    # RSV = (C - 最低價) / (最高價 - 最低價) * 100; K、D 起始值為 50; J = 3K - 2D
+    _check_period(rPeriod, 'rPeriod')
+    _check_period(kPeriod, 'kPeriod')
+    _check_period(dPeriod, 'dPeriod')
+    high, low, close = _as_array(high), _as_array(low), _as_array(close)
+    k = np.full(close.shape, np.nan)
+    d = np.full(close.shape, np.nan)
+    length = close.shape[-1]
+    if length >= rPeriod:
+        highest = sliding_window_view(high, rPeriod, axis=-1).max(axis=-1)
+        lowest = sliding_window_view(low, rPeriod, axis=-1).min(axis=-1)
+        spread = highest - lowest
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rsv = np.where(spread > 0, (close[..., rPeriod - 1:] - lowest) / spread * 100, 50.0)
+        # K 為 RSV 的平滑、D 為 K 的平滑，起始值皆為 50
+        rsv = np.concatenate([np.full(rsv.shape[:-1] + (1,), 50.0), rsv], axis=-1)
+        k_all = smooth(rsv, 1 / kPeriod, 0, 50.0)
+        d_all = smooth(k_all, 1 / dPeriod, 0, 50.0)
+        k[..., rPeriod - 1:] = k_all[..., 1:]
+        d[..., rPeriod - 1:] = d_all[..., 1:]
+    return {'k': k, 'd': d, 'j': 3 * k - 2 * d}
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, 'np.ndarray']:
+    _check_period(fast, 'fast')
+    _check_period(slow, 'slow')
+    _check_period(signal, 'signal')
+    close = _as_array(close)
+    macd_line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(macd_line, signal, offset=max(fast, slow) - 1)
+    return {'macdLine': macd_line, 'signalLine': signal_line}
+
+
+def bb(close, period: int = 20, stdDev: float = 2) -> Dict[str, 'np.ndarray']:
+    # 標準差為母體標準差
+    _check_period(period)
+    close = _as_array(close)
+    middle = sma(close, period)
+    # 以 E[x^2] - E[x]^2 計算移動變異數，先減去平均值降低誤差
+    centered = close - np.nanmean(close, axis=-1, keepdims=True) if close.shape[-1] else close
+    mean = sma(centered, period)
+    variance = np.maximum(sma(centered * centered, period) - mean * mean, 0)
+    deviation = np.sqrt(variance)
+    return {'upper': middle + stdDev * deviation, 'middle': middle, 'lower': middle - stdDev * deviation}
@@ -0,0 +1,376 @@
+"""
+逐筆更新的技術指標
+
+每個指標以 symbol 配置列索引，狀態存放在 NumPy 陣列中 (容量不足時倍增)。
+peek() 以尚未收盤的 K 棒計算暫時值，commit() 在 K 棒收盤後更新狀態，
+兩者皆為 O(1) (KDJ 為 O(rPeriod))，計算結果與 functions 中的批次版本相同
+"""
+from typing import Callable, Dict, Optional
+import orjson
+from ..constants import MESSAGE_EVENT
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# trades 頻道的 time 單位為微秒
+MICROSECONDS = 1000000
+
+
+def _check_period(period, name='period'):
+    if period < 1:
+        raise ValueError(f'{name} must be at least 1')
+
+
+class StreamingIndicator:
+    def __init__(self):
+        if np is None:
+            raise ImportError('streaming indicators require numpy, install it with "pip install fugle-marketdata[numpy]"')
+        self.slots: Dict[str, int] = {}
+        self.capacity = 0
+        self.__arrays = {}
+
+    def _register(self, name, shape=(), fill=0.0, dtype=None):
+        dtype = dtype or np.float64
+        self.__arrays[name] = (shape, fill, dtype)
+        setattr(self, name, np.full((self.capacity,) + shape, fill, dtype=dtype))
+
+    def _slot(self, symbol):
+        slot = self.slots.get(symbol)
+        if slot is None:
+            slot = len(self.slots)
+            if slot >= self.capacity:
+                self._grow(max(16, self.capacity * 2))
+            self.slots[symbol] = slot
+        return slot
+
+    def _grow(self, capacity):
+        for name, (shape, fill, dtype) in self.__arrays.items():
+            array = np.full((capacity,) + shape, fill, dtype=dtype)
+            array[:self.capacity] = getattr(self, name)
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def _step(self, slot, close, high, low, commit):
+        raise NotImplementedError
+
+    def peek(self, symbol, close, high=None, low=None):
+        """以尚未收盤的 K 棒計算暫時值，不改變狀態；資料不足時回傳 None"""
+        return self._step(self._slot(symbol), close, high, low, False)
+
+    def commit(self, symbol, close, high=None, low=None):
+        """K 棒收盤後更新狀態並回傳該根 K 棒的指標值"""
+        return self._step(self._slot(symbol), close, high, low, True)
+
+    update = commit
+
+    def reset(self, symbol=None):
+        if symbol is None:
+            self.slots = {}
+            self.capacity = 0
+            for name, (shape, fill, dtype) in self.__arrays.items():
+                setattr(self, name, np.full((0,) + shape, fill, dtype=dtype))
+        elif symbol in self.slots:
+            # 保留列索引，將狀態還原成初始值
+            slot = self.slots[symbol]
+            for name, (shape, fill, dtype) in self.__arrays.items():
+                getattr(self, name)[slot] = fill
+
+
+class SMA(StreamingIndicator):
+    def __init__(self, period: int = 20):
+        _check_period(period)
+        super().__init__()
+        self.period = period
+        self._register('window', (period,))
+        self._register('head', dtype=np.int64, fill=0)
+        self._register('count', dtype=np.int64, fill=0)
+        self._register('total')
+
+    def _step(self, slot, close, high, low, commit):
+        period = self.period
+        count = self.count[slot]
+        head = self.head[slot]
+        window = self.window[slot]
+        total = self.total[slot] - (window[head] if count == period else 0.0) + close
+        value = float(total / period) if count + 1 >= period else None
+        if commit:
+            window[head] = close
+            head = (head + 1) % period
+            self.head[slot] = head
+            self.count[slot] = min(count + 1, period)
+            # 每繞一圈重新加總，避免累加誤差
+            self.total[slot] = window.sum() if head == 0 else total
+        return value
+
+
+class EMA(StreamingIndicator):
+    def __init__(self, period: int = 12):
+        # 以前 period 筆的 SMA 作為起始值
+        _check_period(period)
+        super().__init__()
+        self.period = period
+        self.alpha = 2 / (period + 1)
+        self._register('value')
+        self._register('count', dtype=np.int64, fill=0)
+        self._register('seed')
+
+    def _step(self, slot, close, high, low, commit):
+        period = self.period
+        count = self.count[slot] + 1
+        if count < period:
+            value = None
+        elif count == period:
+            value = float((self.seed[slot] + close) / period)
+        else:
+            value = float(self.alpha * close + (1 - self.alpha) * self.value[slot])
+        if commit:
+            if count < period:
+                self.seed[slot] += close
+            else:
+                self.value[slot] = value
+            self.count[slot] = min(count, period + 1)
+        return value
+
+
+class RSI(StreamingIndicator):
+    def __init__(self, period: int = 6):
+        # Wilder 平滑: 以前 period 筆漲跌的平均為起始值
+        _check_period(period)
+        super().__init__()
+        self.period = period
+        self._register('previous')
+        self._register('count', dtype=np.int64, fill=0)
+        self._register('gain')
+        self._register('loss')
+
+    def _step(self, slot, close, high, low, commit):
+        period = self.period
+        count = self.count[slot]
+        value = None
+        gain = loss = 0.0
+        if count > 0:
+            change = close - self.previous[slot]
+            gain, loss = max(change, 0.0), max(-change, 0.0)
+            if count < period:
+                gain, loss = self.gain[slot] + gain, self.loss[slot] + loss
+            elif count == period:
+                gain, loss = (self.gain[slot] + gain) / period, (self.loss[slot] + loss) / period
+            else:
+                gain = self.gain[slot] + (gain - self.gain[slot]) / period
+                loss = self.loss[slot] + (loss - self.loss[slot]) / period
+            if count >= period:
+                total = gain + loss
+                value = float(100 * gain / total) if total > 0 else 50.0
+        if commit:
+            self.previous[slot] = close
+            self.gain[slot] = gain
+            self.loss[slot] = loss
+            self.count[slot] = min(count + 1, period + 1)
+        return value
+
+
+class KDJ(StreamingIndicator):
+    def __init__(self, rPeriod: int = 9, kPeriod: int = 3, dPeriod: int = 3):
+        # RSV = (C - 最低價) / (最高價 - 最低價) * 100; K、D 起始值為 50; J = 3K - 2D
+        _check_period(rPeriod, 'rPeriod')
+        _check_period(kPeriod, 'kPeriod')
+        _check_period(dPeriod, 'dPeriod')
+        super().__init__()
+        self.rPeriod = rPeriod
+        self.kPeriod = kPeriod
+        self.dPeriod = dPeriod
+        self._register('highs', (rPeriod,), fill=-np.inf)
+        self._register('lows', (rPeriod,), fill=np.inf)
+        self._register('head', dtype=np.int64, fill=0)
+        self._register('count', dtype=np.int64, fill=0)
+        self._register('k', fill=50.0)
+        self._register('d', fill=50.0)
+
+    def _step(self, slot, close, high, low, commit):
+        high = close if high is None else high
+        low = close if low is None else low
+        count = self.count[slot]
+        head = self.head[slot]
+        highs, lows = self.highs[slot], self.lows[slot]
+        previous_high, previous_low = highs[head], lows[head]
+        highs[head], lows[head] = high, low
+
+        value = None
+        k, d = self.k[slot], self.d[slot]
+        if count + 1 >= self.rPeriod:
+            highest, lowest = highs.max(), lows.min()
+            spread = highest - lowest
+            rsv = (close - lowest) / spread * 100 if spread > 0 else 50.0
+            k = (self.kPeriod - 1) / self.kPeriod * k + rsv / self.kPeriod
+            d = (self.dPeriod - 1) / self.dPeriod * d + k / self.dPeriod
+            value = {'k': float(k), 'd': float(d), 'j': float(3 * k - 2 * d)}
+
+        if commit:
+            self.head[slot] = (head + 1) % self.rPeriod
+            self.count[slot] = min(count + 1, self.rPeriod)
+            self.k[slot], self.d[slot] = k, d
+        else:
+            highs[head], lows[head] = previous_high, previous_low
+        return value
+
+
+class MACD(StreamingIndicator):
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        _check_period(fast, 'fast')
+        _check_period(slow, 'slow')
+        _check_period(signal, 'signal')
+        super().__init__()
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+
+    def peek(self, symbol, close, high=None, low=None):
+        return self.__combine(symbol, close, 'peek')
+
+    def commit(self, symbol, close, high=None, low=None):
+        return self.__combine(symbol, close, 'commit')
+
+    update = commit
+
+    def __combine(self, symbol, close, action):
+        fast = getattr(self.fast, action)(symbol, close)
+        slow = getattr(self.slow, action)(symbol, close)
+        if fast is None or slow is None:
+            return None
+        line = fast - slow
+        signal = getattr(self.signal, action)(symbol, line)
+        if signal is None:
+            return None
+        return {'macdLine': line, 'signalLine': signal}
+
+    def reset(self, symbol=None):
+        for indicator in (self.fast, self.slow, self.signal):
+            indicator.reset(symbol)
+
+
+class BB(StreamingIndicator):
+    def __init__(self, period: int = 20, stdDev: float = 2):
+        # 標準差為母體標準差
+        _check_period(period)
+        super().__init__()
+        self.period = period
+        self.stdDev = stdDev
+        self._register('window', (period,))
+        self._register('head', dtype=np.int64, fill=0)
+        self._register('count', dtype=np.int64, fill=0)
+        self._register('total')
+        self._register('squares')
+
+    def _step(self, slot, close, high, low, commit):
+        period = self.period
+        count = self.count[slot]
+        head = self.head[slot]
+        window = self.window[slot]
+        oldest = window[head] if count == period else 0.0
+        total = self.total[slot] - oldest + close
+        squares = self.squares[slot] - oldest * oldest + close * close
+
+        value = None
+        if count + 1 >= period:
+            middle = total / period
+            deviation = max(squares / period - middle * middle, 0.0) ** 0.5
+            value = {
+                'upper': float(middle + self.stdDev * deviation),
+                'middle': float(middle),
+                'lower': float(middle - self.stdDev * deviation),
+            }
+
+        if commit:
+            window[head] = close
+            head = (head + 1) % period
+            self.head[slot] = head
+            self.count[slot] = min(count + 1, period)
+            if head == 0:
+                total, squares = window.sum(), (window * window).sum()
+            self.total[slot] = total
+            self.squares[slot] = squares
+        return value
+
+
+class IndicatorStream:
+    """
+    接收 WebSocket 的 candles 或 trades 訊息，逐筆更新各 symbol 的指標
+
+    candles: 以 K 棒的 date 判斷是否為新的一根；trades: 依 interval 秒將成交彙整成 K 棒
+    callback(symbol, bar, values): bar 為 K 棒時間 (candles 的 date 或 trades 的區間起點微秒)
+    closed_only: 只在 K 棒收盤 (收到下一根) 時呼叫 callback
+    """
+
+    def __init__(
+        self,
+        indicators: Dict[str, StreamingIndicator],
+        channel: str = 'candles',
+        callback: Optional[Callable[[str, object, dict], None]] = None,
+        closed_only: bool = False,
+        interval: int = 60,
+    ):
+        if channel not in ('candles', 'trades'):
+            raise ValueError('channel must be "candles" or "trades"')
+        self.indicators = indicators
+        self.channel = channel
+        self.callback = callback
+        self.closed_only = closed_only
+        self.interval = interval * MICROSECONDS
+        self.pending = {}
+        self.latest = {}
+        self.client = None
+
+    def feed(self, symbol, bar, close, high=None, low=None):
+        """以一筆 K 棒 (可為同一根 K 棒的多次更新) 更新指標，回傳最新的指標值"""
+        pending = self.pending.get(symbol)
+        if pending is not None and pending[0] != bar:
+            closed = {name: indicator.commit(symbol, *pending[1:]) for name, indicator in self.indicators.items()}
+            if self.closed_only:
+                self.latest[symbol] = closed
+                if self.callback is not None:
+                    self.callback(symbol, pending[0], closed)
+        self.pending[symbol] = (bar, close, high, low)
+        if self.closed_only:
+            return self.latest.get(symbol)
+
+        values = {name: indicator.peek(symbol, close, high, low) for name, indicator in self.indicators.items()}
+        self.latest[symbol] = values
+        if self.callback is not None:
+            self.callback(symbol, bar, values)
+        return values
+
+    def on_message(self, message):
+        if isinstance(message, (str, bytes)):
+            message = orjson.loads(message)
+        if message.get('event') not in ('data', 'snapshot') or message.get('channel') != self.channel:
+            return
+        data = message.get('data') or {}
+        symbol = data.get('symbol')
+        if self.channel == 'candles':
+            if data.get('close') is None:
+                return
+            self.feed(symbol, data.get('date'), data['close'], data.get('high'), data.get('low'))
+            return
+
+        price = data.get('price')
+        if price is None or data.get('time') is None:
+            return
+        bar = data['time'] // self.interval * self.interval
+        high = low = price
+        pending = self.pending.get(symbol)
+        if pending is not None and pending[0] == bar:
+            high, low = max(pending[2], price), min(pending[3], price)
+        self.feed(symbol, bar, price, high, low)
+
+    def attach(self, client):
+        # client: WebSocketStockClient (client.stock)
+        self.client = client
+        client.on(MESSAGE_EVENT, self.on_message)
+        return self
+
+    def detach(self):
+        if self.client is not None:
+            self.client.off(MESSAGE_EVENT, self.on_message)
+            self.client = None
@@ -1,2 +1,9 @@
 from .factory import RestClientFactory
-from .base_rest import BaseRest
\ No newline at end of file
+from .base_rest import BaseRest
+from .session import ConnectionPoolConfig
+from .aio import AsyncRestClientFactory
+from .batch import BatchResult
+from .rate_limit import RateLimitConfig
+from .retry import RetryConfig, RetryEvent
+from .cache import CacheConfig, MemoryCacheBackend, DiskCacheBackend
+from .conditional import ConditionalConfig
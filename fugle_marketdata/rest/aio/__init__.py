@@ -0,0 +1,2 @@
+from .factory import AsyncRestClientFactory
+from .base_rest import AsyncBaseRest
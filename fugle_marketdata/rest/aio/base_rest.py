@@ -0,0 +1,117 @@
+import asyncio
+from ...exceptions import FugleAPIError
+from ..base_rest import BaseRest
+from ..batch import pop_batch_options, run_many_async, stream_many_async
+from ..retry import NO_RETRY, RetryState
+from ..chunking import merge_chunks, plan_chunks, pop_chunk_options
+from ..columnar import apply_format, pop_format
+from .transport import AsyncTransport, aiohttp
+
+# 預設重試的連線層例外
+RETRY_EXCEPTIONS = (aiohttp.ClientConnectionError, asyncio.TimeoutError) if aiohttp is not None else ()
+
+
+class AsyncBaseRest(BaseRest):
+    def __init__(self, **config):
+        super().__init__(**config)
+        self.__transport = config.get('transport')
+
+    @property
+    def transport(self):
+        # 未由 AsyncRestClientFactory 注入共用 transport 時，建立自己的連線池
+        if self.__transport is None:
+            self.__transport = AsyncTransport(self.config.get('connection_pool'))
+        return self.__transport
+
+    async def request(self, path, **params):
+        result_format = pop_format(params)
+        response_cache = self.response_cache
+        if response_cache is not None:
+            data = await response_cache.fetch_async(self.config, path, params, self._fetch)
+        else:
+            data = await self._fetch(path, params)
+        return apply_format(data, result_format)
+
+    async def _fetch(self, path, params):
+        single_flight = self.single_flight
+        if single_flight is None:
+            return await self._request(path, params)
+        key = single_flight.key_for(self.base_url, path, params)
+        return await single_flight.do_async(key, lambda: self._request(path, params))
+
+    async def _request(self, path, params):
+        url, headers = self._prepare_request(path, params)
+        rate_limiter = self.rate_limiter
+        conditional_cache = self.conditional_cache
+        validator = None
+        if conditional_cache is not None:
+            headers, validator = conditional_cache.prepare(url, headers)
+        retry = RetryState(self.retry, url, RETRY_EXCEPTIONS) if self.retry is not None else NO_RETRY
+
+        while True:
+            retry.begin()
+            try:
+                if rate_limiter is not None:
+                    await rate_limiter.acquire_async()
+                response = await self.transport.get(url, headers=headers)
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                delay = retry.next_delay(error=e)
+                if delay is None:
+                    raise FugleAPIError(
+                        f"{type(e).__name__}: {str(e)}",
+                        url=url,
+                        params=params
+                    )
+                await asyncio.sleep(delay)
+                continue
+
+            if rate_limiter is not None:
+                rate_limiter.on_response(response.status_code, response.headers)
+
+            delay = retry.next_delay(response=response)
+            if delay is None:
+                if conditional_cache is not None:
+                    return self._handle_response(response, url, params, conditional_cache.resolve(url, response, validator))
+                return self._handle_response(response, url, params)
+            await asyncio.sleep(delay)
+
+    def request_many(self, method, **params):
+        # stream=True 時回傳 async generator，否則回傳 coroutine
+        symbols, concurrency, stream = pop_batch_options(params)
+        if stream:
+            return stream_many_async(method, symbols, concurrency, params)
+        return run_many_async(method, symbols, concurrency, params)
+
+    async def request_chunked(self, path, **params):
+        chunk_days, concurrency = pop_chunk_options(params)
+        result_format = pop_format(params)
+        chunks = plan_chunks(params, chunk_days)
+        if len(chunks) == 1:
+            return apply_format(await self.request(path, **chunks[0]), result_format)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(chunk):
+            async with semaphore:
+                return await self.request(path, **chunk)
+
+        responses = await asyncio.gather(*[fetch(chunk) for chunk in chunks])
+        return apply_format(merge_chunks(responses, params), result_format)
+
+    async def iter_chunked(self, path, **params):
+        chunk_days, concurrency = pop_chunk_options(params)
+        result_format = pop_format(params)
+        chunks = plan_chunks(params, chunk_days)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(chunk):
+            async with semaphore:
+                return await self.request(path, **chunk)
+
+        tasks = [asyncio.ensure_future(fetch(chunk)) for chunk in chunks]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield apply_format(await task, result_format)
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,81 @@
+from ...client_factory import ClientFactory
+from ...constants import FUGLE_MARKETDATA_API_REST_BASE_URL, FUGLE_MARKETDATA_API_VERSION
+from .stock import AsyncRestStockClient
+from .futopt import AsyncRestFutOptClient
+from .transport import AsyncTransport
+from ..rate_limit import RateLimiter
+from ..cache import ResponseCache
+from ..singleflight import SingleFlight
+from ..conditional import ConditionalCache
+
+
+class AsyncRestClientFactory(ClientFactory):
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.__clients = {}
+        self.__transport = None
+        self.options = options
+        rate_limit = options.get('rate_limit')
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit is not None else None
+        cache = options.get('cache')
+        self.response_cache = ResponseCache(cache) if cache is not None else None
+        self.single_flight = SingleFlight() if options.get('coalesce') else None
+        conditional = options.get('conditional')
+        self.conditional_cache = ConditionalCache(conditional) if conditional is not None else None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    @property
+    def stock(self):
+        return self.get_client('stock')
+
+    @property
+    def futopt(self):
+        return self.get_client('futopt')
+
+    @property
+    def transport(self):
+        # 所有 stock / futopt 資源共用同一個非同步連線池
+        if self.__transport is None:
+            self.__transport = AsyncTransport(self.options.get('connection_pool'))
+        return self.__transport
+
+    async def close(self):
+        if self.__transport is not None:
+            await self.__transport.close()
+            self.__transport = None
+        self.__clients = {}
+
+    def get_client(self, type):
+        if type in self.__clients:
+            return self.__clients[type]
+
+        base_url = self.options.get('base_url')
+        if not base_url:
+            base_url = f"{FUGLE_MARKETDATA_API_REST_BASE_URL}/{FUGLE_MARKETDATA_API_VERSION}"
+
+        url = f'{base_url.rstrip("/")}/{type}'
+
+        client_options = {**self.options}
+        client_options['base_url'] = url
+        client_options['rate_limiter'] = self.rate_limiter
+        client_options['response_cache'] = self.response_cache
+        client_options['single_flight'] = self.single_flight
+        client_options['conditional_cache'] = self.conditional_cache
+        client_options['transport'] = self.transport
+
+        if type == 'stock':
+            client = AsyncRestStockClient(**client_options)
+
+        elif type == 'futopt':
+            client = AsyncRestFutOptClient(**client_options)
+
+        else:
+            None
+
+        self.__clients[type] = client
+        return client
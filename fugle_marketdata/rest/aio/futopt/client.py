@@ -0,0 +1,28 @@
+from ...futopt import intraday, historical
+from ..base_rest import AsyncBaseRest
+
+
+class Intraday(AsyncBaseRest, intraday.Intraday):
+    pass
+
+
+class Historical(AsyncBaseRest, historical.Historical):
+    pass
+
+
+class AsyncRestFutOptClient:
+    def __init__(self, **config):
+        # config: base_url, transport, api_key?, bearer_token?
+        self.config = config
+
+        # 資源物件只建立一次，之後重複使用
+        self.__intraday = Intraday(**config)
+        self.__historical = Historical(**config)
+
+    @property
+    def intraday(self):
+        return self.__intraday
+
+    @property
+    def historical(self):
+        return self.__historical
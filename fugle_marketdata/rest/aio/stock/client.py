@@ -0,0 +1,55 @@
+from ...stock import intraday, historical, snapshot, technical, corporate_actions
+from ..base_rest import AsyncBaseRest
+
+
+class Intraday(AsyncBaseRest, intraday.Intraday):
+    pass
+
+
+class Historical(AsyncBaseRest, historical.Historical):
+    pass
+
+
+class Snapshot(AsyncBaseRest, snapshot.Snapshot):
+    pass
+
+
+class Technical(AsyncBaseRest, technical.Technical):
+    pass
+
+
+class CorporateActions(AsyncBaseRest, corporate_actions.CorporateActions):
+    pass
+
+
+class AsyncRestStockClient:
+    def __init__(self, **config):
+        # config: base_url, transport, api_key?, bearer_token?
+        self.config = config
+
+        # 資源物件只建立一次，之後重複使用
+        self.__intraday = Intraday(**config)
+        self.__historical = Historical(**config)
+        self.__snapshot = Snapshot(**config)
+        self.__technical = Technical(**config)
+        self.__corporate_actions = CorporateActions(**config)
+
+    @property
+    def intraday(self):
+        return self.__intraday
+
+    @property
+    def historical(self):
+        return self.__historical
+
+    @property
+    def snapshot(self):
+        return self.__snapshot
+
+    @property
+    def technical(self):
+        return self.__technical
+
+    @property
+    def corporate_actions(self):
+        return self.__corporate_actions
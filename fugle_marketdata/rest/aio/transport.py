@@ -0,0 +1,59 @@
+from typing import Optional
+import orjson
+from ..session import ACCEPT_ENCODING, ConnectionPoolConfig
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+class AsyncResponse:
+    """與 requests.Response 相容的最小回應物件"""
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return orjson.loads(self.content)
+
+
+class AsyncTransport:
+    """以 aiohttp 實作的非同步連線池，於第一次請求時才建立 ClientSession"""
+
+    def __init__(self, config: Optional[ConnectionPoolConfig] = None):
+        if aiohttp is None:
+            raise ImportError('AsyncRestClient requires aiohttp, install it with "pip install fugle-marketdata[async]"')
+        self.config = config or ConnectionPoolConfig()
+        self.__session = None
+
+    @property
+    def session(self):
+        if self.__session is None or self.__session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.config.pool_connections * self.config.pool_maxsize,
+                limit_per_host=self.config.pool_maxsize,
+                force_close=not self.config.keep_alive,
+            )
+            self.__session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'Accept-Encoding': ACCEPT_ENCODING},
+                timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+            )
+        return self.__session
+
+    async def get(self, url, headers=None):
+        async with self.session.get(url, headers=headers) as response:
+            content = await response.read()
+            return AsyncResponse(response.status, response.headers, content)
+
+    async def close(self):
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
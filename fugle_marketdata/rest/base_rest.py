@@ -1,66 +1,184 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urlencode
+import orjson
 import requests
 from ..exceptions import FugleAPIError
+from .session import create_session
+from .batch import pop_batch_options, run_many, stream_many
+from .retry import NO_RETRY, RetryState
+from .chunking import merge_chunks, plan_chunks, pop_chunk_options
+from .columnar import apply_format, pop_format
+
+# 預設重試的連線層例外
+RETRY_EXCEPTIONS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
 
 
 class BaseRest(object):
     def __init__(self, **config):
         self.config = config
+        self.__session = config.get('session')
+
+        # 每次請求都會用到的設定，建立時先計算好
+        self.base_url = config.get('base_url')
+        self.headers = build_auth_headers(config)
+        self.rate_limiter = config.get('rate_limiter')
+        self.response_cache = config.get('response_cache')
+        self.retry = config.get('retry')
+        self.single_flight = config.get('single_flight')
+        self.conditional_cache = config.get('conditional_cache')
+
+    @property
+    def session(self):
+        # 未由 RestClientFactory 注入共用 session 時，建立自己的連線池
+        if self.__session is None:
+            self.__session = create_session(self.config.get('connection_pool'))
+        return self.__session
 
     def request(self, path, **params):
-        baseUrl = self.config['base_url']
-        headers = {}
-        if self.config.get('api_key'):
-            headers['X-API-KEY'] = self.config['api_key']
-        if self.config.get('bearer_token'):
-            headers['Authorization'] = f"Bearer {self.config['bearer_token']}"
-        if self.config.get('sdk_token'):
-            headers['X-SDK-TOKEN'] = self.config['sdk_token']
+        result_format = pop_format(params)
+        response_cache = self.response_cache
+        if response_cache is not None:
+            data = response_cache.fetch(self.config, path, params, self._fetch)
+        else:
+            data = self._fetch(path, params)
+        return apply_format(data, result_format)
+
+    def _fetch(self, path, params):
+        # 啟用 coalesce 時，相同請求進行中的呼叫者共用同一次回應
+        single_flight = self.single_flight
+        if single_flight is None:
+            return self._request(path, params)
+        key = single_flight.key_for(self.base_url, path, params)
+        return single_flight.do(key, lambda: self._request(path, params))
+
+    def _request(self, path, params):
+        url, headers = self._prepare_request(path, params)
+        rate_limiter = self.rate_limiter
+        conditional_cache = self.conditional_cache
+        validator = None
+        if conditional_cache is not None:
+            headers, validator = conditional_cache.prepare(url, headers)
+        retry = RetryState(self.retry, url, RETRY_EXCEPTIONS) if self.retry is not None else NO_RETRY
+
+        while True:
+            retry.begin()
+            try:
+                if rate_limiter is not None:
+                    rate_limiter.acquire()
+                response = self.session.get(url, headers=headers)
+
+            except requests.exceptions.RequestException as e:
+                delay = retry.next_delay(error=e)
+                if delay is None:
+                    raise FugleAPIError(
+                        f"{type(e).__name__}: {str(e)}",
+                        url=url,
+                        params=params
+                    )
+                time.sleep(delay)
+                continue
 
+            if rate_limiter is not None:
+                rate_limiter.on_response(response.status_code, response.headers)
+
+            delay = retry.next_delay(response=response)
+            if delay is None:
+                if conditional_cache is not None:
+                    return self._handle_response(response, url, params, conditional_cache.resolve(url, response, validator))
+                return self._handle_response(response, url, params)
+            time.sleep(delay)
+
+    def request_many(self, method, **params):
+        # params: symbols, concurrency?, stream?, 其餘參數原樣傳給 method
+        symbols, concurrency, stream = pop_batch_options(params)
+        if stream:
+            return stream_many(method, symbols, concurrency, params)
+        return run_many(method, symbols, concurrency, params)
+
+    def request_chunked(self, path, **params):
+        # params: chunk_days?, chunk_concurrency?, 其餘參數原樣送出
+        chunk_days, concurrency = pop_chunk_options(params)
+        result_format = pop_format(params)
+        chunks = plan_chunks(params, chunk_days)
+        if len(chunks) == 1:
+            return apply_format(self.request(path, **chunks[0]), result_format)
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            responses = list(executor.map(lambda chunk: self.request(path, **chunk), chunks))
+        return apply_format(merge_chunks(responses, params), result_format)
+
+    def iter_chunked(self, path, **params):
+        # 依完成順序逐一產出各區段的回應
+        chunk_days, concurrency = pop_chunk_options(params)
+        result_format = pop_format(params)
+        chunks = plan_chunks(params, chunk_days)
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        futures = [executor.submit(self.request, path, **chunk) for chunk in chunks]
+        try:
+            for future in as_completed(futures):
+                yield apply_format(future.result(), result_format)
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _prepare_request(self, path, params):
         endpoint = path if (path.startswith('/')) else '/' + path
 
         if len(params) == 0:
-            query = ''
-        else:
-            query = '?' + urlencode(params)
+            return self.base_url + endpoint, self.headers
 
-        url = baseUrl + endpoint + query
+        return self.base_url + endpoint + '?' + urlencode(params), self.headers
 
-        try:
-            response = requests.get(url, headers=headers)
-
-            # 檢查 HTTP 錯誤狀態
-            if response.status_code >= 400:
-                error_msg = f"HTTP {response.status_code}"
-                try:
-                    error_data = response.json()
-                    if 'message' in error_data:
-                        error_msg = error_data['message']
-                except:
-                    pass
-
-                raise FugleAPIError(
-                    error_msg,
-                    url=url,
-                    status_code=response.status_code,
-                    params=params,
-                    response_text=response.text
-                )
-
-            return response.json()
+    def _handle_response(self, response, url, params, content=None):
+        # 直接以 orjson 解析原始 bytes，僅在錯誤時才轉成文字
+        # content: 收到 304 時由 ConditionalCache 提供先前保存的內容
+        if content is None:
+            content = response.content
+
+        # 檢查 HTTP 錯誤狀態
+        if response.status_code >= 400:
+            error_msg = f"HTTP {response.status_code}"
+            try:
+                error_data = orjson.loads(content)
+                if 'message' in error_data:
+                    error_msg = error_data['message']
+            except (ValueError, TypeError):
+                pass
 
-        except ValueError as e:
             raise FugleAPIError(
-                "Failed to parse JSON response",
+                error_msg,
                 url=url,
                 status_code=response.status_code,
                 params=params,
-                response_text=response.text
+                response_text=decode_text(content)
             )
 
-        except requests.exceptions.RequestException as e:
+        try:
+            return orjson.loads(content)
+
+        except ValueError as e:
             raise FugleAPIError(
-                f"{type(e).__name__}: {str(e)}",
+                "Failed to parse JSON response",
                 url=url,
-                params=params
+                status_code=response.status_code,
+                params=params,
+                response_text=decode_text(content)
             )
+
+
+def build_auth_headers(config):
+    headers = {}
+    if config.get('api_key'):
+        headers['X-API-KEY'] = config['api_key']
+    if config.get('bearer_token'):
+        headers['Authorization'] = f"Bearer {config['bearer_token']}"
+    if config.get('sdk_token'):
+        headers['X-SDK-TOKEN'] = config['sdk_token']
+    return headers
+
+
+def decode_text(content):
+    if not content:
+        return ''
+    return content.decode('utf-8', errors='replace')
@@ -0,0 +1,82 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from ..exceptions import FugleAPIError
+
+DEFAULT_BATCH_CONCURRENCY = 8
+
+
+class BatchResult:
+    """批次請求中單一 symbol 的結果，失敗時 error 為 FugleAPIError"""
+
+    def __init__(self, symbol, data=None, error=None):
+        self.symbol = symbol
+        self.data = data
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        if self.ok:
+            return f"BatchResult(symbol={self.symbol!r}, ok=True)"
+        return f"BatchResult(symbol={self.symbol!r}, error={self.error.message!r})"
+
+
+def pop_batch_options(params):
+    symbols = params.pop('symbols')
+    concurrency = params.pop('concurrency', DEFAULT_BATCH_CONCURRENCY)
+    stream = params.pop('stream', False)
+    if concurrency < 1:
+        raise ValueError('concurrency must be at least 1')
+    return list(symbols), concurrency, stream
+
+
+def call_one(method, symbol, params):
+    try:
+        return BatchResult(symbol, data=method(symbol=symbol, **params))
+    except FugleAPIError as error:
+        return BatchResult(symbol, error=error)
+
+
+def run_many(method, symbols, concurrency, params):
+    """依輸入順序回傳所有結果"""
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(lambda symbol: call_one(method, symbol, params), symbols))
+
+
+def stream_many(method, symbols, concurrency, params):
+    """依完成順序逐一產出結果"""
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    futures = [executor.submit(call_one, method, symbol, params) for symbol in symbols]
+    try:
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+async def call_one_async(method, symbol, params, semaphore):
+    async with semaphore:
+        try:
+            return BatchResult(symbol, data=await method(symbol=symbol, **params))
+        except FugleAPIError as error:
+            return BatchResult(symbol, error=error)
+
+
+async def run_many_async(method, symbols, concurrency, params):
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(*[call_one_async(method, symbol, params, semaphore) for symbol in symbols])
+
+
+async def stream_many_async(method, symbols, concurrency, params):
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [asyncio.ensure_future(call_one_async(method, symbol, params, semaphore)) for symbol in symbols]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,243 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from fnmatch import fnmatchcase
+from typing import Callable, Dict, Optional, Union
+import orjson
+from ..constants import FUGLE_MARKETDATA_TIMEZONE
+
+Policy = Union[float, Callable[[str, dict], float]]
+
+
+def closed_range_ttl(path, params):
+    """歷史資料的 to 日期已收盤 (早於今日) 時才快取"""
+    to = params.get('to')
+    if not to:
+        return 0
+    try:
+        to_date = date.fromisoformat(str(to)[:10])
+    except ValueError:
+        return 0
+    today = datetime.now(FUGLE_MARKETDATA_TIMEZONE).date()
+    return 86400 if to_date < today else 0
+
+
+DEFAULT_CACHE_POLICIES: Dict[str, Policy] = {
+    'intraday/tickers': 3600,
+    'intraday/ticker/*': 3600,
+    'intraday/products': 3600,
+    'historical/candles/*': closed_range_ttl,
+    'historical/daily/*': closed_range_ttl,
+    'corporate-actions/*': 3600,
+}
+
+
+class CacheConfig:
+    def __init__(
+        self,
+        policies: Optional[Dict[str, Policy]] = None,
+        ttl: float = 0,
+        max_entries: int = 1024,
+        backend: Optional['CacheBackend'] = None,
+    ):
+        # policies: endpoint 路徑 pattern (fnmatch) 對應 TTL 秒數，或回傳 TTL 的 callable(path, params)
+        # ttl: 未符合任何 pattern 時的 TTL，0 代表不快取
+        # backend: 預設為 MemoryCacheBackend(max_entries)
+        self.policies = DEFAULT_CACHE_POLICIES if policies is None else policies
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.backend = backend
+
+
+class CacheBackend:
+    def get(self, key) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key, value: bytes, ttl: float):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """以 OrderedDict 實作的 LRU 快取"""
+
+    def __init__(self, max_entries: int = 1024, clock=time.time):
+        self.max_entries = max_entries
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self.clock():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self.lock:
+            self.entries[key] = (self.clock() + ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class DiskCacheBackend(CacheBackend):
+    """每個 key 一個檔案，依檔案修改時間淘汰最久未使用的項目"""
+
+    def __init__(self, directory, max_entries: int = 1024, clock=time.time):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.clock = clock
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.cache')
+
+    def _files(self):
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith('.cache')]
+
+    @staticmethod
+    def _mtimes(files):
+        """回傳 [(mtime, path)]，略過已被其他程序、clear() 或過期清除刪除的檔案"""
+        mtimes = []
+        for path in files:
+            try:
+                mtimes.append((os.stat(path).st_mtime, path))
+            except OSError:
+                pass
+        return mtimes
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                expires_at = float(f.readline())
+                value = f.read()
+        except (OSError, ValueError):
+            return None
+        if expires_at <= self.clock():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        try:
+            # 更新 mtime 供 LRU 淘汰判斷，檔案已被其他程序刪除時仍回傳讀到的值
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def set(self, key, value, ttl):
+        path = self._path(key)
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(f'{self.clock() + ttl}\n'.encode('ascii'))
+            f.write(value)
+        os.replace(tmp_path, path)
+        with self.lock:
+            files = self._files()
+            if len(files) > self.max_entries:
+                files = [path for _, path in sorted(self._mtimes(files))]
+                for stale in files[:len(files) - self.max_entries]:
+                    try:
+                        os.remove(stale)
+                    except OSError:
+                        pass
+
+    def clear(self):
+        for path in self._files():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def __len__(self):
+        return len(self._files())
+
+
+class ResponseCache:
+    def __init__(self, config: CacheConfig):
+        self.config = config
+        self.backend = config.backend if config.backend is not None else MemoryCacheBackend(config.max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def ttl_for(self, path, params):
+        path = path.lstrip('/')
+        for pattern, policy in self.config.policies.items():
+            if fnmatchcase(path, pattern):
+                return policy(path, params) if callable(policy) else policy
+        return self.config.ttl
+
+    @staticmethod
+    def key_for(config, path, params):
+        # key: base_url + path + 排序後的參數 + 憑證範圍 (只保留雜湊)
+        credential = config.get('api_key') or config.get('bearer_token') or config.get('sdk_token') or ''
+        raw = '\n'.join([
+            config['base_url'],
+            path.lstrip('/'),
+            repr(sorted((k, str(v)) for k, v in params.items())),
+            hashlib.sha256(credential.encode('utf-8')).hexdigest(),
+        ])
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.backend)}
+
+    def clear(self):
+        self.backend.clear()
+
+    def _lookup(self, config, path, params):
+        ttl = self.ttl_for(path, params)
+        if not ttl or ttl <= 0:
+            return None, None, None
+        key = self.key_for(config, path, params)
+        value = self.backend.get(key)
+        with self.lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return key, ttl, value
+
+    def fetch(self, config, path, params, loader):
+        key, ttl, value = self._lookup(config, path, params)
+        if value is not None:
+            return orjson.loads(value)
+        data = loader(path, params)
+        if key is not None:
+            self.backend.set(key, orjson.dumps(data), ttl)
+        return data
+
+    async def fetch_async(self, config, path, params, loader):
+        key, ttl, value = self._lookup(config, path, params)
+        if value is not None:
+            return orjson.loads(value)
+        data = await loader(path, params)
+        if key is not None:
+            self.backend.set(key, orjson.dumps(data), ttl)
+        return data
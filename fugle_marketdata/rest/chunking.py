@@ -0,0 +1,58 @@
+from datetime import date, timedelta
+from typing import List
+
+# 單次請求可涵蓋的最大天數，分 K 與日 / 週 / 月 K 的上限不同
+MAX_RANGE_DAYS = {
+    'intraday': 30,
+    'daily': 365,
+}
+INTRADAY_TIMEFRAMES = frozenset(['1', '3', '5', '10', '15', '30', '60'])
+DEFAULT_CHUNK_CONCURRENCY = 4
+
+
+def pop_chunk_options(params):
+    chunk_days = params.pop('chunk_days', None)
+    concurrency = params.pop('chunk_concurrency', DEFAULT_CHUNK_CONCURRENCY)
+    if chunk_days is not None and chunk_days < 1:
+        raise ValueError('chunk_days must be at least 1')
+    if concurrency < 1:
+        raise ValueError('chunk_concurrency must be at least 1')
+    return chunk_days, concurrency
+
+
+def plan_chunks(params, chunk_days=None) -> List[dict]:
+    """依 from / to 拆分成多個請求參數，未指定完整區間時維持單一請求"""
+    start, end = params.get('from'), params.get('to')
+    if not start or not end:
+        return [params]
+
+    if chunk_days is None:
+        timeframe = str(params.get('timeframe', 'D'))
+        chunk_days = MAX_RANGE_DAYS['intraday' if timeframe in INTRADAY_TIMEFRAMES else 'daily']
+
+    start, end = date.fromisoformat(str(start)[:10]), date.fromisoformat(str(end)[:10])
+    if (end - start).days < chunk_days:
+        return [params]
+
+    chunks = []
+    cursor = start
+    while cursor <= end:
+        chunk_end = min(end, cursor + timedelta(days=chunk_days - 1))
+        chunks.append({**params, 'from': cursor.isoformat(), 'to': chunk_end.isoformat()})
+        cursor = chunk_end + timedelta(days=1)
+    return chunks
+
+
+def merge_chunks(responses: List[dict], params) -> dict:
+    """合併各區段回應的 data，依 date 去除重複並排序 (預設新到舊，與 API 相同)"""
+    merged = {}
+    rows = {}
+    for response in responses:
+        if not merged:
+            merged = {k: v for k, v in response.items() if k != 'data'}
+        for row in response.get('data') or []:
+            rows[row['date']] = row
+
+    descending = params.get('sort', 'desc') != 'asc'
+    merged['data'] = [rows[key] for key in sorted(rows, reverse=descending)]
+    return merged
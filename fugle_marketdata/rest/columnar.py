@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from ..constants import FUGLE_MARKETDATA_TIMEZONE
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+COLUMNAR_FORMAT = 'columnar'
+TIMEZONE_OFFSET_MS = 8 * 3600 * 1000
+
+# 數量類欄位存成 int64，其餘數值欄位一律存成 float64
+INT_FIELDS = frozenset([
+    'volume', 'size', 'volumeAtBid', 'volumeAtAsk', 'serial', 'time',
+    'transaction', 'openInterest',
+])
+
+
+def to_epoch_ms(values: List[str]):
+    """將 API 回傳的日期 / 時間字串轉為 UTC epoch 毫秒 (int64)"""
+    if all(len(value) == 10 for value in values):
+        # 日 K 只有日期，視為台北時間 00:00
+        days = np.array(values, dtype='datetime64[D]').astype('datetime64[ms]').astype(np.int64)
+        return days - TIMEZONE_OFFSET_MS
+
+    result = np.empty(len(values), dtype=np.int64)
+    for i, value in enumerate(values):
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=FUGLE_MARKETDATA_TIMEZONE)
+        result[i] = int(dt.timestamp() * 1000)
+    return result
+
+
+def _to_float(value):
+    return float('nan') if value is None else value
+
+
+def records_to_columns(records: List[dict], fields: Optional[List[str]] = None) -> Dict[str, 'np.ndarray']:
+    """將 data 陣列轉為欄位導向的 NumPy 陣列，date 欄位轉為 epoch 毫秒"""
+    first = records[0] if records else {}
+    if fields is None:
+        # 以第一筆資料的數值欄位為準
+        fields = [k for k, v in first.items() if k != 'date' and isinstance(v, (int, float)) and not isinstance(v, bool)]
+
+    columns = {}
+    if 'date' in first:
+        columns['date'] = to_epoch_ms([record['date'] for record in records])
+    count = len(records)
+    for field in fields:
+        if field in INT_FIELDS:
+            columns[field] = np.fromiter((record.get(field) or 0 for record in records), dtype=np.int64, count=count)
+        else:
+            columns[field] = np.fromiter((_to_float(record.get(field)) for record in records), dtype=np.float64, count=count)
+    return columns
+
+
+class Columns(dict):
+    """欄位名稱對應 NumPy 陣列，meta 保存回應中 data 以外的欄位 (symbol、timeframe 等)"""
+
+    def __init__(self, arrays, meta=None):
+        super().__init__(arrays)
+        self.meta = meta or {}
+
+    def to_pandas(self):
+        import pandas as pd
+        frame = pd.DataFrame(dict(self))
+        if 'date' in frame:
+            frame['date'] = pd.to_datetime(frame['date'], unit='ms', utc=True).dt.tz_convert('Asia/Taipei')
+        return frame
+
+
+def to_columnar(response) -> Columns:
+    if np is None:
+        raise ImportError('format="columnar" requires numpy, install it with "pip install fugle-marketdata[numpy]"')
+    records = response.get('data') or []
+    meta = {k: v for k, v in response.items() if k != 'data'}
+    return Columns(records_to_columns(records), meta)
+
+
+def pop_format(params):
+    result_format = params.pop('format', None)
+    if result_format not in (None, COLUMNAR_FORMAT):
+        raise ValueError(f'unsupported format: {result_format}')
+    return result_format
+
+
+def apply_format(data, result_format):
+    return to_columnar(data) if result_format == COLUMNAR_FORMAT else data
@@ -0,0 +1,112 @@
+import threading
+from collections import OrderedDict
+
+
+class ConditionalConfig:
+    def __init__(self, max_entries: int = 1024):
+        # max_entries: 最多保留的 URL 數量，以 LRU 淘汰
+        if max_entries < 1:
+            raise ValueError('max_entries must be at least 1')
+        self.max_entries = max_entries
+
+
+class _Validator:
+    __slots__ = ('etag', 'last_modified', 'content')
+
+    def __init__(self, etag, last_modified, content):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content = content
+
+
+def _wire_size(response, content):
+    # Content-Length 為壓縮後的傳輸大小，未提供時以解壓後大小計算
+    length = response.headers.get('Content-Length')
+    try:
+        return int(length) if length is not None else len(content)
+    except (TypeError, ValueError):
+        return len(content)
+
+
+class ConditionalCache:
+    """
+    保存各 URL 最近一次回應的 ETag / Last-Modified 與內容，
+    下次請求時帶上 If-None-Match / If-Modified-Since，收到 304 時沿用保存的內容
+    """
+
+    def __init__(self, config: ConditionalConfig = None):
+        self.config = config or ConditionalConfig()
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_received = 0
+        self.bytes_decoded = 0
+        self.bytes_reused = 0
+
+    def prepare(self, url, headers):
+        """
+        回傳 (加上驗證標頭的 headers, 使用的驗證資訊)，沒有保存的驗證資訊時回傳 (headers, None)
+
+        驗證資訊需傳給 resolve()，避免請求期間 URL 被 LRU 淘汰時無法處理 304
+        """
+        with self.lock:
+            entry = self.entries.get(url)
+        if entry is None:
+            return headers, None
+        headers = dict(headers)
+        if entry.etag is not None:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified is not None:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers, entry
+
+    def resolve(self, url, response, validator: _Validator = None):
+        """回傳本次回應的內容，304 時以 prepare() 送出的驗證資訊所保存的內容取代"""
+        content = response.content or b''
+        wire_size = _wire_size(response, content)
+        with self.lock:
+            self.requests += 1
+            self.bytes_received += wire_size
+            if response.status_code == 304:
+                entry = validator if validator is not None else self.entries.get(url)
+                if entry is None:
+                    return content
+                if url not in self.entries:
+                    # 請求期間被其他 URL 淘汰，以送出的驗證資訊重新放回
+                    self.entries[url] = entry
+                    self.__evict()
+                self.entries.move_to_end(url)
+                self.not_modified += 1
+                self.bytes_reused += len(entry.content)
+                return entry.content
+
+            self.bytes_decoded += len(content)
+            if response.status_code != 200:
+                return content
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag is None and last_modified is None:
+                self.entries.pop(url, None)
+                return content
+            self.entries[url] = _Validator(etag, last_modified, content)
+            self.entries.move_to_end(url)
+            self.__evict()
+        return content
+
+    def __evict(self):
+        while len(self.entries) > self.config.max_entries:
+            self.entries.popitem(last=False)
+
+    def stats(self):
+        # bytes_saved: 304 沿用的內容 + 壓縮節省的傳輸量
+        with self.lock:
+            return {
+                'requests': self.requests,
+                'not_modified': self.not_modified,
+                'bytes_received': self.bytes_received,
+                'bytes_decoded': self.bytes_decoded,
+                'bytes_reused': self.bytes_reused,
+                'bytes_saved': self.bytes_reused + self.bytes_decoded - self.bytes_received,
+                'size': len(self.entries),
+            }
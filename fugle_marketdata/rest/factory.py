@@ -2,13 +2,45 @@ from ..client_factory import ClientFactory
 from ..constants import FUGLE_MARKETDATA_API_REST_BASE_URL, FUGLE_MARKETDATA_API_VERSION
 from .stock import RestStockClient
 from .futopt import RestFutOptClient
+from .session import create_session
+from .rate_limit import RateLimiter
+from .cache import ResponseCache
+from .singleflight import SingleFlight
+from .conditional import ConditionalCache
 
 
 class RestClientFactory(ClientFactory):
     def __init__(self, **options):
         super().__init__(**options)
         self.__clients = {}
+        self.__session = None
         self.options = options
+        rate_limit = options.get('rate_limit')
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit is not None else None
+        cache = options.get('cache')
+        self.response_cache = ResponseCache(cache) if cache is not None else None
+        self.single_flight = SingleFlight() if options.get('coalesce') else None
+        conditional = options.get('conditional')
+        self.conditional_cache = ConditionalCache(conditional) if conditional is not None else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def session(self):
+        # 所有 stock / futopt 資源共用同一個連線池
+        if self.__session is None:
+            self.__session = create_session(self.options.get('connection_pool'))
+        return self.__session
+
+    def close(self):
+        if self.__session is not None:
+            self.__session.close()
+            self.__session = None
+        self.__clients = {}
 
     @property
     def stock(self):
@@ -19,18 +51,23 @@ class RestClientFactory(ClientFactory):
         return self.get_client('futopt')
 
     def get_client(self, type):
+        if type in self.__clients:
+            return self.__clients[type]
+
         base_url = self.options.get('base_url')
         if not base_url:
             base_url = f"{FUGLE_MARKETDATA_API_REST_BASE_URL}/{FUGLE_MARKETDATA_API_VERSION}"
 
         url = f'{base_url.rstrip("/")}/{type}'
 
-        if type in self.__clients:
-            return self.__clients[type]
-
         # Create a copy of options and override base_url
         client_options = {**self.options}
         client_options['base_url'] = url
+        client_options['rate_limiter'] = self.rate_limiter
+        client_options['response_cache'] = self.response_cache
+        client_options['single_flight'] = self.single_flight
+        client_options['conditional_cache'] = self.conditional_cache
+        client_options['session'] = self.session
 
         if type == 'stock':
             client = RestStockClient(**client_options)
@@ -8,10 +8,14 @@ class RestFutOptClient:
         # config: base_url, api_key?, bearer_token?
         self.config = config
 
+        # 資源物件只建立一次，之後重複使用
+        self.__intraday = Intraday(**config)
+        self.__historical = Historical(**config)
+
     @property
     def intraday(self):
-        return Intraday(**self.config)
+        return self.__intraday
     
     @property
     def historical(self):
-        return Historical(**self.config)
\ No newline at end of file
+        return self.__historical
\ No newline at end of file
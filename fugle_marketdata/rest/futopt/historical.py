@@ -3,10 +3,25 @@ from ..base_rest import BaseRest
 class Historical(BaseRest):
     def daily(self, **params):
         symbol = params.pop('symbol')
-        return self.request(f"historical/daily/{symbol}", **params)
+        return self.request_chunked(f"historical/daily/{symbol}", **params)
+
+    def iter_daily(self, **params):
+        symbol = params.pop('symbol')
+        return self.iter_chunked(f"historical/daily/{symbol}", **params)
+
+    def daily_many(self, **params):
+        return self.request_many(self.daily, **params)
+
     def candles(self, **params):
         symbol = params.pop('symbol')
-        return self.request(f"historical/candles/{symbol}", **params)
+        return self.request_chunked(f"historical/candles/{symbol}", **params)
+
+    def iter_candles(self, **params):
+        symbol = params.pop('symbol')
+        return self.iter_chunked(f"historical/candles/{symbol}", **params)
+
+    def candles_many(self, **params):
+        return self.request_many(self.candles, **params)
     
 
     
\ No newline at end of file
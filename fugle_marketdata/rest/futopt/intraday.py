@@ -10,19 +10,34 @@ class Intraday(BaseRest):
     def ticker(self, **params):
         symbol = params.pop('symbol')
         return self.request(f"intraday/ticker/{symbol}", **params)
+
+    def ticker_many(self, **params):
+        return self.request_many(self.ticker, **params)
     
     def quote(self, **params):
         symbol = params.pop('symbol')
         return self.request(f"intraday/quote/{symbol}", **params)
+
+    def quote_many(self, **params):
+        return self.request_many(self.quote, **params)
     
     def candles(self, **params):
         symbol = params.pop('symbol')
         return self.request(f"intraday/candles/{symbol}", **params)
+
+    def candles_many(self, **params):
+        return self.request_many(self.candles, **params)
     
     def trades(self, **params):
         symbol = params.pop('symbol')
         return self.request(f"intraday/trades/{symbol}", **params)
+
+    def trades_many(self, **params):
+        return self.request_many(self.trades, **params)
     
     def volumes(self, **params):
         symbol = params.pop('symbol')
-        return self.request(f"intraday/volumes/{symbol}", **params)
\ No newline at end of file
+        return self.request(f"intraday/volumes/{symbol}", **params)
+
+    def volumes_many(self, **params):
+        return self.request_many(self.volumes, **params)
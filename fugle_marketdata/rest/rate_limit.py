@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class RateLimitConfig:
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[int] = None,
+        adaptive: bool = True,
+        min_rate: Optional[float] = None,
+        decrease_factor: float = 0.5,
+        increase_step: Optional[float] = None,
+    ):
+        # rate: 每秒請求數上限; burst: token bucket 容量
+        # adaptive: 收到 429 時降低速率 (乘法遞減)，成功回應後逐步回復 (加法遞增)
+        if rate <= 0:
+            raise ValueError('rate must be greater than 0')
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.adaptive = adaptive
+        self.min_rate = min_rate if min_rate is not None else rate / 10
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step if increase_step is not None else rate / 20
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """解析 Retry-After 標頭 (秒數或 HTTP 日期)"""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter:
+    """執行緒與 asyncio 皆可共用的 token bucket 限流器"""
+
+    def __init__(self, config: RateLimitConfig, clock=time.monotonic):
+        self.config = config
+        self.clock = clock
+        self.rate = config.rate
+        self.tokens = float(config.burst)
+        self.updated_at = clock()
+        self.blocked_until = 0.0
+        self.throttled = 0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(float(self.config.burst), self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def reserve(self) -> float:
+        """預約一個 token，回傳需要等待的秒數"""
+        with self.lock:
+            now = self.clock()
+            self._refill(now)
+            # token 不足時允許預支為負值，等待時間即為補足所需的時間
+            self.tokens -= 1
+            delay = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            return max(delay, self.blocked_until - now)
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def on_response(self, status_code, headers=None):
+        with self.lock:
+            if status_code == 429:
+                self.throttled += 1
+                now = self.clock()
+                self._refill(now)
+                retry_after = parse_retry_after(headers.get('Retry-After')) if headers else None
+                if retry_after is not None:
+                    self.blocked_until = max(self.blocked_until, now + retry_after)
+                    self.tokens = min(self.tokens, 0.0)
+                if self.config.adaptive:
+                    self.rate = max(self.config.min_rate, self.rate * self.config.decrease_factor)
+            elif status_code < 400 and self.config.adaptive and self.rate < self.config.rate:
+                self.rate = min(self.config.rate, self.rate + self.config.increase_step)
@@ -0,0 +1,112 @@
+import random
+import time
+from typing import Callable, Iterable, Optional, Tuple, Type
+from .rate_limit import parse_retry_after
+
+DEFAULT_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RetryConfig:
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_base: float = 0.5,
+        backoff_multiplier: float = 2.0,
+        backoff_max: float = 30.0,
+        jitter: float = 1.0,
+        retry_statuses: Iterable[int] = DEFAULT_RETRY_STATUSES,
+        retry_exceptions: Optional[Tuple[Type[BaseException], ...]] = None,
+        deadline: Optional[float] = None,
+        hook: Optional[Callable[['RetryEvent'], None]] = None,
+    ):
+        # backoff: min(backoff_max, backoff_base * backoff_multiplier ** (attempt - 1))
+        # jitter: 隨機扣減的比例，1.0 為 full jitter，0 為固定間隔
+        # retry_exceptions: 未指定時使用各 transport 的連線 / 逾時例外
+        # deadline: 從第一次請求起算的總秒數上限
+        # hook: 每次請求結束後呼叫，可用於統計重試次數與延遲
+        if max_attempts < 1:
+            raise ValueError('max_attempts must be at least 1')
+        if not 0 <= jitter <= 1:
+            raise ValueError('jitter must be between 0 and 1')
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_multiplier = backoff_multiplier
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_exceptions = retry_exceptions
+        self.deadline = deadline
+        self.hook = hook
+
+    def backoff(self, attempt):
+        delay = min(self.backoff_max, self.backoff_base * self.backoff_multiplier ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())
+
+
+class RetryEvent:
+    def __init__(self, url, attempt, elapsed, status_code=None, error=None, delay=None):
+        # delay 為 None 代表不再重試
+        self.url = url
+        self.attempt = attempt
+        self.elapsed = elapsed
+        self.status_code = status_code
+        self.error = error
+        self.delay = delay
+
+    @property
+    def will_retry(self):
+        return self.delay is not None
+
+
+class RetryState:
+    """追蹤單一請求的重試次數與耗時"""
+
+    def __init__(self, config: Optional[RetryConfig], url, default_exceptions):
+        self.config = config
+        self.url = url
+        self.exceptions = default_exceptions
+        if config is not None and config.retry_exceptions is not None:
+            self.exceptions = config.retry_exceptions
+        self.attempt = 0
+        self.started_at = time.monotonic()
+
+    def begin(self):
+        self.attempt += 1
+
+    def next_delay(self, response=None, error=None) -> Optional[float]:
+        """回傳下一次重試前的等待秒數，不需重試時回傳 None"""
+        config = self.config
+        if config is None:
+            return None
+
+        delay = None
+        status_code = response.status_code if response is not None else None
+        if self.attempt < config.max_attempts:
+            if error is not None and isinstance(error, self.exceptions):
+                delay = config.backoff(self.attempt)
+            elif status_code in config.retry_statuses:
+                delay = config.backoff(self.attempt)
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if retry_after is not None:
+                    delay = max(delay, retry_after)
+
+        elapsed = time.monotonic() - self.started_at
+        if delay is not None and config.deadline is not None and elapsed + delay > config.deadline:
+            delay = None
+
+        if config.hook is not None:
+            config.hook(RetryEvent(self.url, self.attempt, elapsed, status_code=status_code, error=error, delay=delay))
+        return delay
+
+
+class NoRetry:
+    """未設定 RetryConfig 時使用，只送出一次請求"""
+
+    def begin(self):
+        pass
+
+    def next_delay(self, response=None, error=None):
+        return None
+
+
+NO_RETRY = NoRetry()
@@ -0,0 +1,65 @@
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+
+# 安裝 brotli 時 urllib3 / aiohttp 才能解壓 br
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = 'gzip, deflate, br'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
+
+
+class ConnectionPoolConfig:
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        timeout: Optional[float] = None,
+    ):
+        # pool_connections: 快取的 host 連線池數量
+        # pool_maxsize: 每個 host 最多保留的連線數
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """套用預設 timeout 的 HTTPAdapter"""
+
+    def __init__(self, timeout=None, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def create_session(config: Optional[ConnectionPoolConfig] = None) -> requests.Session:
+    """建立共用連線池的 requests.Session"""
+    config = config or ConnectionPoolConfig()
+    session = requests.Session()
+    adapter = TimeoutHTTPAdapter(
+        timeout=config.timeout,
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        pool_block=config.pool_block,
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    if not config.keep_alive:
+        session.headers['Connection'] = 'close'
+
+    return session
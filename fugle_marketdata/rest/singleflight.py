@@ -0,0 +1,72 @@
+import asyncio
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.shared = 0
+
+
+class SingleFlight:
+    """相同 key 的並行呼叫只執行一次，其餘呼叫共用同一份結果或例外"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.async_calls = {}
+        self.coalesced = 0
+
+    @staticmethod
+    def key_for(base_url, path, params):
+        return (base_url, path.lstrip('/'), tuple(sorted((k, str(v)) for k, v in params.items())))
+
+    def do(self, key, fn):
+        with self.lock:
+            call = self.calls.get(key)
+            if call is not None:
+                call.shared += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self.calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.event.set()
+
+    async def do_async(self, key, fn):
+        # asyncio.Task 只能在建立它的 event loop 中等待，因此 key 需包含 loop
+        loop = asyncio.get_event_loop()
+        async_key = (id(loop), key)
+        task = self.async_calls.get(async_key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            # fn() 在獨立的 task 中執行，任一呼叫者被取消都不影響其他呼叫者
+            task = self.async_calls[async_key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self.__finish(async_key, done))
+        return await asyncio.shield(task)
+
+    def __finish(self, async_key, task):
+        if self.async_calls.get(async_key) is task:
+            del self.async_calls[async_key]
+        # 所有呼叫者都已取消時，避免出現 "exception was never retrieved" 警告
+        if not task.cancelled():
+            task.exception()
@@ -1 +1,2 @@
-from .client import RestStockClient
\ No newline at end of file
+from .client import RestStockClient
+from .snapshot import SnapshotTracker, SnapshotDiff
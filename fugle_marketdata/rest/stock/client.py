@@ -10,22 +10,29 @@ class RestStockClient:
         # config: base_url, api_key?, bearer_token?
         self.config = config
 
+        # 資源物件只建立一次，之後重複使用
+        self.__intraday = Intraday(**config)
+        self.__historical = Historical(**config)
+        self.__snapshot = Snapshot(**config)
+        self.__technical = Technical(**config)
+        self.__corporate_actions = CorporateActions(**config)
+
     @property
     def intraday(self):
-        return Intraday(**self.config)
+        return self.__intraday
     
     @property
     def historical(self):
-        return Historical(**self.config)
+        return self.__historical
     
     @property
     def snapshot(self):
-        return Snapshot(**self.config)
+        return self.__snapshot
     
     @property
     def technical(self):
-        return Technical(**self.config)
+        return self.__technical
 
     @property
     def corporate_actions(self):
-        return CorporateActions(**self.config)
+        return self.__corporate_actions
@@ -3,9 +3,19 @@ from ..base_rest import BaseRest
 class Historical(BaseRest):
     def candles(self, **params):
         symbol = params.pop('symbol')
-        return self.request(f"historical/candles/{symbol}", **params)
+        return self.request_chunked(f"historical/candles/{symbol}", **params)
+
+    def iter_candles(self, **params):
+        symbol = params.pop('symbol')
+        return self.iter_chunked(f"historical/candles/{symbol}", **params)
+
+    def candles_many(self, **params):
+        return self.request_many(self.candles, **params)
     
     def stats(self, **params):
         symbol = params.pop('symbol')
         return self.request(f"historical/stats/{symbol}", **params)
+
+    def stats_many(self, **params):
+        return self.request_many(self.stats, **params)
     
\ No newline at end of file
@@ -1,15 +1,159 @@
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional, Sequence
 from ..base_rest import BaseRest
+from ..columnar import _to_float
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# 預設比對的數值欄位，name 等文字欄位不列入比對
+SNAPSHOT_FIELDS = (
+    'openPrice', 'highPrice', 'lowPrice', 'closePrice', 'change', 'changePercent',
+    'tradeVolume', 'tradeValue', 'lastUpdated',
+)
+
 
 class Snapshot(BaseRest):
     def quotes(self, **params):
         market = params.pop('market')
         return self.request(f"snapshot/quotes/{market}", **params)
-    
+
     def movers(self, **params):
         market = params.pop('market')
         return self.request(f"snapshot/movers/{market}", **params)
-    
+
     def actives(self, **params):
         market = params.pop('market')
         return self.request(f"snapshot/actives/{market}", **params)
-    
\ No newline at end of file
+
+    def track(self, **params):
+        # params: market, fields?, callback?, 其餘參數原樣傳給 quotes
+        return SnapshotTracker(self, **params)
+
+
+class SnapshotDiff:
+    """
+    兩次快照之間的差異
+
+    changed: symbol 對應有變動的欄位與新值; added / removed: 新增與消失的 symbol
+    """
+
+    def __init__(self, changed, added, removed, date=None, time=None):
+        self.changed = changed
+        self.added = added
+        self.removed = removed
+        self.date = date
+        self.time = time
+
+    def __bool__(self):
+        return bool(self.changed or self.added or self.removed)
+
+    def __len__(self):
+        return len(self.changed)
+
+    def __repr__(self):
+        return f'SnapshotDiff(changed={len(self.changed)}, added={len(self.added)}, removed={len(self.removed)})'
+
+
+class SnapshotTracker:
+    """
+    保存上一次的全市場快照 (symbol 索引 + float64 欄位矩陣)，
+    每次輪詢以向量化比對只回傳有變動的列與欄位
+    """
+
+    def __init__(self, snapshot, market: str, fields: Sequence[str] = SNAPSHOT_FIELDS, callback: Optional[Callable[[SnapshotDiff], None]] = None, **params):
+        # snapshot: client.stock.snapshot; callback: 每次輪詢有變動時呼叫
+        if np is None:
+            raise ImportError('SnapshotTracker requires numpy, install it with "pip install fugle-marketdata[numpy]"')
+        self.snapshot = snapshot
+        self.market = market
+        self.fields = list(fields)
+        self.callback = callback
+        self.params = params
+        self.symbols: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.values = np.empty((0, len(self.fields)), dtype=np.float64)
+        self.rows: List[dict] = []
+
+    def _to_matrix(self, rows):
+        count = len(rows)
+        matrix = np.empty((count, len(self.fields)), dtype=np.float64)
+        for column, field in enumerate(self.fields):
+            matrix[:, column] = np.fromiter(
+                (_to_float(row.get(field)) for row in rows), dtype=np.float64, count=count
+            )
+        return matrix
+
+    def diff(self, response) -> SnapshotDiff:
+        """以一份 quotes 回應更新狀態並回傳差異，第一次呼叫時所有 symbol 皆視為新增"""
+        rows = response.get('data') or []
+        symbols = [row['symbol'] for row in rows]
+        values = self._to_matrix(rows)
+
+        same_order = symbols == self.symbols
+        if same_order:
+            # 常見情況: symbol 順序不變，直接整個矩陣比對
+            previous = self.values
+            added = []
+        else:
+            index = self.index
+            positions = np.fromiter((index.get(symbol, -1) for symbol in symbols), dtype=np.int64, count=len(symbols))
+            known = positions >= 0
+            added = [symbols[i] for i in np.flatnonzero(~known)]
+            previous = np.full_like(values, np.nan)
+            previous[known] = self.values[positions[known]]
+
+        changed_mask = (values != previous) & ~(np.isnan(values) & np.isnan(previous))
+        if added:
+            changed_mask[positions < 0] = False
+
+        changed = {}
+        fields = self.fields
+        for row, column in zip(*np.nonzero(changed_mask)):
+            changed.setdefault(symbols[row], {})[fields[column]] = rows[row].get(fields[column])
+
+        removed = []
+        if not same_order:
+            current = set(symbols)
+            removed = [symbol for symbol in self.symbols if symbol not in current]
+            self.index = {symbol: i for i, symbol in enumerate(symbols)}
+            self.symbols = symbols
+
+        self.values = values
+        self.rows = rows
+        result = SnapshotDiff(changed, added, removed, date=response.get('date'), time=response.get('time'))
+        if result and self.callback is not None:
+            self.callback(result)
+        return result
+
+    def get(self, symbol) -> Optional[dict]:
+        """回傳最近一次快照中該 symbol 的完整資料"""
+        position = self.index.get(symbol)
+        return self.rows[position] if position is not None else None
+
+    def poll(self) -> SnapshotDiff:
+        return self.diff(self.snapshot.quotes(market=self.market, **self.params))
+
+    async def poll_async(self) -> SnapshotDiff:
+        # 搭配 AsyncRestClient 使用
+        return self.diff(await self.snapshot.quotes(market=self.market, **self.params))
+
+    def watch(self, interval: float):
+        """每 interval 秒輪詢一次，只產出有變動的差異"""
+        while True:
+            started_at = time.monotonic()
+            result = self.poll()
+            if result:
+                yield result
+            time.sleep(max(0, interval - (time.monotonic() - started_at)))
+
+    async def watch_async(self, interval: float):
+        while True:
+            started_at = time.monotonic()
+            result = await self.poll_async()
+            if result:
+                yield result
+            await asyncio.sleep(max(0, interval - (time.monotonic() - started_at)))
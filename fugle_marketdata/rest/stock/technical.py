@@ -5,18 +5,33 @@ class Technical(BaseRest):
         symbol = params.pop('symbol')
         return self.request(f"technical/sma/{symbol}", **params)
 
+    def sma_many(self, **params):
+        return self.request_many(self.sma, **params)
+
     def rsi(self, **params):
         symbol = params.pop('symbol')
         return self.request(f"technical/rsi/{symbol}", **params)
 
+    def rsi_many(self, **params):
+        return self.request_many(self.rsi, **params)
+
     def kdj(self, **params):
         symbol = params.pop('symbol')
         return self.request(f"technical/kdj/{symbol}", **params)
 
+    def kdj_many(self, **params):
+        return self.request_many(self.kdj, **params)
+
     def macd(self, **params):
         symbol = params.pop('symbol')
         return self.request(f"technical/macd/{symbol}", **params)
 
+    def macd_many(self, **params):
+        return self.request_many(self.macd, **params)
+
     def bb(self, **params):
         symbol = params.pop('symbol')
         return self.request(f"technical/bb/{symbol}", **params)
+
+    def bb_many(self, **params):
+        return self.request_many(self.bb, **params)
@@ -0,0 +1 @@
+from .candle_store import CandleStore
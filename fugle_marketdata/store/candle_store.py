@@ -0,0 +1,239 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+import orjson
+from ..constants import FUGLE_MARKETDATA_TIMEZONE
+from ..exceptions import FugleAPIError
+from ..rest.batch import BatchResult, DEFAULT_BATCH_CONCURRENCY
+from ..rest.columnar import TIMEZONE_OFFSET_MS, records_to_columns
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+DAY_MS = 86400000
+
+
+def date_to_ms(value: date):
+    return (value - date(1970, 1, 1)).days * DAY_MS - TIMEZONE_OFFSET_MS
+
+
+def merge_ranges(ranges: Iterable[Tuple[date, date]]) -> List[Tuple[date, date]]:
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_ranges(covered: List[Tuple[date, date]], start: date, end: date) -> List[Tuple[date, date]]:
+    missing = []
+    cursor = start
+    for covered_start, covered_end in covered:
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > cursor:
+            missing.append((cursor, covered_start - timedelta(days=1)))
+        cursor = max(cursor, covered_end + timedelta(days=1))
+        if cursor > end:
+            break
+    if cursor <= end:
+        missing.append((cursor, end))
+    return missing
+
+
+def _parse_date(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+class CandleStore:
+    """
+    以 .npy 欄位檔保存歷史 K 線，並記錄已同步的日期區間
+
+    目錄結構: {root}/{symbol}/{timeframe}/{field}.{version}.npy + meta.json
+
+    每次寫入以新的 version 寫出全部欄位檔，最後才更新 meta.json，
+    中途失敗時 meta.json 仍指向上一個完整的版本
+    """
+
+    def __init__(self, historical, root: str, method: str = 'candles'):
+        # historical: client.stock.historical 或 client.futopt.historical
+        # method: 'candles'，或期權的 'daily'
+        if np is None:
+            raise ImportError('CandleStore requires numpy, install it with "pip install fugle-marketdata[numpy]"')
+        self.historical = historical
+        self.root = root
+        self.method = method
+        self.__locks = {}
+        self.__locks_guard = threading.Lock()
+
+    def _lock(self, directory):
+        with self.__locks_guard:
+            return self.__locks.setdefault(directory, threading.Lock())
+
+    def _directory(self, symbol, timeframe):
+        name = timeframe if self.method == 'candles' else self.method
+        return os.path.join(self.root, symbol, name)
+
+    def _read_meta(self, directory):
+        try:
+            with open(os.path.join(directory, 'meta.json'), 'rb') as f:
+                meta = orjson.loads(f.read())
+        except FileNotFoundError:
+            return {'fields': None, 'ranges': [], 'version': None, 'rows': None}
+        meta['ranges'] = [(date.fromisoformat(s), date.fromisoformat(e)) for s, e in meta['ranges']]
+        # 舊版 meta.json 沒有 version，欄位檔為 {field}.npy
+        meta.setdefault('version', None)
+        meta.setdefault('rows', None)
+        return meta
+
+    def _write_meta(self, directory, meta):
+        data = {
+            'fields': meta['fields'],
+            'ranges': [[s.isoformat(), e.isoformat()] for s, e in meta['ranges']],
+            'version': meta['version'],
+            'rows': meta['rows'],
+        }
+        self._atomic_write(os.path.join(directory, 'meta.json'), orjson.dumps(data))
+
+    @staticmethod
+    def _column_path(directory, field, version):
+        name = f'{field}.npy' if version is None else f'{field}.{version}.npy'
+        return os.path.join(directory, name)
+
+    @staticmethod
+    def _atomic_write(path, content=None, array=None):
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                if array is not None:
+                    np.save(f, array)
+                else:
+                    f.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _load(self, directory, meta, mmap_mode=None):
+        """讀取 meta 指向的欄位檔，檔案缺少或筆數不一致時回傳 None"""
+        if meta['fields'] is None:
+            return None
+        columns = {}
+        for field in ['date'] + meta['fields']:
+            try:
+                columns[field] = np.load(self._column_path(directory, field, meta['version']), mmap_mode=mmap_mode)
+            except (OSError, ValueError, EOFError):
+                return None
+        lengths = {len(array) for array in columns.values()}
+        if len(lengths) != 1 or (meta['rows'] is not None and lengths != {meta['rows']}):
+            return None
+        return columns
+
+    def coverage(self, symbol, timeframe='D') -> List[Tuple[date, date]]:
+        directory = self._directory(symbol, timeframe)
+        with self._lock(directory):
+            meta = self._read_meta(directory)
+            if meta['fields'] is not None and self._load(directory, meta, mmap_mode='r') is None:
+                # 欄位檔損毀，視為尚未同步
+                return []
+        return meta['ranges']
+
+    def write(self, symbol, records: List[dict], start, end, timeframe='D'):
+        """寫入一段已抓取的資料，並將 [start, end] 中已收盤的部分標記為已同步"""
+        directory = self._directory(symbol, timeframe)
+        os.makedirs(directory, exist_ok=True)
+        with self._lock(directory):
+            meta = self._read_meta(directory)
+            previous = dict(meta)
+            existing = self._load(directory, meta)
+            if existing is None and meta['fields'] is not None:
+                # 欄位檔損毀，已同步的區間需重新抓取
+                meta['ranges'] = []
+            if records:
+                columns = records_to_columns(records, meta['fields'])
+                if meta['fields'] is None:
+                    meta['fields'] = [field for field in columns if field != 'date']
+                if existing is not None:
+                    columns = {field: np.concatenate([existing[field], columns[field]]) for field in columns}
+                columns = self._dedupe(columns)
+                meta['version'] = (meta['version'] or 0) + 1
+                meta['rows'] = len(columns['date'])
+                for field, array in columns.items():
+                    self._atomic_write(self._column_path(directory, field, meta['version']), array=array)
+
+            # 今日 (含) 之後的資料可能尚未定案，不標記為已同步
+            closed_end = min(_parse_date(end), datetime.now(FUGLE_MARKETDATA_TIMEZONE).date() - timedelta(days=1))
+            start = _parse_date(start)
+            if start <= closed_end:
+                meta['ranges'] = merge_ranges(meta['ranges'] + [(start, closed_end)])
+            self._write_meta(directory, meta)
+            if meta['version'] != previous['version']:
+                self._remove_columns(directory, previous)
+        return len(records)
+
+    def _remove_columns(self, directory, meta):
+        if meta['fields'] is None:
+            return
+        for field in ['date'] + meta['fields']:
+            try:
+                os.remove(self._column_path(directory, field, meta['version']))
+            except OSError:
+                # 檔案不存在，或仍被 memory-map 開啟 (Windows)
+                pass
+
+    @staticmethod
+    def _dedupe(columns):
+        # 依時間排序，相同時間保留較新寫入的資料
+        order = np.argsort(columns['date'], kind='stable')
+        sorted_dates = columns['date'][order]
+        keep = np.append(sorted_dates[1:] != sorted_dates[:-1], True)
+        index = order[keep]
+        return {field: array[index] for field, array in columns.items()}
+
+    def _sync_symbol(self, symbol, start, end, timeframe, params):
+        added = 0
+        for missing_start, missing_end in missing_ranges(self.coverage(symbol, timeframe), start, end):
+            request_params = {**params, 'symbol': symbol, 'from': missing_start.isoformat(), 'to': missing_end.isoformat()}
+            if self.method == 'candles':
+                request_params['timeframe'] = timeframe
+            response = getattr(self.historical, self.method)(**request_params)
+            added += self.write(symbol, response.get('data') or [], missing_start, missing_end, timeframe)
+        return added
+
+    def sync(self, symbols: Iterable[str], start, end, timeframe='D', concurrency=DEFAULT_BATCH_CONCURRENCY, **params) -> List[BatchResult]:
+        """只抓取尚未同步的日期區間，BatchResult.data 為新增的筆數"""
+        start, end = _parse_date(start), _parse_date(end)
+
+        def sync_one(symbol):
+            try:
+                return BatchResult(symbol, data=self._sync_symbol(symbol, start, end, timeframe, params))
+            except FugleAPIError as error:
+                return BatchResult(symbol, error=error)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(sync_one, symbols))
+
+    def query(self, symbol, start=None, end=None, timeframe='D') -> Optional[Dict[str, 'np.ndarray']]:
+        """以 memory-mapped 陣列回傳 [start, end] 區間的資料，尚無資料時回傳 None"""
+        directory = self._directory(symbol, timeframe)
+        # 與 write 互斥，避免讀到新舊版本混合的 meta 與欄位檔
+        with self._lock(directory):
+            meta = self._read_meta(directory)
+            columns = self._load(directory, meta, mmap_mode='r')
+        if columns is None:
+            return None
+        dates = columns['date']
+        lo = 0 if start is None else int(np.searchsorted(dates, date_to_ms(_parse_date(start)), side='left'))
+        hi = len(dates) if end is None else int(np.searchsorted(dates, date_to_ms(_parse_date(end)) + DAY_MS, side='left'))
+        return {field: array[lo:hi] for field, array in columns.items()}
@@ -1,4 +1,8 @@
 from .factory import WebSocketClientFactory
-from .client import HealthCheckConfig
+from .client import HealthCheckConfig, Message, ReconnectConfig
+from .conflation import ConflationConfig
+from .dispatch import DispatchConfig
+from .pool import WebSocketPool
+from .aio import AsyncWebSocketClientFactory
 
-__all__ = ['WebSocketClientFactory', 'HealthCheckConfig']
\ No newline at end of file
+__all__ = ['WebSocketClientFactory', 'AsyncWebSocketClientFactory', 'HealthCheckConfig', 'ReconnectConfig', 'Message', 'DispatchConfig', 'ConflationConfig', 'WebSocketPool']
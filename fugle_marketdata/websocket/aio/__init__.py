@@ -0,0 +1,2 @@
+from .factory import AsyncWebSocketClientFactory
+from .client import AsyncWebSocketClient, MessageStream
@@ -0,0 +1,266 @@
+import asyncio
+import time
+from typing import Optional
+import orjson
+from ...constants import (
+    AUTHENTICATED_EVENT,
+    AUTHENTICATION_TIMEOUT_MESSAGE,
+    CONNECTION_CLOSED_MESSAGE,
+    CONNECTION_TIMEOUT_MESSAGE,
+    ERROR_EVENT,
+    MISSING_CREDENTIALS_MESSAGE,
+    UNAUTHENTICATED_MESSAGE,
+)
+from ..client import DEFAULT_CONNECT_TIMEOUT, AuthenticationState, HealthCheckConfig, build_auth_message
+
+try:
+    import websockets
+except ImportError:  # pragma: no cover
+    websockets = None
+
+# 送出認證後等待回應的秒數，與 WebSocketClient 相同
+AUTHENTICATION_TIMEOUT = 5
+DEFAULT_QUEUE_SIZE = 1000
+OVERFLOW_POLICIES = ('block', 'drop_oldest')
+
+_CLOSED = object()
+
+
+class MessageStream:
+    """
+    client.messages() 回傳的非同步迭代器，建立時即開始接收訊息
+
+    overflow='block': 佇列滿時暫停讀取 socket，由 TCP 將壓力傳回伺服器
+    overflow='drop_oldest': 佇列滿時丟棄最舊的訊息，dropped 記錄丟棄數量
+    不再讀取時請呼叫 aclose() 或以 async with 使用，否則 block 模式下佇列滿時會暫停所有 stream
+    """
+
+    def __init__(self, client, channel=None, symbol=None, maxsize=DEFAULT_QUEUE_SIZE, overflow='block'):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f'overflow must be one of {", ".join(OVERFLOW_POLICIES)}')
+        self.client = client
+        self.channel = channel
+        self.symbol = symbol
+        self.overflow = overflow
+        self.queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+        self.closed = False
+
+    def matches(self, message):
+        if self.channel is None and self.symbol is None:
+            return True
+        if message.get('event') not in ('data', 'snapshot'):
+            return False
+        if self.channel is not None and message.get('channel') != self.channel:
+            return False
+        if self.symbol is not None and (message.get('data') or {}).get('symbol') != self.symbol:
+            return False
+        return True
+
+    async def put(self, message):
+        if self.closed:
+            return
+        if self.overflow == 'block':
+            await self.queue.put(message)
+            if self.closed:
+                # 等待期間 stream 已關閉
+                self.__drain()
+            return
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+    def finish(self):
+        # 連線結束時放入結束標記，佇列已滿則丟棄最舊的訊息騰出空間
+        if self.closed:
+            return
+        self.closed = True
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(_CLOSED)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.closed and self.queue.empty():
+            raise StopAsyncIteration
+        message = await self.queue.get()
+        if message is _CLOSED:
+            self.client._remove_stream(self)
+            raise StopAsyncIteration
+        return message
+
+    async def aclose(self):
+        self.closed = True
+        self.client._remove_stream(self)
+        # 清空佇列以喚醒因佇列已滿而等待中的 put，讓 reader 繼續分派給其他 stream
+        self.__drain()
+
+    def __drain(self):
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+
+class AsyncWebSocketClient:
+    """以 websockets 實作的 asyncio WebSocket client，訊息只在 event loop 中解析與分派"""
+
+    def __init__(self, **config):
+        if websockets is None:
+            raise ImportError('AsyncWebSocketClient requires websockets, install it with "pip install fugle-marketdata[async]"')
+        self.config = config
+        self.health_check: Optional[HealthCheckConfig] = config.get('health_check')
+        self.auth_status = AuthenticationState.PENDING
+        self.missed_pongs = 0
+        self.timings = {}
+        self.__ws = None
+        self.__reader = None
+        self.__pinger = None
+        self.__streams = []
+
+    @property
+    def connected(self):
+        return self.__ws is not None and self.auth_status == AuthenticationState.AUTHENTICATED
+
+    async def connect(self, timeout: Optional[float] = None):
+        # timeout: 等待連線與認證的秒數，未指定時使用 config 的 connect_timeout
+        if timeout is None:
+            timeout = self.config.get('connect_timeout', DEFAULT_CONNECT_TIMEOUT)
+        auth_info = build_auth_message(self.config)
+        if auth_info is None:
+            raise Exception(MISSING_CREDENTIALS_MESSAGE)
+
+        started_at = time.monotonic()
+        try:
+            ws = await asyncio.wait_for(
+                websockets.connect(self.config.get('base_url'), ping_interval=None), timeout
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(CONNECTION_TIMEOUT_MESSAGE)
+        opened_at = time.monotonic()
+
+        self.auth_status = AuthenticationState.AUTHENTICATING
+        try:
+            await ws.send(orjson.dumps(auth_info).decode('utf-8'))
+            remaining = min(AUTHENTICATION_TIMEOUT, max(0, timeout - (opened_at - started_at)))
+            await asyncio.wait_for(self.__wait_authenticated(ws), remaining)
+        except asyncio.TimeoutError:
+            await ws.close()
+            self.auth_status = AuthenticationState.PENDING
+            raise Exception(AUTHENTICATION_TIMEOUT_MESSAGE)
+        except BaseException:
+            await ws.close()
+            self.auth_status = AuthenticationState.PENDING
+            raise
+
+        now = time.monotonic()
+        self.timings = {'connect': opened_at - started_at, 'authenticate': now - opened_at, 'total': now - started_at}
+        self.auth_status = AuthenticationState.AUTHENTICATED
+        self.__ws = ws
+        self.__reader = asyncio.ensure_future(self.__read(ws))
+        if self.health_check and self.health_check.enabled:
+            self.missed_pongs = 0
+            self.__pinger = asyncio.ensure_future(self.__ping_loop())
+
+    async def __wait_authenticated(self, ws):
+        while True:
+            try:
+                message = orjson.loads(await ws.recv())
+            except websockets.exceptions.ConnectionClosed:
+                raise Exception(CONNECTION_CLOSED_MESSAGE)
+            event = message.get('event')
+            if event == AUTHENTICATED_EVENT:
+                return message
+            if event == ERROR_EVENT:
+                data = message.get('data') or {}
+                raise Exception(data.get('message') or UNAUTHENTICATED_MESSAGE)
+
+    async def __read(self, ws):
+        try:
+            async for data in ws:
+                message = orjson.loads(data)
+                if message.get('event') == 'pong':
+                    self.missed_pongs = 0
+                for stream in list(self.__streams):
+                    if stream.matches(message):
+                        await stream.put(message)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            self.auth_status = AuthenticationState.PENDING
+            if self.__ws is ws:
+                self.__ws = None
+            streams, self.__streams = self.__streams, []
+            for stream in streams:
+                stream.finish()
+            if self.__pinger is not None:
+                self.__pinger.cancel()
+                self.__pinger = None
+
+    async def __ping_loop(self):
+        interval = self.health_check.ping_interval / 1000.0
+        while True:
+            await asyncio.sleep(interval)
+            if self.missed_pongs >= self.health_check.max_missed_pongs:
+                # 連續未收到 pong，關閉連線讓 messages() 結束
+                self.__pinger = None
+                await self.__close_socket()
+                return
+            self.missed_pongs += 1
+            await self.ping('')
+
+    def messages(self, channel: Optional[str] = None, symbol: Optional[str] = None, maxsize: int = DEFAULT_QUEUE_SIZE, overflow: str = 'block') -> MessageStream:
+        """回傳訊息的非同步迭代器，可依 channel / symbol 過濾；連線結束時迭代結束"""
+        stream = MessageStream(self, channel, symbol, maxsize, overflow)
+        self.__streams.append(stream)
+        return stream
+
+    def _remove_stream(self, stream):
+        if stream in self.__streams:
+            self.__streams.remove(stream)
+
+    async def __send(self, message):
+        if self.__ws is None:
+            raise Exception('websocket is not connected')
+        await self.__ws.send(orjson.dumps(message).decode('utf-8'))
+
+    async def ping(self, message):
+        await self.__send({'event': 'ping', 'data': {'state': message}})
+
+    async def subscribe(self, params):
+        await self.__send({'event': 'subscribe', 'data': params})
+
+    async def unsubscribe(self, params):
+        await self.__send({'event': 'unsubscribe', 'data': params})
+
+    async def subscriptions(self):
+        await self.__send({'event': 'subscriptions'})
+
+    async def __close_socket(self):
+        if self.__ws is not None:
+            await self.__ws.close()
+
+    async def disconnect(self):
+        if self.__pinger is not None:
+            self.__pinger.cancel()
+            self.__pinger = None
+        await self.__close_socket()
+        if self.__reader is not None:
+            await asyncio.gather(self.__reader, return_exceptions=True)
+            self.__reader = None
+        self.__ws = None
+        self.auth_status = AuthenticationState.PENDING
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.disconnect()
@@ -0,0 +1,40 @@
+from ...client_factory import ClientFactory
+from ...constants import FUGLE_MARKETDATA_API_WEBSOCKET_BASE_URL, FUGLE_MARKETDATA_API_VERSION
+from .stock import AsyncWebSocketStockClient
+from .futopt import AsyncWebSocketFutOptClient
+
+
+class AsyncWebSocketClientFactory(ClientFactory):
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.__clients = {}
+        self.options = options
+
+    @property
+    def stock(self):
+        return self.get_client('stock')
+
+    @property
+    def futopt(self):
+        return self.get_client('futopt')
+
+    def get_client(self, type):
+        if type in self.__clients:
+            return self.__clients[type]
+
+        base_url = self.options.get('base_url')
+        if not base_url:
+            base_url = f"{FUGLE_MARKETDATA_API_WEBSOCKET_BASE_URL}/{FUGLE_MARKETDATA_API_VERSION}"
+
+        url = f'{base_url.rstrip("/")}/{type}/streaming'
+        client_options = {**self.options, 'base_url': url}
+
+        if type == 'stock':
+            client = AsyncWebSocketStockClient(**client_options)
+        elif type == 'futopt':
+            client = AsyncWebSocketFutOptClient(**client_options)
+        else:
+            raise ValueError(f'unsupported client type: {type}')
+
+        self.__clients[type] = client
+        return client
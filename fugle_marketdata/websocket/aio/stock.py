@@ -0,0 +1,5 @@
+from .client import AsyncWebSocketClient
+
+
+class AsyncWebSocketStockClient(AsyncWebSocketClient):
+    pass
@@ -1,23 +1,51 @@
+import logging
+import random
+import time
 import orjson
 import websocket
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from pyee import EventEmitter
-from threading import Thread, Timer
+from threading import Event, Thread, Timer
+from .conflation import ConflationConfig, LatestTable
+from .dispatch import DispatchConfig, Dispatcher
+from .subscriptions import MAX_SYMBOLS_PER_FRAME, SubscriptionRegistry, _expand, _normalize
 
 from ..constants import (
     AUTHENTICATION_TIMEOUT_MESSAGE,
+    CONNECTION_CLOSED_MESSAGE,
+    CONNECTION_TIMEOUT_MESSAGE,
     CONNECT_EVENT,
     DISCONNECT_EVENT,
     MESSAGE_EVENT,
     ERROR_EVENT,
     AUTHENTICATED_EVENT,
+    BACKFILL_EVENT,
     MISSING_CREDENTIALS_MESSAGE,
+    RECONNECT_EVENT,
     UNAUTHENTICATED_EVENT,
     UNAUTHENTICATED_MESSAGE
 )
 
+logger = logging.getLogger(__name__)
+
 websocket.setdefaulttimeout(5)
 
+# connect() 等待連線與認證完成的預設秒數
+DEFAULT_CONNECT_TIMEOUT = 30
+
+# 補回缺口時同時查詢的商品數
+BACKFILL_CONCURRENCY = 4
+
+# message listener 收到的格式: raw 為原始字串, dict 為解析後的物件, lazy 為 Message
+MESSAGE_FORMATS = ('raw', 'dict', 'lazy')
+
+# 帶有 channel / symbol 的訊息 event，依 on_channel 註冊分派
+ROUTED_EVENTS = ('data', 'snapshot')
+
+# 行情資料訊息以此開頭，client 不需解析即可判斷 event
+DATA_MESSAGE_PREFIX = '{"event":"data"'
+
 
 class HealthCheckConfig:
     def __init__(self, enabled: bool = False, ping_interval: int = 30000, max_missed_pongs: int = 2):
@@ -26,6 +54,101 @@ class HealthCheckConfig:
         self.max_missed_pongs = max_missed_pongs
 
 
+class ReconnectConfig:
+    def __init__(self, initial_delay: float = 1.0, max_delay: float = 30.0, multiplier: float = 2.0,
+                 jitter: float = 0.1, max_attempts: Optional[int] = None, backfill=None,
+                 backfill_page_size: int = 500, backfill_max_pages: int = 20):
+        # 第 n 次重連前等待 initial_delay * multiplier ** (n - 1) 秒，上限 max_delay，並加減 jitter 比例的隨機值
+        # max_attempts: 連續失敗幾次後放棄，None 表示持續重試
+        # backfill: REST client 的 stock (例如 RestClient(...).stock)，重連後以 intraday/trades 補回 trades 的缺口
+        # backfill_page_size / backfill_max_pages: 以 limit/offset 由新往舊分頁查詢，超過頁數仍未涵蓋缺口時標記為不完整
+        if backfill_page_size < 1 or backfill_max_pages < 1:
+            raise ValueError('backfill_page_size and backfill_max_pages must be at least 1')
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.max_attempts = max_attempts
+        self.backfill = backfill
+        self.backfill_page_size = backfill_page_size
+        self.backfill_max_pages = backfill_max_pages
+
+    def delay(self, attempt: int) -> float:
+        delay = min(self.initial_delay * self.multiplier ** (attempt - 1), self.max_delay)
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+
+def build_auth_message(config):
+    if config.get('api_key'):
+        return {'event': 'auth', 'data': {'apikey': config['api_key']}}
+    if config.get('bearer_token'):
+        return {'event': 'auth', 'data': {'token': config['bearer_token']}}
+    if config.get('sdk_token'):
+        return {'event': 'auth', 'data': {'sdkToken': config['sdk_token']}}
+    return None
+
+
+class Message:
+    """延遲解析的訊息，第一次存取內容時才解析並快取，所有 listener 共用同一份結果"""
+
+    __slots__ = ('raw', '_parsed')
+
+    def __init__(self, raw, parsed=None):
+        self.raw = raw
+        self._parsed = parsed
+
+    @property
+    def parsed(self) -> dict:
+        if self._parsed is None:
+            self._parsed = orjson.loads(self.raw)
+        return self._parsed
+
+    @property
+    def event(self):
+        return self.parsed.get('event')
+
+    @property
+    def channel(self):
+        return self.parsed.get('channel')
+
+    @property
+    def data(self):
+        return self.parsed.get('data')
+
+    def get(self, key, default=None):
+        return self.parsed.get(key, default)
+
+    def __getitem__(self, key):
+        return self.parsed[key]
+
+    def __contains__(self, key):
+        return key in self.parsed
+
+    def __str__(self):
+        return self.raw if isinstance(self.raw, str) else self.raw.decode('utf-8')
+
+    def __repr__(self):
+        return f'Message({str(self)!r})'
+
+
+def _route_key(message):
+    return message.channel, (message.data or {}).get('symbol')
+
+
+def _add_listener(table, key, listener):
+    table[key] = table.get(key, ()) + (listener,)
+
+
+def _remove_listener(table, key, listener):
+    listeners = list(table.get(key, ()))
+    if listener in listeners:
+        listeners.remove(listener)
+    if listeners:
+        table[key] = tuple(listeners)
+    else:
+        table.pop(key, None)
+
+
 class AuthenticationState:
     PENDING = 0
     AUTHENTICATING = 1
@@ -37,6 +160,17 @@ class WebSocketClient():
     def __init__(self, **config):
         self.config = config
         self.health_check: Optional[HealthCheckConfig] = config.get('health_check')
+        self.reconnect: Optional[ReconnectConfig] = config.get('reconnect')
+        self.message_format = config.get('message_format', 'raw')
+        if self.message_format not in MESSAGE_FORMATS:
+            raise ValueError(f'message_format must be one of {", ".join(MESSAGE_FORMATS)}')
+        # 依訊息 event 及 (channel, symbol) 分派的 listener，以 tuple 保存使新增 / 移除不影響分派中的迴圈
+        self.__event_listeners = {}
+        self.__channel_listeners = {}
+        dispatch: Optional[DispatchConfig] = config.get('dispatch')
+        self.dispatcher = Dispatcher(self.__dispatch, dispatch, on_error=self.__report_error) if dispatch else None
+        conflate: Optional[ConflationConfig] = config.get('conflate')
+        self.latest = LatestTable(conflate, on_error=self.__report_error) if conflate else None
         self.ee = EventEmitter()
         self.ee.on(CONNECT_EVENT, self.__authenticate)
         self.__ws = websocket.WebSocketApp(
@@ -50,10 +184,26 @@ class WebSocketClient():
         self.auth_status = AuthenticationState.PENDING
         self.error = None
 
+        # 認證成功或失敗時 set，connect() 以此等待而不輪詢
+        self.__ready = Event()
+        self.__connect_started_at = None
+        self.__opened_at = None
+        self.timings = {}
+
         # Health check properties
         self.ping_timer = None
         self.missed_pongs = 0
 
+        # 本地記錄的訂閱，重連時據此重新訂閱
+        self.registry = SubscriptionRegistry(config.get('max_symbols_per_frame', MAX_SYMBOLS_PER_FRAME))
+        # 使用者呼叫 disconnect() 後不再重連
+        self.__closing = False
+        self.__stop_reconnect = Event()
+        self.__reconnecting = False
+        self.__reader = None
+        # 重連後可能遺漏資料的 (channel, symbol) -> {'from': 斷線時間, 'to': 重連時間} (epoch 秒)
+        self.gaps = {}
+
     def ping(self, message):
         message = {
             "event": "ping",
@@ -64,19 +214,49 @@ class WebSocketClient():
         self.__send(message)
 
     def subscribe(self, params):
-        message = {
-            "event": "subscribe",
-            "data": params
-        }
-        self.__send(message)
+        entries = _expand(params)
+        self.registry.add(entries)
+        # 超過單一訊息上限的商品分成多個訊息送出
+        frames = self.registry.subscribe_frames(entries) if len(entries) > self.registry.max_symbols else [params]
+        for frame in frames:
+            self.__send({
+                "event": "subscribe",
+                "data": frame
+            })
 
     def unsubscribe(self, params):
+        ids = params.get('ids') or ([params['id']] if params.get('id') else None)
+        if ids is not None:
+            self.registry.remove_ids(ids)
+        else:
+            self.registry.remove(_expand(params))
         message = {
             "event": "unsubscribe",
             "data": params
         }
         self.__send(message)
 
+    def set_subscriptions(self, desired):
+        """
+        將訂閱調整為 desired，只送出差異
+
+        desired: {channel: [symbol, ...]} 或 subscribe 參數的 list
+        回傳 {'subscribed': 新訂閱數, 'unsubscribed': 取消數, 'frames': 送出的訊息數}
+        """
+        added, removed = self.registry.diff(_normalize(desired))
+        ids = self.registry.remove(removed)
+        self.registry.add(added)
+        frames = [("unsubscribe", frame) for frame in self.registry.unsubscribe_frames(ids)]
+        frames += [("subscribe", frame) for frame in self.registry.subscribe_frames(added)]
+        for event, frame in frames:
+            self.__send({"event": event, "data": frame})
+        return {'subscribed': len(added), 'unsubscribed': len(removed), 'frames': len(frames)}
+
+    @property
+    def tracked_subscriptions(self):
+        """本地記錄的 {(channel, symbol, options): 其餘訂閱參數}，options 為排序後的其他訂閱參數"""
+        return self.registry.items()
+
     def subscriptions(self):
         message = {
             "event": "subscriptions"
@@ -84,30 +264,10 @@ class WebSocketClient():
         self.__send(message)
 
     def __authenticate(self):
-        if self.config.get('api_key'):
-            auth_info = {
-                'event': 'auth',
-                'data': {
-                    'apikey': self.config['api_key']
-                }
-            }
-        elif self.config.get('bearer_token'):
-            auth_info = {
-                'event': 'auth',
-                'data': {
-                    'token': self.config['bearer_token']
-                }
-            }
-        elif self.config.get('sdk_token'):
-            auth_info = {
-                'event': 'auth',
-                'data': {
-                    'sdkToken': self.config['sdk_token']
-                }
-            }
-        else:
-            self.auth_status = AuthenticationState.UNAUTHENTICATED
-            self.error = Exception(MISSING_CREDENTIALS_MESSAGE)
+        auth_info = build_auth_message(self.config)
+        if auth_info is None:
+            self.__fail(Exception(MISSING_CREDENTIALS_MESSAGE))
+            return
 
         self.__send(auth_info)
         self.auth_status = AuthenticationState.AUTHENTICATING
@@ -117,44 +277,143 @@ class WebSocketClient():
     def __send(self, message):
         self.__ws.send(orjson.dumps(message).decode('utf-8'))
 
+    def __fail(self, error):
+        self.auth_status = AuthenticationState.UNAUTHENTICATED
+        self.error = error
+        self.__ready.set()
+
     def __on_open(self, ws):
+        self.__opened_at = time.monotonic()
         self.ee.emit(CONNECT_EVENT)
 
     def __on_close(self, ws, close_status_code, close_msg):
+        established = self.auth_status == AuthenticationState.AUTHENTICATED
+        if not self.__ready.is_set() and self.__connect_started_at is not None:
+            self.__fail(Exception(CONNECTION_CLOSED_MESSAGE))
+        if established:
+            self.auth_status = AuthenticationState.PENDING
+            self.__cancel_ping()
         self.ee.emit(DISCONNECT_EVENT, close_status_code, close_msg)
+        if established and self.reconnect is not None and not self.__closing:
+            self.__start_reconnect()
 
     def __on_message(self, ws, data):
-        message = orjson.loads(data)
-        self.ee.emit(MESSAGE_EVENT, data)
-        if message['event'] == AUTHENTICATED_EVENT:
-            self.ee.emit(AUTHENTICATED_EVENT, message)
+        message = Message(data)
+        if isinstance(data, str) and data.startswith(DATA_MESSAGE_PREFIX):
+            event = 'data'
+        else:
+            event = message.event
+
+        self.__deliver(message, event)
+
+        if event == AUTHENTICATED_EVENT:
+            self.ee.emit(AUTHENTICATED_EVENT, message.parsed)
             self.auth_status = AuthenticationState.AUTHENTICATED
+            self.__record_timings()
+            self.__ready.set()
 
             # Start health check if enabled
             if self.health_check and self.health_check.enabled:
                 self.__start_health_check()
-        elif message['event'] == ERROR_EVENT:
-            if message['data'] and message['data']['message'] == UNAUTHENTICATED_MESSAGE:
-                self.ee.emit(UNAUTHENTICATED_EVENT, message)
-                self.auth_status = AuthenticationState.UNAUTHENTICATED
-                self.error = Exception(UNAUTHENTICATED_MESSAGE)
-        elif message['event'] == 'pong':
+        elif event == ERROR_EVENT:
+            data = message.data
+            if data and data['message'] == UNAUTHENTICATED_MESSAGE:
+                self.ee.emit(UNAUTHENTICATED_EVENT, message.parsed)
+                self.__fail(Exception(UNAUTHENTICATED_MESSAGE))
+        elif event == 'pong':
             # Reset missed pongs counter
             self.missed_pongs = 0
+        elif event == 'subscribed':
+            # 收到 id 前已取消的訂閱，在此取消
+            stale = self.registry.acknowledge(message.data)
+            for frame in self.registry.unsubscribe_frames(stale):
+                self.__send({"event": "unsubscribe", "data": frame})
+
+    def __deliver(self, message, event):
+        if self.latest is not None and event in ROUTED_EVENTS:
+            key = _route_key(message)
+            if key[0] in self.latest.channels:
+                # conflate 的 channel 只更新最新值表，不經過 message listener
+                self.latest.update(key, self.__format(message))
+                return
+
+        if self.dispatcher is None:
+            self.__dispatch(message, event)
+        else:
+            key = _route_key(message) if self.dispatcher.keyed and event in ROUTED_EVENTS else None
+            self.dispatcher.put(key, (message, event))
+
+    def __dispatch(self, message, event):
+        payload = self.__format(message)
+        self.ee.emit(MESSAGE_EVENT, payload)
+        for listener in self.__event_listeners.get(event, ()):
+            listener(payload)
+        if self.__channel_listeners and event in ROUTED_EVENTS:
+            self.__route(message, payload)
+
+    def __report_error(self, error):
+        # 背景執行緒的錯誤以 error 事件通知，沒有 listener 時寫入 log 而不中斷執行緒
+        if self.ee.listeners(ERROR_EVENT):
+            self.ee.emit(ERROR_EVENT, error)
+        else:
+            logger.error('Fugle websocket error: %s', error, exc_info=error)
+
+    def __route(self, message, payload):
+        channel, symbol = _route_key(message)
+        listeners = self.__channel_listeners.get((channel, symbol), ())
+        if symbol is not None:
+            listeners += self.__channel_listeners.get((channel, None), ())
+        for listener in listeners:
+            listener(payload)
+
+    def __format(self, message):
+        if self.message_format == 'dict':
+            return message.parsed
+        if self.message_format == 'lazy':
+            return message
+        return message.raw
 
     def __on_error(self, ws, error):
+        # 連線建立前的錯誤 (例如 DNS / TLS 失敗) 直接結束等待
+        if self.__opened_at is None and self.__connect_started_at is not None and not self.__ready.is_set():
+            self.__fail(error)
         self.ee.emit(ERROR_EVENT, error)
 
     def on(self, event, listener):
         self.ee.on(event, listener)
 
     def off(self, event, listener):
-        self.ee.off(event, listener)
+        self.ee.remove_listener(event, listener)
+
+    def on_event(self, event, listener):
+        """只接收 event 欄位符合的訊息，例如 'data'、'snapshot'、'subscribed'，格式依 message_format"""
+        _add_listener(self.__event_listeners, event, listener)
+
+    def off_event(self, event, listener):
+        _remove_listener(self.__event_listeners, event, listener)
+
+    def on_channel(self, channel, listener, symbol=None):
+        """只接收指定 channel (及 symbol) 的 data / snapshot 訊息，未指定 symbol 時接收該 channel 所有商品"""
+        _add_listener(self.__channel_listeners, (channel, symbol), listener)
+
+    def off_channel(self, channel, listener, symbol=None):
+        _remove_listener(self.__channel_listeners, (channel, symbol), listener)
 
     def check_auth_status(self):
         if self.auth_status == AuthenticationState.AUTHENTICATING:
-            self.auth_status = AuthenticationState.UNAUTHENTICATED
-            self.error = Exception(AUTHENTICATION_TIMEOUT_MESSAGE)
+            self.__fail(Exception(AUTHENTICATION_TIMEOUT_MESSAGE))
+
+    def __record_timings(self):
+        now = time.monotonic()
+        started_at, opened_at = self.__connect_started_at, self.__opened_at
+        if started_at is None or opened_at is None:
+            return
+        # connect: 建立連線; authenticate: 連線後到認證完成; total: 兩者合計 (秒)
+        self.timings = {
+            'connect': opened_at - started_at,
+            'authenticate': now - opened_at,
+            'total': now - started_at,
+        }
 
     def __start_health_check(self):
         """Start the health check ping/pong mechanism"""
@@ -167,37 +426,153 @@ class WebSocketClient():
         if not self.health_check or not self.health_check.enabled:
             return
 
+        # 在 Timer 執行緒中不 raise，只關閉 socket，由 __on_close 通知並視設定重連
+        if self.missed_pongs >= self.health_check.max_missed_pongs:
+            self.__drop(Exception(f"Did not receive pong for {self.health_check.max_missed_pongs} consecutive times. Disconnecting..."))
+            return
+
         try:
             self.ping("")
-            self.missed_pongs += 1
-            self.__check_missed_pongs()
-
-            # Schedule next ping
-            interval_seconds = self.health_check.ping_interval / 1000.0
-            self.ping_timer = Timer(interval_seconds, self.__send_ping)
-            self.ping_timer.start()
         except Exception as error:
-            print(f"Failed to send ping: {error}")
-            self.disconnect()
+            self.__drop(Exception(f"Failed to send ping: {error}"))
+            return
+        self.missed_pongs += 1
 
-    def __check_missed_pongs(self):
-        """Check if too many pongs have been missed"""
-        if self.health_check and self.health_check.enabled:
-            if self.missed_pongs > self.health_check.max_missed_pongs:
-                self.disconnect()
-                raise Exception(f"Did not receive pong for {self.health_check.max_missed_pongs} consecutive times. Disconnecting...")
-
-    def connect(self):
-        Thread(target=self.__ws.run_forever).start()
-        while True:
-            if self.auth_status in [AuthenticationState.AUTHENTICATED, AuthenticationState.UNAUTHENTICATED]:
+        # Schedule next ping
+        interval_seconds = self.health_check.ping_interval / 1000.0
+        self.ping_timer = Timer(interval_seconds, self.__send_ping)
+        self.ping_timer.start()
+
+    def __cancel_ping(self):
+        if self.ping_timer is not None:
+            self.ping_timer.cancel()
+            self.ping_timer = None
+
+    def __drop(self, error):
+        self.ping_timer = None
+        self.__report_error(error)
+        self.__ws.close()
+
+    def __start_reconnect(self):
+        if self.__reconnecting:
+            return
+        self.__reconnecting = True
+        Thread(target=self.__reconnect_loop, args=(time.time(),), daemon=True).start()
+
+    def __reconnect_loop(self, disconnected_at):
+        try:
+            attempt = 0
+            while True:
+                attempt += 1
+                if self.__stop_reconnect.wait(self.reconnect.delay(attempt)):
+                    return
+                # 等待前一個 run_forever 結束，避免同一個 WebSocketApp 同時執行兩次
+                if self.__reader is not None:
+                    self.__reader.join(DEFAULT_CONNECT_TIMEOUT)
+                try:
+                    self.__open(None)
+                except Exception as error:
+                    if self.reconnect.max_attempts is not None and attempt >= self.reconnect.max_attempts:
+                        self.__report_error(Exception(f"Failed to reconnect after {attempt} attempts: {error}"))
+                        return
+                    continue
+                if self.__closing:
+                    self.disconnect()
+                    return
                 break
+        finally:
+            self.__reconnecting = False
+        self.__restore(disconnected_at)
+
+    def __restore(self, disconnected_at):
+        reconnected_at = time.time()
+        subscriptions = self.registry.items()
+        self.registry.reset_ids()
+        try:
+            for frame in self.registry.subscribe_frames(subscriptions):
+                self.__send({"event": "subscribe", "data": frame})
+        except Exception as error:
+            self.__report_error(error)
+
+        gaps = {(channel, symbol): {'from': disconnected_at, 'to': reconnected_at} for channel, symbol, _ in subscriptions}
+        self.gaps.update(gaps)
+        self.ee.emit(RECONNECT_EVENT, gaps)
+        if self.reconnect.backfill is not None:
+            self.__backfill(gaps)
+
+    def __backfill(self, gaps):
+        symbols = [(symbol, gap) for (channel, symbol), gap in gaps.items() if channel == 'trades']
+        if not symbols:
+            return
+        with ThreadPoolExecutor(max_workers=min(BACKFILL_CONCURRENCY, len(symbols))) as executor:
+            for _ in executor.map(lambda item: self.__backfill_symbol(*item), symbols):
+                pass
+
+    def __backfill_symbol(self, symbol, gap):
+        # trades 的 time 為微秒，intraday/trades 由新到舊排序
+        started, ended = gap['from'] * 1000000, gap['to'] * 1000000
+        config = self.reconnect
+        trades = {}
+        complete = False
+        try:
+            for page in range(config.backfill_max_pages):
+                response = config.backfill.intraday.trades(symbol=symbol, limit=config.backfill_page_size, offset=page * config.backfill_page_size)
+                data = response.get('data') or []
+                for trade in data:
+                    if started <= trade.get('time', 0) <= ended:
+                        # 分頁期間有新成交時，offset 位移會使相鄰頁面重疊
+                        trades[orjson.dumps(trade, option=orjson.OPT_SORT_KEYS)] = trade
+                if len(data) < config.backfill_page_size or min(trade.get('time', 0) for trade in data) < started:
+                    complete = True
+                    break
+            else:
+                self.__report_error(Exception(f"Backfill for {symbol} is incomplete: the gap is not covered by {config.backfill_max_pages} pages"))
+        except Exception as error:
+            self.__report_error(error)
+        # 不完整的缺口仍送出已取得的成交，並在 gaps 中標記
+        gap['complete'] = complete
+        self.ee.emit(BACKFILL_EVENT, symbol, sorted(trades.values(), key=lambda trade: trade['time']))
+
+    def connect(self, timeout: Optional[float] = None):
+        # timeout: 等待連線與認證的秒數，未指定時使用 config 的 connect_timeout
+        self.__closing = False
+        self.__stop_reconnect.clear()
+        if self.dispatcher is not None:
+            self.dispatcher.open()
+        if self.latest is not None:
+            self.latest.open()
+        self.__open(timeout)
+
+    def __open(self, timeout):
+        if timeout is None:
+            timeout = self.config.get('connect_timeout', DEFAULT_CONNECT_TIMEOUT)
+        self.__ready.clear()
+        self.auth_status = AuthenticationState.PENDING
+        self.error = None
+        self.__opened_at = None
+        self.__connect_started_at = time.monotonic()
+        self.timings = {}
+
+        self.__reader = Thread(target=self.__ws.run_forever)
+        self.__reader.start()
+        if not self.__ready.wait(timeout):
+            self.error = TimeoutError(CONNECTION_TIMEOUT_MESSAGE)
+
         if self.error is not None:
+            error = self.error
+            # 之後的 close / error 回呼不再視為連線失敗
+            self.__connect_started_at = None
             self.__ws.close()
-            self.auth_timer.cancel()
-            raise self.error
+            if self.auth_timer is not None:
+                self.auth_timer.cancel()
+                self.auth_timer = None
+            self.auth_status = AuthenticationState.PENDING
+            self.error = None
+            raise error
 
     def disconnect(self):
+        self.__closing = True
+        self.__stop_reconnect.set()
         if self.__ws is not None:
             self.__ws.close()
 
@@ -205,9 +580,14 @@ class WebSocketClient():
             self.auth_timer.cancel()
             self.auth_timer = None
 
-        if self.ping_timer is not None:
-            self.ping_timer.cancel()
-            self.ping_timer = None
+        self.__cancel_ping()
+
+        if self.dispatcher is not None:
+            self.dispatcher.close()
+        if self.latest is not None:
+            self.latest.close()
 
         self.auth_status = AuthenticationState.PENDING
         self.error = None
+        self.__connect_started_at = None
+        self.__ready.clear()
@@ -0,0 +1,97 @@
+import logging
+import threading
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+
+
+class ConflationConfig:
+    def __init__(self, channels: Iterable[str] = ('books', 'aggregates'), interval: float = 0.1):
+        # channels: 只保留每個商品最新訊息的 channel; interval: 通知 listener 的最短間隔秒數
+        if interval <= 0:
+            raise ValueError('interval must be positive')
+        self.channels = tuple(channels)
+        self.interval = interval
+
+
+class LatestTable:
+    """保存每個 (channel, symbol) 的最新訊息，尚未取用的舊訊息直接被覆蓋"""
+
+    def __init__(self, config: ConflationConfig, on_error=None):
+        self.channels = frozenset(config.channels)
+        self.interval = config.interval
+        self.on_error = on_error or (lambda error: logger.error('Failed to notify latest values: %s', error, exc_info=error))
+        self.values = {}
+        # 上次 drain 後有更新的 key，以 dict 保留更新順序
+        self.changed = {}
+        self.updates = 0
+        self.skipped = 0
+        self.listeners = ()
+        self.lock = threading.Lock()
+        self.__stopped = None
+        self.__thread = None
+
+    def update(self, key, message):
+        with self.lock:
+            self.values[key] = message
+            if key in self.changed:
+                self.skipped += 1
+            else:
+                self.changed[key] = None
+            self.updates += 1
+
+    def get(self, channel, symbol):
+        return self.values.get((channel, symbol))
+
+    def items(self):
+        with self.lock:
+            return dict(self.values)
+
+    def drain(self):
+        """回傳上次 drain 後有更新的 {(channel, symbol): 最新訊息}"""
+        with self.lock:
+            changes = {key: self.values[key] for key in self.changed}
+            self.changed = {}
+        return changes
+
+    def stats(self):
+        return {'size': len(self.values), 'pending': len(self.changed), 'updates': self.updates, 'skipped': self.skipped}
+
+    def on_update(self, listener):
+        """每 interval 秒最多呼叫 listener 一次，傳入期間內有更新的最新訊息"""
+        self.listeners = self.listeners + (listener,)
+        self.open()
+
+    def off_update(self, listener):
+        self.listeners = tuple(item for item in self.listeners if item != listener)
+
+    def open(self):
+        """有 listener 且通知執行緒未執行時啟動，close() 後可再次呼叫"""
+        with self.lock:
+            if self.__thread is None and self.listeners:
+                # 每個執行緒各自的停止旗標，避免 close() 後立即 open() 時舊執行緒繼續執行
+                self.__stopped = threading.Event()
+                self.__thread = threading.Thread(target=self.__run, args=(self.__stopped,), name='fugle-conflation', daemon=True)
+                self.__thread.start()
+
+    def close(self):
+        with self.lock:
+            thread, self.__thread = self.__thread, None
+            if self.__stopped is not None:
+                self.__stopped.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def __run(self, stopped):
+        while not stopped.wait(self.interval):
+            listeners = self.listeners
+            if not listeners:
+                continue
+            changes = self.drain()
+            if not changes:
+                continue
+            for listener in listeners:
+                try:
+                    listener(changes)
+                except Exception as error:
+                    self.on_error(error)
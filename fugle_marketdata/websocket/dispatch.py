@@ -0,0 +1,198 @@
+import logging
+import threading
+from collections import deque
+
+# block: 佇列滿時暫停讀取 socket; drop_oldest: 丟棄最舊的訊息;
+# coalesce: 以新訊息取代佇列中同 (channel, symbol) 的訊息，沒有時丟棄最舊的訊息
+OVERFLOW_POLICIES = ('block', 'drop_oldest', 'coalesce')
+
+_CLOSED = object()
+
+logger = logging.getLogger(__name__)
+
+
+class DispatchConfig:
+    def __init__(self, workers: int = 4, maxsize: int = 10000, overflow: str = 'block', ordered: bool = False):
+        if workers < 1:
+            raise ValueError('workers must be at least 1')
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f'overflow must be one of {", ".join(OVERFLOW_POLICIES)}')
+        self.workers = workers
+        self.maxsize = maxsize
+        self.overflow = overflow
+        # ordered=True 時同一 (channel, symbol) 的訊息固定由同一個 worker 依序處理
+        self.ordered = ordered
+
+
+class _DispatchQueue:
+    def __init__(self, maxsize, overflow):
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.items = deque()
+        # coalesce 時記錄每個 key 在佇列中最新的項目
+        self.latest = {}
+        self.cond = threading.Condition()
+        self.dropped = 0
+        self.coalesced = 0
+        self.unfinished = 0
+        self.closed = False
+
+    def put(self, key, job):
+        with self.cond:
+            if self.overflow == 'block':
+                while len(self.items) >= self.maxsize and not self.closed:
+                    self.cond.wait()
+            if self.closed:
+                # 已關閉的佇列沒有 worker 處理，直接丟棄
+                self.dropped += 1
+                return
+            if len(self.items) >= self.maxsize:
+                entry = self.latest.get(key) if key is not None else None
+                if entry is not None:
+                    entry[1] = job
+                    self.coalesced += 1
+                    return
+                self.__drop_oldest()
+
+            entry = [key, job]
+            self.items.append(entry)
+            if self.overflow == 'coalesce' and key is not None:
+                self.latest[key] = entry
+            self.unfinished += 1
+            self.cond.notify_all()
+
+    def __drop_oldest(self):
+        key, _ = entry = self.items.popleft()
+        if self.latest.get(key) is entry:
+            del self.latest[key]
+        self.dropped += 1
+        self.unfinished -= 1
+
+    def get(self):
+        with self.cond:
+            while not self.items and not self.closed:
+                self.cond.wait()
+            if not self.items:
+                return _CLOSED
+            key, _ = entry = self.items.popleft()
+            if self.latest.get(key) is entry:
+                del self.latest[key]
+            self.cond.notify_all()
+            return entry[1]
+
+    def task_done(self):
+        with self.cond:
+            self.unfinished -= 1
+            if self.unfinished == 0:
+                self.cond.notify_all()
+
+    def join(self, timeout=None):
+        with self.cond:
+            return self.cond.wait_for(lambda: self.unfinished == 0, timeout)
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+    def open(self):
+        with self.cond:
+            self.closed = False
+
+    def __len__(self):
+        return len(self.items)
+
+
+class Dispatcher:
+    """在 worker 執行緒執行 listener，讀取 socket 不再受 listener 處理速度影響"""
+
+    def __init__(self, handler, config: DispatchConfig, on_error=None):
+        self.handler = handler
+        self.config = config
+        self.on_error = on_error or (lambda error: logger.error('Failed to dispatch message: %s', error, exc_info=error))
+        count = config.workers if config.ordered else 1
+        self.queues = [_DispatchQueue(config.maxsize, config.overflow) for _ in range(count)]
+        self.threads = []
+        self.closed = False
+        self.lock = threading.Lock()
+
+    @property
+    def keyed(self):
+        # 是否需要訊息的 (channel, symbol) 來決定 worker 或合併訊息
+        return self.config.ordered or self.config.overflow == 'coalesce'
+
+    @property
+    def depth(self):
+        return sum(len(queue) for queue in self.queues)
+
+    @property
+    def dropped(self):
+        return sum(queue.dropped for queue in self.queues)
+
+    @property
+    def coalesced(self):
+        return sum(queue.coalesced for queue in self.queues)
+
+    def stats(self):
+        return {
+            'depth': self.depth,
+            'dropped': self.dropped,
+            'coalesced': self.coalesced,
+            'workers': len(self.threads),
+        }
+
+    def put(self, key, job):
+        if not self.threads and not self.closed:
+            self.__start()
+        queue = self.queues[hash(key) % len(self.queues)] if len(self.queues) > 1 else self.queues[0]
+        queue.put(key, job)
+
+    def join(self, timeout=None):
+        """等待已排入的訊息處理完畢，逾時回傳 False"""
+        return all(queue.join(timeout) for queue in self.queues)
+
+    def open(self):
+        """close() 後重新接受訊息，worker 於下一個訊息排入時啟動"""
+        with self.lock:
+            self.closed = False
+            for queue in self.queues:
+                queue.open()
+
+    def close(self):
+        """處理完已排入的訊息後結束 worker，之後排入的訊息直接丟棄"""
+        with self.lock:
+            self.closed = True
+            threads, self.threads = self.threads, []
+            for queue in self.queues:
+                queue.close()
+        for thread in threads:
+            # listener 中呼叫 disconnect() 時不等待自己
+            if thread is not threading.current_thread():
+                thread.join()
+
+    def __start(self):
+        with self.lock:
+            if self.threads or self.closed:
+                return
+            if self.config.ordered:
+                targets = self.queues
+            else:
+                targets = self.queues * self.config.workers
+            for index, queue in enumerate(targets):
+                thread = threading.Thread(target=self.__run, args=(queue,), name=f'fugle-dispatch-{index}', daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def __run(self, queue):
+        while True:
+            job = queue.get()
+            if job is _CLOSED:
+                return
+            try:
+                self.handler(*job)
+            except Exception as error:
+                self.on_error(error)
+            finally:
+                queue.task_done()
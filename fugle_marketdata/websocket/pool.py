@@ -0,0 +1,226 @@
+import zlib
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from threading import RLock
+from typing import Iterable, List, Optional
+
+from ..constants import DISCONNECT_EVENT, RECONNECT_EVENT
+from .factory import WebSocketClientFactory
+from .subscriptions import _match, _normalize, _options
+
+
+def _parse(payload):
+    # listener 收到的格式依 message_format 而不同: 字串、dict 或 Message
+    if isinstance(payload, (str, bytes)):
+        return orjson.loads(payload)
+    return payload
+
+
+def _symbol_params(params, symbols):
+    if len(symbols) == 1:
+        return {**params, 'symbol': symbols[0]}
+    return {**params, 'symbols': list(symbols)}
+
+
+class WebSocketPool:
+    """
+    將訂閱的商品分散到多條 WebSocket 連線，每條連線各自認證與讀取
+
+    商品依 groups 指定的連線，未指定時依商品代號的 hash 分配；
+    連線中斷時，其上的訂閱改由其餘連線重新訂閱；設定 reconnect 時則由該連線重連後自行恢復
+    """
+
+    def __init__(self, size: int = 4, groups: Optional[Iterable[Iterable[str]]] = None, type: str = 'stock', **options):
+        groups = [list(group) for group in groups or []]
+        size = max(size, len(groups))
+        if size < 1:
+            raise ValueError('size must be at least 1')
+        self.clients = [getattr(WebSocketClientFactory(**options), type) for _ in range(size)]
+        self.groups = {symbol: index for index, group in enumerate(groups) for symbol in group}
+        self.live = [False] * size
+        # (channel, symbol, options) -> {'index': 連線, 'params': 其餘訂閱參數, 'id': 伺服器回傳的訂閱 id}
+        self.subscriptions = {}
+        # (連線, key) -> 已取消但尚未收到訂閱 id 的次數
+        self.pending = {}
+        self.rebalances = 0
+        self.lock = RLock()
+        self.__closing = False
+
+        for index, client in enumerate(self.clients):
+            client.on(DISCONNECT_EVENT, lambda code, message, index=index: self.__on_disconnect(index))
+            client.on(RECONNECT_EVENT, lambda gaps, index=index: self.__on_reconnect(index))
+            client.on_event('subscribed', lambda payload, index=index: self.__on_subscribed(index, payload))
+
+    def connect(self, timeout: Optional[float] = None):
+        """平行建立所有連線並等待認證完成"""
+        self.__closing = False
+        with ThreadPoolExecutor(max_workers=len(self.clients)) as executor:
+            futures = [executor.submit(client.connect, timeout) for client in self.clients]
+            errors = []
+            for index, future in enumerate(futures):
+                try:
+                    future.result()
+                    self.live[index] = True
+                except Exception as error:
+                    errors.append(error)
+        if errors:
+            self.disconnect()
+            raise errors[0]
+
+    def disconnect(self):
+        self.__closing = True
+        for index, client in enumerate(self.clients):
+            self.live[index] = False
+            client.disconnect()
+
+    def shard_for(self, symbol: str) -> Optional[int]:
+        """回傳商品所屬的連線索引，沒有可用連線時回傳 None"""
+        live = [index for index, alive in enumerate(self.live) if alive]
+        if not live:
+            return None
+        index = self.groups.get(symbol)
+        if index is not None and self.live[index]:
+            return index
+        return live[zlib.crc32(symbol.encode('utf-8')) % len(live)]
+
+    def assignments(self) -> List[List[tuple]]:
+        """每條連線上的 (channel, symbol, options)"""
+        result = [[] for _ in self.clients]
+        with self.lock:
+            for key, entry in self.subscriptions.items():
+                result[entry['index']].append(key)
+        return result
+
+    def subscribe(self, params):
+        params = dict(params)
+        channel = params.get('channel')
+        symbol = params.pop('symbol', None)
+        symbols = params.pop('symbols', None) or [symbol]
+        options = _options(params)
+        with self.lock:
+            shards = {}
+            for symbol in symbols:
+                index = self.shard_for(symbol)
+                if index is None:
+                    raise Exception('websocket pool is not connected')
+                self.subscriptions[(channel, symbol, options)] = {'index': index, 'params': params, 'id': None}
+                shards.setdefault(index, []).append(symbol)
+            for index, shard in shards.items():
+                self.clients[index].subscribe(_symbol_params(params, shard))
+
+    def unsubscribe(self, params):
+        ids = params.get('ids') or ([params['id']] if params.get('id') else None)
+        with self.lock:
+            if ids is not None:
+                keys = [key for key, entry in self.subscriptions.items() if entry['id'] in ids]
+            else:
+                symbols = params.get('symbols') or [params.get('symbol')]
+                keys = [(params.get('channel'), symbol, _options(params)) for symbol in symbols]
+
+            shards = {}
+            for key in keys:
+                entry = self.subscriptions.pop(key, None)
+                if entry is None:
+                    continue
+                if entry['id'] is None:
+                    # 尚未收到 subscribed 的訂閱，待收到 id 後再取消
+                    pending = (entry['index'], key)
+                    self.pending[pending] = self.pending.get(pending, 0) + 1
+                else:
+                    shards.setdefault(entry['index'], []).append(entry['id'])
+            for index, ids in shards.items():
+                client = self.clients[index]
+                for frame in client.registry.unsubscribe_frames(ids):
+                    client.unsubscribe(frame)
+
+    def set_subscriptions(self, desired):
+        """將訂閱調整為 desired ({channel: [symbol, ...]} 或 subscribe 參數的 list)，只送出差異"""
+        desired = _normalize(desired)
+        with self.lock:
+            current = {key: entry['params'] for key, entry in self.subscriptions.items()}
+            added = {key: params for key, params in desired.items() if key not in current}
+            removed = [key for key in current if key not in desired]
+
+            groups = {}
+            for key in removed:
+                params = current[key]
+                groups.setdefault(orjson.dumps(params, option=orjson.OPT_SORT_KEYS), (params, []))[1].append(key[1])
+            for params, symbols in groups.values():
+                self.unsubscribe({**params, 'symbols': symbols})
+
+            groups = {}
+            for (channel, symbol, _), params in added.items():
+                groups.setdefault(orjson.dumps(params, option=orjson.OPT_SORT_KEYS), (params, []))[1].append(symbol)
+            for params, symbols in groups.values():
+                self.subscribe({**params, 'symbols': symbols})
+        return {'subscribed': len(added), 'unsubscribed': len(removed)}
+
+    def on(self, event, listener):
+        for client in self.clients:
+            client.on(event, listener)
+
+    def off(self, event, listener):
+        for client in self.clients:
+            client.off(event, listener)
+
+    def on_event(self, event, listener):
+        for client in self.clients:
+            client.on_event(event, listener)
+
+    def off_event(self, event, listener):
+        for client in self.clients:
+            client.off_event(event, listener)
+
+    def on_channel(self, channel, listener, symbol=None):
+        for client in self.clients:
+            client.on_channel(channel, listener, symbol=symbol)
+
+    def off_channel(self, channel, listener, symbol=None):
+        for client in self.clients:
+            client.off_channel(channel, listener, symbol=symbol)
+
+    def __on_subscribed(self, index, payload):
+        data = _parse(payload).get('data')
+        items = data if isinstance(data, list) else [data or {}]
+        with self.lock:
+            for item in items:
+                candidates = {key for key, entry in self.subscriptions.items() if entry['index'] == index}
+                candidates.update(key for target, key in self.pending if target == index)
+                key = _match(item, candidates, lambda key: (index, key) in self.pending or self.subscriptions[key]['id'] is None)
+                entry = self.subscriptions.get(key)
+                if self.pending.get((index, key)):
+                    # 依送出順序，較早的回應屬於已取消的訂閱
+                    self.pending[(index, key)] -= 1
+                    if not self.pending[(index, key)]:
+                        del self.pending[(index, key)]
+                    entry = None
+                if entry is not None and entry['index'] == index:
+                    entry['id'] = item.get('id')
+                elif item.get('id') is not None and item.get('channel') is not None:
+                    # 已取消或已移往其他連線的訂閱
+                    self.clients[index].unsubscribe({'id': item['id']})
+
+    def __on_disconnect(self, index):
+        if self.__closing or not self.live[index]:
+            return
+        with self.lock:
+            self.live[index] = False
+            # 連線中斷後伺服器端的訂閱已失效，不會再收到其 subscribed
+            self.pending = {key: count for key, count in self.pending.items() if key[0] != index}
+            if self.clients[index].reconnect is not None or not any(self.live):
+                return
+            shards = {}
+            for (channel, symbol, _), entry in self.subscriptions.items():
+                if entry['index'] != index:
+                    continue
+                entry.update(index=self.shard_for(symbol), id=None)
+                # 同一次 subscribe 的商品共用 params，合併為一個訊息送出
+                group = (entry['index'], id(entry['params']))
+                shards.setdefault(group, (entry['params'], []))[1].append(symbol)
+            for (target, _), (params, symbols) in shards.items():
+                self.clients[target].subscribe(_symbol_params(params, symbols))
+            self.rebalances += 1
+
+    def __on_reconnect(self, index):
+        if not self.__closing:
+            self.live[index] = True
@@ -0,0 +1,151 @@
+import orjson
+from collections.abc import Mapping
+from threading import Lock
+
+# 單一 subscribe / unsubscribe 訊息最多包含的商品或訂閱 id 數量
+MAX_SYMBOLS_PER_FRAME = 100
+
+
+def _options(params):
+    """channel、symbol 以外的訂閱參數 (例如 intradayOddLot)，排序後可作為 key 的一部分"""
+    return tuple(sorted((key, value) for key, value in params.items() if key not in ('channel', 'symbol', 'symbols', 'id')))
+
+
+def _expand(params):
+    """將 subscribe 參數展開為 {(channel, symbol, options): 其餘訂閱參數}"""
+    extra = {key: value for key, value in params.items() if key not in ('symbol', 'symbols')}
+    symbols = params.get('symbols') or [params.get('symbol')]
+    options = _options(params)
+    return {(params.get('channel'), symbol, options): extra for symbol in symbols}
+
+
+def _match(item, candidates, awaiting):
+    """
+    找出 subscribed 回應所對應的 key，沒有時回傳 None
+
+    回應未必帶回全部訂閱參數，缺少的參數視為相符；
+    優先選擇回應中明確相符參數較多、未確認參數較少、且仍在等待訂閱 id 的 key
+    """
+    reply = dict(_options(item))
+    matches = []
+    for key in candidates:
+        channel, symbol, options = key
+        if (channel, symbol) != (item.get('channel'), item.get('symbol')):
+            continue
+        if any(reply.get(name, value) != value for name, value in options):
+            continue
+        # 回應中為 true 的參數 (例如 intradayOddLot) 必須是此訂閱的參數
+        if any(value is True and dict(options).get(name) is not True for name, value in reply.items()):
+            continue
+        confirmed = sum(1 for name, _ in options if name in reply)
+        matches.append((-confirmed, len(options) - confirmed, not awaiting(key), key))
+    return min(matches, key=lambda match: match[:3])[3] if matches else None
+
+
+def _normalize(desired):
+    """desired 可為 {channel: [symbol, ...]} 或 subscribe 參數的 list"""
+    if isinstance(desired, Mapping):
+        desired = [{'channel': channel, 'symbols': list(symbols)} for channel, symbols in desired.items()]
+    entries = {}
+    for params in desired:
+        entries.update(_expand(params))
+    return entries
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class SubscriptionRegistry:
+    """本地記錄的訂閱，以 (channel, symbol, options) 為 key，並對應伺服器回傳的訂閱 id"""
+
+    def __init__(self, max_symbols: int = MAX_SYMBOLS_PER_FRAME):
+        if max_symbols < 1:
+            raise ValueError('max_symbols must be at least 1')
+        self.max_symbols = max_symbols
+        self.entries = {}
+        self.ids = {}
+        # 已取消但尚未收到訂閱 id 的次數，收到對應的 subscribed 後再取消；
+        # 與 entries 分開記錄，同一 key 重新訂閱時仍會取消舊的訂閱
+        self.pending = {}
+        self.lock = Lock()
+
+    def items(self):
+        with self.lock:
+            return dict(self.entries)
+
+    def add(self, entries):
+        with self.lock:
+            self.entries.update(entries)
+
+    def remove(self, keys):
+        """移除訂閱，回傳已知的訂閱 id"""
+        ids = []
+        with self.lock:
+            for key in keys:
+                if self.entries.pop(key, None) is None:
+                    continue
+                subscription_id = self.ids.pop(key, None)
+                if subscription_id is None:
+                    self.pending[key] = self.pending.get(key, 0) + 1
+                else:
+                    ids.append(subscription_id)
+        return ids
+
+    def remove_ids(self, ids):
+        with self.lock:
+            keys = [key for key, subscription_id in self.ids.items() if subscription_id in ids]
+        self.remove(keys)
+
+    def acknowledge(self, data):
+        """記錄 subscribed 回傳的訂閱 id，回傳應取消的 id"""
+        stale = []
+        with self.lock:
+            for item in data if isinstance(data, list) else [data or {}]:
+                subscription_id = item.get('id')
+                if subscription_id is None:
+                    continue
+                key = _match(item, set(self.entries) | set(self.pending), self.__awaiting)
+                if key is None:
+                    continue
+                if self.pending.get(key):
+                    # 依送出順序，較早的回應屬於已取消的訂閱
+                    self.pending[key] -= 1
+                    if not self.pending[key]:
+                        del self.pending[key]
+                    stale.append(subscription_id)
+                elif key in self.entries:
+                    self.ids[key] = subscription_id
+        return stale
+
+    def __awaiting(self, key):
+        return bool(self.pending.get(key)) or (key in self.entries and key not in self.ids)
+
+    def reset_ids(self):
+        # 重連後訂閱 id 全部失效
+        with self.lock:
+            self.ids.clear()
+            self.pending.clear()
+
+    def diff(self, desired):
+        """回傳 (需訂閱的 {key: 參數}, 需取消的 key)，訂閱參數不同時 key 也不同"""
+        with self.lock:
+            added = {key: extra for key, extra in desired.items() if key not in self.entries}
+            removed = [key for key in self.entries if key not in desired]
+        return added, removed
+
+    def subscribe_frames(self, entries):
+        """將相同 channel 及參數的商品合併為 subscribe 參數，每個最多 max_symbols 個商品"""
+        groups = {}
+        for (channel, symbol, _), extra in entries.items():
+            group = orjson.dumps(extra, option=orjson.OPT_SORT_KEYS)
+            groups.setdefault(group, (extra, []))[1].append(symbol)
+        frames = []
+        for extra, symbols in groups.values():
+            for chunk in _chunks(symbols, self.max_symbols):
+                frames.append({**extra, 'symbol': chunk[0]} if len(chunk) == 1 else {**extra, 'symbols': chunk})
+        return frames
+
+    def unsubscribe_frames(self, ids):
+        return [{'id': chunk[0]} if len(chunk) == 1 else {'ids': chunk} for chunk in _chunks(list(ids), self.max_symbols)]
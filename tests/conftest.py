@@ -0,0 +1,124 @@
+import random
+import threading
+import time
+import orjson
+import pytest
+from unittest.mock import MagicMock
+
+from fugle_marketdata.constants import UNAUTHENTICATED_MESSAGE
+
+
+class FakeClock:
+    """可手動推進的時鐘，取代 time.monotonic"""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeWebSocketApp:
+    """模擬 websocket.WebSocketApp: run_forever 依設定開啟連線並回應認證"""
+
+    def __init__(self, url, on_open=None, on_close=None, on_error=None, on_message=None):
+        self.url = url
+        self.on_open = on_open
+        self.on_close = on_close
+        self.on_error = on_error
+        self.on_message = on_message
+        self.sent = []
+        self.closed = False
+        self.mode = 'authenticate'
+        self.delay = 0.05
+
+    def run_forever(self):
+        if self.mode == 'never_open':
+            return
+        if self.mode == 'close':
+            self.on_close(self, 1006, 'abnormal closure')
+            return
+        time.sleep(self.delay)
+        self.on_open(self)
+
+    def send(self, data):
+        message = orjson.loads(data)
+        self.sent.append(message)
+        if message['event'] != 'auth':
+            return
+        if self.mode == 'authenticate':
+            reply = {'event': 'authenticated', 'data': {'message': 'Authenticated successfully'}}
+        elif self.mode == 'reject':
+            reply = {'event': 'error', 'data': {'message': UNAUTHENTICATED_MESSAGE}}
+        else:
+            return
+        threading.Timer(self.delay, self.on_message, args=(self, orjson.dumps(reply).decode())).start()
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_ws(mocker):
+    apps = []
+
+    def create(*args, **kwargs):
+        app = FakeWebSocketApp(*args, **kwargs)
+        apps.append(app)
+        return app
+
+    mocker.patch('fugle_marketdata.websocket.client.websocket.WebSocketApp', side_effect=create)
+    return apps
+
+
+@pytest.fixture
+def mock_response():
+    """建立 requests 回應；data 為 bytes 時直接作為 content，否則轉為 JSON"""
+
+    def create(data=None, status_code=200, headers=None):
+        response = MagicMock()
+        response.status_code = status_code
+        response.headers = headers or {}
+        response.content = data if isinstance(data, bytes) else orjson.dumps(data if data is not None else {})
+        return response
+
+    return create
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def data_message():
+    def create(channel, symbol, **data):
+        return orjson.dumps({'event': 'data', 'channel': channel, 'data': {'symbol': symbol, **data}}).decode()
+
+    return create
+
+
+@pytest.fixture
+def deliver():
+    """直接送入 client 收到的訊息，不經過 socket"""
+
+    def send(client, data):
+        client._WebSocketClient__on_message(None, data)
+
+    return send
+
+
+@pytest.fixture
+def random_walk():
+    """以固定 seed 產生的 (high, low, close) 價格序列"""
+
+    def create(length, seed=0):
+        rng = random.Random(seed)
+        close = [100.0]
+        for _ in range(length - 1):
+            close.append(max(1.0, close[-1] + rng.uniform(-2, 2)))
+        high = [c + rng.uniform(0, 1.5) for c in close]
+        low = [c - rng.uniform(0, 1.5) for c in close]
+        return high, low, close
+
+    return create
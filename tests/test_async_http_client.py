@@ -0,0 +1,146 @@
+import asyncio
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+
+from unittest.mock import AsyncMock
+from fugle_marketdata import AsyncRestClient, ConnectionPoolConfig, FugleAPIError
+from fugle_marketdata.rest.aio.stock import AsyncRestStockClient
+from fugle_marketdata.rest.aio.futopt import AsyncRestFutOptClient
+from fugle_marketdata.rest.aio.transport import AsyncResponse, AsyncTransport
+
+
+def mock_response(content=b'{}', status_code=200):
+    return AsyncResponse(status_code, {}, content)
+
+
+@pytest.fixture
+def api_key_client():
+    return AsyncRestClient(api_key='api-key')
+
+
+@pytest.fixture
+def bearer_client():
+    return AsyncRestClient(bearer_token='bearer-token')
+
+
+class TestAsyncRestClientConstructor:
+    def test_with_apiKey(self):
+        client = AsyncRestClient(api_key='api-key')
+        assert isinstance(client, AsyncRestClient)
+
+    def test_with_no_options(self):
+        with pytest.raises(Exception):
+            AsyncRestClient()
+
+    def test_stock_instance(self, api_key_client):
+        assert isinstance(api_key_client.stock, AsyncRestStockClient)
+        assert api_key_client.stock is api_key_client.stock
+
+    def test_futopt_instance(self, api_key_client):
+        assert isinstance(api_key_client.futopt, AsyncRestFutOptClient)
+
+    def test_resources_share_transport(self, api_key_client):
+        transport = api_key_client.transport
+        assert api_key_client.stock.intraday.transport is transport
+        assert api_key_client.futopt.historical.transport is transport
+
+
+class TestAsyncRestClientRequests:
+    def test_intraday_quote_api_key(self, mocker, api_key_client):
+        mock_get = mocker.patch.object(AsyncTransport, 'get', AsyncMock(return_value=mock_response(b'{"symbol": "2330"}')))
+        result = asyncio.run(api_key_client.stock.intraday.quote(symbol='2330'))
+        assert result == {'symbol': '2330'}
+        mock_get.assert_awaited_once_with(
+            'https://api.fugle.tw/marketdata/v1.0/stock/intraday/quote/2330',
+            headers={'X-API-KEY': 'api-key'}
+        )
+
+    def test_snapshot_movers_bearer_token(self, mocker, bearer_client):
+        mock_get = mocker.patch.object(AsyncTransport, 'get', AsyncMock(return_value=mock_response()))
+        asyncio.run(bearer_client.stock.snapshot.movers(market='TSE', change='percent', direction='up'))
+        mock_get.assert_awaited_once_with(
+            'https://api.fugle.tw/marketdata/v1.0/stock/snapshot/movers/TSE?change=percent&direction=up',
+            headers={'Authorization': 'Bearer bearer-token'}
+        )
+
+    def test_futopt_historical_daily(self, mocker, api_key_client):
+        mock_get = mocker.patch.object(AsyncTransport, 'get', AsyncMock(return_value=mock_response()))
+        asyncio.run(api_key_client.futopt.historical.daily(symbol='TXFA4', **{'from': '2024-01-01'}))
+        mock_get.assert_awaited_once_with(
+            'https://api.fugle.tw/marketdata/v1.0/futopt/historical/daily/TXFA4?from=2024-01-01',
+            headers={'X-API-KEY': 'api-key'}
+        )
+
+    def test_concurrent_requests(self, mocker, api_key_client):
+        mocker.patch.object(AsyncTransport, 'get', AsyncMock(return_value=mock_response(b'[1]')))
+
+        async def fetch_all():
+            symbols = ['2330', '2317', '2454']
+            return await asyncio.gather(*[api_key_client.stock.intraday.quote(symbol=s) for s in symbols])
+
+        assert asyncio.run(fetch_all()) == [[1], [1], [1]]
+
+    def test_http_error(self, mocker, api_key_client):
+        mocker.patch.object(AsyncTransport, 'get', AsyncMock(return_value=mock_response(b'{"message": "Unauthorized"}', 401)))
+        with pytest.raises(FugleAPIError) as exc_info:
+            asyncio.run(api_key_client.stock.intraday.quote(symbol='2330'))
+        assert exc_info.value.status_code == 401
+        assert exc_info.value.message == 'Unauthorized'
+
+    def test_invalid_json(self, mocker, api_key_client):
+        mocker.patch.object(AsyncTransport, 'get', AsyncMock(return_value=mock_response(b'<html></html>')))
+        with pytest.raises(FugleAPIError) as exc_info:
+            asyncio.run(api_key_client.stock.intraday.quote(symbol='2330'))
+        assert exc_info.value.message == 'Failed to parse JSON response'
+
+    def test_network_error(self, mocker, api_key_client):
+        mocker.patch.object(AsyncTransport, 'get', AsyncMock(side_effect=aiohttp.ClientConnectionError('boom')))
+        with pytest.raises(FugleAPIError) as exc_info:
+            asyncio.run(api_key_client.stock.intraday.quote(symbol='2330'))
+        assert exc_info.value.status_code is None
+
+
+class TestAsyncRestClientLifecycle:
+    def test_transport_pool_config(self):
+        config = ConnectionPoolConfig(pool_connections=2, pool_maxsize=16, keep_alive=False, timeout=3)
+        client = AsyncRestClient(api_key='api-key', connection_pool=config)
+
+        async def inspect():
+            session = client.transport.session
+            connector = session.connector
+            result = (connector.limit, connector.limit_per_host, connector.force_close, session.timeout.total)
+            await client.close()
+            return result
+
+        assert asyncio.run(inspect()) == (32, 16, True, 3)
+
+    def test_async_context_manager(self, mocker):
+        async def run():
+            async with AsyncRestClient(api_key='api-key') as client:
+                session = client.transport.session
+            return session
+
+        session = asyncio.run(run())
+        assert session.closed
+
+
+class TestAsyncRestClientBatch:
+    def test_quote_many(self, mocker, api_key_client):
+        async def fake_get(url, headers):
+            if url.endswith('/INVALID'):
+                return mock_response(b'{"message": "Resource Not Found"}', 404)
+            return mock_response(b'{"ok": true}')
+
+        mocker.patch.object(AsyncTransport, 'get', side_effect=fake_get)
+        results = asyncio.run(api_key_client.stock.intraday.quote_many(symbols=['2330', 'INVALID', '2317'], concurrency=2))
+        assert [r.symbol for r in results] == ['2330', 'INVALID', '2317']
+        assert [r.ok for r in results] == [True, False, True]
+
+    def test_stream(self, mocker, api_key_client):
+        mocker.patch.object(AsyncTransport, 'get', AsyncMock(return_value=mock_response()))
+
+        async def collect():
+            return [r.symbol async for r in api_key_client.stock.historical.candles_many(symbols=['2330', '2317'], stream=True)]
+
+        assert sorted(asyncio.run(collect())) == ['2317', '2330']
@@ -0,0 +1,243 @@
+import asyncio
+import orjson
+import pytest
+
+websockets = pytest.importorskip('websockets')
+
+from fugle_marketdata import AsyncWebSocketClient, HealthCheckConfig
+from fugle_marketdata.constants import UNAUTHENTICATED_MESSAGE
+from fugle_marketdata.websocket.aio.stock import AsyncWebSocketStockClient
+from fugle_marketdata.websocket.aio.futopt import AsyncWebSocketFutOptClient
+from fugle_marketdata.websocket.client import AuthenticationState
+
+
+def trade(symbol, price, channel='trades'):
+    return {'event': 'data', 'channel': channel, 'data': {'symbol': symbol, 'price': price}}
+
+
+class FakeServer:
+    """本機 WebSocket 伺服器，依 api key 回應認證，收到 subscribe 後送出 messages"""
+
+    def __init__(self, messages=(), reply_pong=True, authenticate=True):
+        self.messages = list(messages)
+        self.reply_pong = reply_pong
+        self.authenticate = authenticate
+        self.received = []
+        self.server = None
+
+    async def handler(self, ws):
+        async for data in ws:
+            message = orjson.loads(data)
+            self.received.append(message)
+            event = message['event']
+            if event == 'auth':
+                if not self.authenticate:
+                    continue
+                if message['data'].get('apikey') == 'api-key':
+                    await ws.send(orjson.dumps({'event': 'authenticated', 'data': {'message': 'Authenticated successfully'}}).decode())
+                else:
+                    await ws.send(orjson.dumps({'event': 'error', 'data': {'message': UNAUTHENTICATED_MESSAGE}}).decode())
+            elif event == 'subscribe':
+                for item in self.messages:
+                    await ws.send(orjson.dumps(item).decode())
+            elif event == 'ping' and self.reply_pong:
+                await ws.send(orjson.dumps({'event': 'pong', 'data': {}}).decode())
+
+    async def __aenter__(self):
+        self.server = await websockets.serve(self.handler, '127.0.0.1', 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.url = f'ws://127.0.0.1:{port}'
+        return self
+
+    async def __aexit__(self, *args):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 10))
+
+
+class TestAsyncWebSocketClientFactory:
+    def test_clients(self):
+        client = AsyncWebSocketClient(api_key='api-key')
+        assert isinstance(client.stock, AsyncWebSocketStockClient)
+        assert isinstance(client.futopt, AsyncWebSocketFutOptClient)
+        assert client.stock is client.stock
+        assert client.stock.config['base_url'] == 'wss://api.fugle.tw/marketdata/v1.0/stock/streaming'
+
+    def test_requires_credentials(self):
+        with pytest.raises(TypeError):
+            AsyncWebSocketClient()
+
+
+class TestAsyncWebSocketClient:
+    def test_connect_and_iterate_messages(self):
+        async def scenario():
+            messages = [trade('2330', 580), trade('2317', 105), trade('2330', 581, channel='candles')]
+            async with FakeServer(messages) as server:
+                stock = AsyncWebSocketStockClient(api_key='api-key', base_url=server.url)
+                await stock.connect()
+                assert stock.connected
+                assert set(stock.timings) == {'connect', 'authenticate', 'total'}
+
+                trades = stock.messages(channel='trades')
+                await stock.subscribe({'channel': 'trades', 'symbol': '2330'})
+                received = [await trades.__anext__(), await trades.__anext__()]
+                await stock.disconnect()
+                remaining = [message async for message in trades]
+                return server.received, received, remaining
+
+        sent, received, remaining = run(scenario())
+        assert sent[0] == {'event': 'auth', 'data': {'apikey': 'api-key'}}
+        assert sent[1] == {'event': 'subscribe', 'data': {'channel': 'trades', 'symbol': '2330'}}
+        assert [m['data']['price'] for m in received] == [580, 105]
+        assert remaining == []
+
+    def test_symbol_filter(self):
+        async def scenario():
+            async with FakeServer([trade('2330', 580), trade('2317', 105)]) as server:
+                stock = AsyncWebSocketStockClient(api_key='api-key', base_url=server.url)
+                await stock.connect()
+                only_2317 = stock.messages(symbol='2317')
+                await stock.subscribe({'channel': 'trades', 'symbols': ['2330', '2317']})
+                message = await only_2317.__anext__()
+                await stock.disconnect()
+                return message
+
+        assert run(scenario())['data']['symbol'] == '2317'
+
+    def test_unauthenticated(self):
+        async def scenario():
+            async with FakeServer() as server:
+                stock = AsyncWebSocketStockClient(api_key='bad-key', base_url=server.url)
+                with pytest.raises(Exception, match=UNAUTHENTICATED_MESSAGE):
+                    await stock.connect()
+                assert stock.auth_status == AuthenticationState.PENDING
+
+        run(scenario())
+
+    def test_connect_timeout(self):
+        async def scenario():
+            async with FakeServer(authenticate=False) as server:
+                stock = AsyncWebSocketStockClient(api_key='api-key', base_url=server.url)
+                with pytest.raises(Exception):
+                    await stock.connect(timeout=0.3)
+                assert not stock.connected
+
+        run(scenario())
+
+    def test_send_requires_connection(self):
+        async def scenario():
+            stock = AsyncWebSocketStockClient(api_key='api-key', base_url='ws://127.0.0.1:1')
+            with pytest.raises(Exception):
+                await stock.subscribe({'channel': 'trades', 'symbol': '2330'})
+
+        run(scenario())
+
+    def test_drop_oldest_overflow(self):
+        async def scenario():
+            messages = [trade('2330', price) for price in range(10)]
+            async with FakeServer(messages) as server:
+                stock = AsyncWebSocketStockClient(api_key='api-key', base_url=server.url)
+                await stock.connect()
+                stream = stock.messages(channel='trades', maxsize=3, overflow='drop_oldest')
+                await stock.subscribe({'channel': 'trades', 'symbol': '2330'})
+                while stream.dropped < 7:
+                    await asyncio.sleep(0.01)
+                await stock.disconnect()
+                return [m['data']['price'] async for m in stream], stream.dropped
+
+        prices, dropped = run(scenario())
+        # 結束標記佔用一格，因此保留最後兩筆
+        assert prices == [8, 9]
+        assert dropped == 7
+
+    def test_block_overflow_applies_backpressure(self):
+        async def scenario():
+            messages = [trade('2330', price) for price in range(20)]
+            async with FakeServer(messages) as server:
+                stock = AsyncWebSocketStockClient(api_key='api-key', base_url=server.url)
+                await stock.connect()
+                stream = stock.messages(channel='trades', maxsize=2)
+                await stock.subscribe({'channel': 'trades', 'symbol': '2330'})
+                await asyncio.sleep(0.1)
+                assert stream.queue.qsize() == 2
+                prices = [(await stream.__anext__())['data']['price'] for _ in range(20)]
+                await stock.disconnect()
+                return prices
+
+        assert run(scenario()) == list(range(20))
+
+    def test_close_while_full_releases_reader(self):
+        async def scenario():
+            messages = [trade('2330', price) for price in range(10)]
+            async with FakeServer(messages) as server:
+                stock = AsyncWebSocketStockClient(api_key='api-key', base_url=server.url)
+                await stock.connect()
+                blocked = stock.messages(channel='trades', maxsize=2)
+                other = stock.messages(channel='trades', maxsize=100, overflow='drop_oldest')
+                await stock.subscribe({'channel': 'trades', 'symbol': '2330'})
+                while blocked.queue.qsize() < 2:
+                    await asyncio.sleep(0.01)
+                await blocked.aclose()
+                prices = [(await other.__anext__())['data']['price'] for _ in range(10)]
+                await asyncio.wait_for(stock.disconnect(), 2)
+                return prices, [message async for message in blocked]
+
+        prices, remaining = run(scenario())
+        assert prices == list(range(10))
+        assert remaining == []
+
+    def test_stream_context_manager_closes(self):
+        async def scenario():
+            messages = [trade('2330', price) for price in range(10)]
+            async with FakeServer(messages) as server:
+                stock = AsyncWebSocketStockClient(api_key='api-key', base_url=server.url)
+                await stock.connect()
+                other = stock.messages(channel='trades', maxsize=100)
+                async with stock.messages(channel='trades', maxsize=1) as first:
+                    await stock.subscribe({'channel': 'trades', 'symbol': '2330'})
+                    async for message in first:
+                        break
+                prices = [(await other.__anext__())['data']['price'] for _ in range(10)]
+                await asyncio.wait_for(stock.disconnect(), 2)
+                return prices
+
+        assert run(scenario()) == list(range(10))
+
+    def test_invalid_overflow(self):
+        stock = AsyncWebSocketStockClient(api_key='api-key', base_url='ws://127.0.0.1:1')
+        with pytest.raises(ValueError):
+            asyncio.run(self._messages(stock, overflow='latest'))
+
+    @staticmethod
+    async def _messages(stock, **kwargs):
+        return stock.messages(**kwargs)
+
+    def test_health_check_closes_without_pong(self):
+        async def scenario():
+            async with FakeServer(reply_pong=False) as server:
+                health_check = HealthCheckConfig(enabled=True, ping_interval=50, max_missed_pongs=2)
+                stock = AsyncWebSocketStockClient(api_key='api-key', base_url=server.url, health_check=health_check)
+                await stock.connect()
+                stream = stock.messages()
+                remaining = [message async for message in stream]
+                return remaining, server.received
+
+        remaining, received = run(scenario())
+        assert remaining == []
+        assert [m['event'] for m in received].count('ping') == 2
+
+    def test_health_check_keeps_alive_with_pong(self):
+        async def scenario():
+            async with FakeServer() as server:
+                health_check = HealthCheckConfig(enabled=True, ping_interval=30, max_missed_pongs=1)
+                stock = AsyncWebSocketStockClient(api_key='api-key', base_url=server.url, health_check=health_check)
+                await stock.connect()
+                await asyncio.sleep(0.3)
+                connected = stock.connected
+                await stock.disconnect()
+                return connected
+
+        assert run(scenario())
@@ -1,6 +1,8 @@
+import orjson
 import pytest
 import requests
 from unittest.mock import Mock, patch
+from fugle_marketdata.exceptions import FugleAPIError
 from fugle_marketdata.rest.base_rest import BaseRest
 
 
@@ -34,9 +36,10 @@ class TestBaseRest:
         """測試成功的 JSON 回應"""
         expected_data = {"status": "success", "data": [1, 2, 3]}
         
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = Mock()
-            mock_response.json.return_value = expected_data
+            mock_response.status_code = 200
+            mock_response.content = orjson.dumps(expected_data)
             mock_get.return_value = mock_response
             
             result = base_rest_with_api_key.request("/test")
@@ -51,10 +54,10 @@ class TestBaseRest:
         """測試無效的 JSON 回應會拋出異常"""
         invalid_response_text = "<html><body>Server Error</body></html>"
         
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = Mock()
             mock_response.json.side_effect = ValueError("No JSON object could be decoded")
-            mock_response.text = invalid_response_text
+            mock_response.content = invalid_response_text.encode()
             mock_get.return_value = mock_response
             
             with pytest.raises(Exception) as exc_info:
@@ -66,10 +69,10 @@ class TestBaseRest:
         """測試不同類型的 JSON 解碼錯誤"""
         response_text = "This is not JSON"
         
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = Mock()
             mock_response.json.side_effect = ValueError("Expecting "," delimiter")
-            mock_response.text = response_text
+            mock_response.content = response_text.encode()
             mock_get.return_value = mock_response
             
             with pytest.raises(Exception) as exc_info:
@@ -79,10 +82,10 @@ class TestBaseRest:
 
     def test_empty_response_text_in_error(self, base_rest_with_api_key):
         """測試空的回應內容時的錯誤處理"""
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = Mock()
             mock_response.json.side_effect = ValueError("No JSON object could be decoded")
-            mock_response.text = ""
+            mock_response.content = "".encode()
             mock_get.return_value = mock_response
             
             with pytest.raises(Exception) as exc_info:
@@ -94,10 +97,10 @@ class TestBaseRest:
         """測試真實世界的錯誤情境"""
         html_response = "<!DOCTYPE html><html><head><title>500 Internal Server Error</title></head><body><h1>Internal Server Error</h1></body></html>"
         
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = Mock()
             mock_response.json.side_effect = ValueError("No JSON object could be decoded")
-            mock_response.text = html_response
+            mock_response.content = html_response.encode()
             mock_get.return_value = mock_response
             
             with pytest.raises(Exception) as exc_info:
@@ -109,10 +112,10 @@ class TestBaseRest:
         """測試部分 JSON 回應錯誤"""
         partial_json = '{"status": "success", "data": ['
         
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = Mock()
             mock_response.json.side_effect = ValueError("Unterminated string")
-            mock_response.text = partial_json
+            mock_response.content = partial_json.encode()
             mock_get.return_value = mock_response
             
             with pytest.raises(Exception) as exc_info:
@@ -122,10 +125,10 @@ class TestBaseRest:
 
     def test_integration_with_stock_client(self, base_rest_with_api_key):
         """測試與 Stock Client 的集成"""
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = Mock()
             mock_response.json.side_effect = ValueError("Invalid JSON")
-            mock_response.text = "<html>Error Page</html>"
+            mock_response.content = "<html>Error Page</html>".encode()
             mock_get.return_value = mock_response
             
             with pytest.raises(Exception) as exc_info:
@@ -135,10 +138,10 @@ class TestBaseRest:
 
     def test_json_content_type_mismatch(self, base_rest_with_api_key):
         """測試當伺服器回傳非 JSON 內容類型時的處理"""
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = Mock()
             mock_response.json.side_effect = ValueError("No JSON object could be decoded")
-            mock_response.text = "<xml><error>Service unavailable</error></xml>"
+            mock_response.content = "<xml><error>Service unavailable</error></xml>".encode()
             mock_get.return_value = mock_response
             
             with pytest.raises(Exception) as exc_info:
@@ -148,13 +151,52 @@ class TestBaseRest:
 
     def test_network_timeout_with_partial_response(self, base_rest_with_api_key):
         """測試網路超時導致的部分回應"""  
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = Mock()
             mock_response.json.side_effect = ValueError("Expecting property name enclosed in double quotes")
-            mock_response.text = '{"data": {"price": 150.0, "volume":'
+            mock_response.content = '{"data": {"price": 150.0, "volume":'.encode()
             mock_get.return_value = mock_response
             
             with pytest.raises(Exception) as exc_info:
                 base_rest_with_api_key.request("/stock/quote/2330")
             
             assert "An unexpected data error occurred.\nPlease try again later. If the issue persists, please contact support at  (tech.support@fugle.tw)" in str(exc_info.value)
+
+
+class TestBaseRestResponseDecoding:
+    """測試以 orjson 解析原始 bytes 的行為"""
+
+    @pytest.fixture
+    def base_rest(self):
+        return BaseRest(base_url="https://api.fugle.tw/marketdata/v1.0", api_key="test-api-key")
+
+    def make_response(self, content, status_code=200):
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = content
+        return response
+
+    def test_decodes_raw_content(self, base_rest):
+        response = self.make_response(b'{"symbol": "2330", "price": 591.0}')
+        assert base_rest._handle_response(response, "url", {}) == {"symbol": "2330", "price": 591.0}
+
+    def test_error_message_from_body(self, base_rest):
+        response = self.make_response(b'{"statusCode": 404, "message": "Resource Not Found"}', status_code=404)
+        with pytest.raises(FugleAPIError) as exc_info:
+            base_rest._handle_response(response, "url", {})
+        assert exc_info.value.message == "Resource Not Found"
+        assert exc_info.value.response_text == '{"statusCode": 404, "message": "Resource Not Found"}'
+
+    def test_error_with_non_json_body(self, base_rest):
+        response = self.make_response(b'<html>Bad Gateway</html>', status_code=502)
+        with pytest.raises(FugleAPIError) as exc_info:
+            base_rest._handle_response(response, "url", {})
+        assert exc_info.value.message == "HTTP 502"
+        assert exc_info.value.response_text == '<html>Bad Gateway</html>'
+
+    def test_invalid_json(self, base_rest):
+        response = self.make_response(b'\xff{"data": [')
+        with pytest.raises(FugleAPIError) as exc_info:
+            base_rest._handle_response(response, "url", {})
+        assert exc_info.value.message == "Failed to parse JSON response"
+        assert exc_info.value.response_text == '�{"data": ['
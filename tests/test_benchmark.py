@@ -0,0 +1,70 @@
+import os
+import time
+import orjson
+import pytest
+import requests
+from fugle_marketdata import RestClient
+from fugle_marketdata.rest.base_rest import BaseRest
+
+# 量測結果受機器負載影響，預設略過；以 FUGLE_BENCHMARK=1 pytest -s tests/test_benchmark.py 執行
+pytestmark = pytest.mark.skipif(not os.environ.get('FUGLE_BENCHMARK'), reason='set FUGLE_BENCHMARK=1 to run benchmarks')
+
+
+def best_of(func, repeat=5, number=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings)
+
+
+def snapshot_payload(rows=5000):
+    # 模擬 snapshot/quotes/{market} 的大型回應
+    return orjson.dumps({
+        'date': '2024-01-02',
+        'time': '133000',
+        'market': 'TSE',
+        'data': [
+            {
+                'type': 'EQUITY', 'symbol': f'{1000 + i}', 'name': f'股票{i}',
+                'openPrice': 100.5, 'highPrice': 102.0, 'lowPrice': 99.5, 'closePrice': 101.0,
+                'change': 0.5, 'changePercent': 0.5, 'tradeVolume': 123456, 'tradeValue': 12469056.0,
+                'lastUpdated': 1704173400000000,
+            }
+            for i in range(rows)
+        ],
+    })
+
+
+class TestJsonDecodeBenchmark:
+    def test_orjson_content_vs_response_json(self):
+        content = snapshot_payload()
+        base_rest = BaseRest(base_url='https://api.fugle.tw/marketdata/v1.0', api_key='api-key')
+
+        def make_response():
+            response = requests.Response()
+            response.status_code = 200
+            response._content = content
+            return response
+
+        before = best_of(lambda: make_response().json())
+        after = best_of(lambda: base_rest._handle_response(make_response(), 'url', {}))
+        print(f'\nresponse.json(): {before * 1000:.2f} ms, orjson(content): {after * 1000:.2f} ms ({len(content) / 1e6:.1f} MB)')
+        assert after < before
+
+
+class TestClientOverheadBenchmark:
+    def test_per_call_overhead(self, mocker):
+        # transport 以固定回應取代，只量測 client 本身的開銷
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"symbol": "2330"}'
+        mocker.patch('requests.Session.get', new=lambda session, url, headers=None: response)
+        client = RestClient(api_key='api-key')
+
+        number = 20000
+        per_call = best_of(lambda: [client.stock.intraday.quote(symbol='2330') for _ in range(number)], repeat=3, number=1) / number
+        print(f'\nclient.stock.intraday.quote overhead: {per_call * 1e6:.2f} us/call')
+        assert per_call < 50e-6
@@ -0,0 +1,152 @@
+import asyncio
+import pytest
+from datetime import date, timedelta
+from fugle_marketdata import RestClient, CacheConfig
+from fugle_marketdata.rest.cache import DiskCacheBackend, MemoryCacheBackend, ResponseCache, closed_range_ttl
+
+
+class TestMemoryCacheBackend:
+    def test_ttl_expiry(self, clock):
+        backend = MemoryCacheBackend(clock=clock)
+        backend.set('a', b'1', 10)
+        assert backend.get('a') == b'1'
+        clock.now += 11
+        assert backend.get('a') is None
+        assert len(backend) == 0
+
+    def test_lru_eviction(self):
+        backend = MemoryCacheBackend(max_entries=2)
+        backend.set('a', b'1', 60)
+        backend.set('b', b'2', 60)
+        backend.get('a')
+        backend.set('c', b'3', 60)
+        assert backend.get('a') == b'1'
+        assert backend.get('b') is None
+        assert backend.get('c') == b'3'
+
+
+class TestDiskCacheBackend:
+    def test_roundtrip_and_expiry(self, tmp_path, clock):
+        backend = DiskCacheBackend(str(tmp_path), clock=clock)
+        backend.set('a', b'{"x": 1}', 10)
+        assert backend.get('a') == b'{"x": 1}'
+        assert DiskCacheBackend(str(tmp_path), clock=clock).get('a') == b'{"x": 1}'
+        clock.now += 11
+        assert backend.get('a') is None
+        assert len(backend) == 0
+
+    def test_get_when_file_removed_concurrently(self, tmp_path, mocker):
+        backend = DiskCacheBackend(str(tmp_path))
+        backend.set('a', b'1', 10)
+        mocker.patch('fugle_marketdata.rest.cache.os.utime', side_effect=FileNotFoundError)
+        assert backend.get('a') == b'1'
+
+    def test_max_entries(self, tmp_path):
+        backend = DiskCacheBackend(str(tmp_path), max_entries=2)
+        for key in ['a', 'b', 'c']:
+            backend.set(key, b'1', 60)
+        assert len(backend) == 2
+
+    def test_eviction_skips_files_removed_concurrently(self, tmp_path, mocker):
+        backend = DiskCacheBackend(str(tmp_path), max_entries=2)
+        backend.set('a', b'1', 60)
+        backend.set('b', b'2', 60)
+        files = backend._files
+        # listdir 之後、stat 之前檔案已被刪除
+        mocker.patch.object(backend, '_files', side_effect=lambda: files() + [str(tmp_path / 'gone.cache')])
+        backend.set('c', b'3', 60)
+        assert backend.get('c') == b'3'
+
+    def test_clear(self, tmp_path):
+        backend = DiskCacheBackend(str(tmp_path))
+        backend.set('a', b'1', 60)
+        backend.clear()
+        assert backend.get('a') is None
+
+
+class TestResponseCachePolicies:
+    def test_default_policies(self):
+        cache = ResponseCache(CacheConfig())
+        assert cache.ttl_for('intraday/tickers', {}) == 3600
+        assert cache.ttl_for('/intraday/ticker/2330', {}) == 3600
+        assert cache.ttl_for('corporate-actions/dividends', {}) == 3600
+        assert cache.ttl_for('intraday/quote/2330', {}) == 0
+
+    def test_closed_range_ttl(self):
+        yesterday = (date.today() - timedelta(days=2)).isoformat()
+        tomorrow = (date.today() + timedelta(days=2)).isoformat()
+        assert closed_range_ttl('historical/candles/2330', {'to': yesterday}) == 86400
+        assert closed_range_ttl('historical/candles/2330', {'to': tomorrow}) == 0
+        assert closed_range_ttl('historical/candles/2330', {}) == 0
+
+    def test_custom_policy(self):
+        cache = ResponseCache(CacheConfig(policies={'intraday/quote/*': 1}, ttl=5))
+        assert cache.ttl_for('intraday/quote/2330', {}) == 1
+        assert cache.ttl_for('intraday/tickers', {}) == 5
+
+    def test_key_sorts_params_and_scopes_credentials(self):
+        config = {'base_url': 'https://api.fugle.tw/marketdata/v1.0/stock', 'api_key': 'key-1'}
+        key = ResponseCache.key_for(config, 'intraday/tickers', {'type': 'EQUITY', 'exchange': 'TWSE'})
+        assert key == ResponseCache.key_for(config, 'intraday/tickers', {'exchange': 'TWSE', 'type': 'EQUITY'})
+        assert key != ResponseCache.key_for({**config, 'api_key': 'key-2'}, 'intraday/tickers', {'exchange': 'TWSE', 'type': 'EQUITY'})
+        assert 'key-1' not in key
+
+
+class TestRestClientCache:
+    def test_cached_endpoint(self, mocker, mock_response):
+        client = RestClient(api_key='api-key', cache=CacheConfig())
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response([{'symbol': '2330'}]))
+        first = client.stock.intraday.tickers(type='EQUITY')
+        second = client.stock.intraday.tickers(type='EQUITY')
+        assert first == second == [{'symbol': '2330'}]
+        assert mock_get.call_count == 1
+        assert client.response_cache.stats() == {'hits': 1, 'misses': 1, 'size': 1}
+
+    def test_uncached_endpoint(self, mocker, mock_response):
+        client = RestClient(api_key='api-key', cache=CacheConfig())
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response({'symbol': '2330'}))
+        client.stock.intraday.quote(symbol='2330')
+        client.stock.intraday.quote(symbol='2330')
+        assert mock_get.call_count == 2
+        assert client.response_cache.stats()['hits'] == 0
+
+    def test_errors_are_not_cached(self, mocker, mock_response):
+        client = RestClient(api_key='api-key', cache=CacheConfig())
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response({'message': 'boom'}, status_code=500))
+        for _ in range(2):
+            with pytest.raises(Exception):
+                client.stock.intraday.tickers(type='EQUITY')
+        assert mock_get.call_count == 2
+
+    def test_stock_and_futopt_do_not_collide(self, mocker, mock_response):
+        client = RestClient(api_key='api-key', cache=CacheConfig())
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response([]))
+        client.stock.intraday.tickers(type='EQUITY')
+        client.futopt.intraday.tickers(type='EQUITY')
+        assert mock_get.call_count == 2
+
+    def test_disk_backend(self, mocker, tmp_path, mock_response):
+        config = CacheConfig(backend=DiskCacheBackend(str(tmp_path)))
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response([1, 2, 3]))
+        RestClient(api_key='api-key', cache=config).stock.corporate_actions.dividends()
+        # 新的 client 仍可讀到磁碟上的快取
+        assert RestClient(api_key='api-key', cache=config).stock.corporate_actions.dividends() == [1, 2, 3]
+        assert mock_get.call_count == 1
+
+
+class TestAsyncRestClientCache:
+    def test_cached_endpoint(self, mocker):
+        pytest.importorskip('aiohttp')
+        from unittest.mock import AsyncMock
+        from fugle_marketdata import AsyncRestClient
+        from fugle_marketdata.rest.aio.transport import AsyncResponse, AsyncTransport
+
+        client = AsyncRestClient(api_key='api-key', cache=CacheConfig())
+        mock_get = mocker.patch.object(AsyncTransport, 'get', AsyncMock(return_value=AsyncResponse(200, {}, b'[]')))
+
+        async def run():
+            await client.futopt.intraday.products(type='FUTURE')
+            return await client.futopt.intraday.products(type='FUTURE')
+
+        assert asyncio.run(run()) == []
+        assert mock_get.await_count == 1
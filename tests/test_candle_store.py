@@ -0,0 +1,166 @@
+import pathlib
+import pytest
+from datetime import date, timedelta
+from unittest.mock import MagicMock
+
+np = pytest.importorskip('numpy')
+
+from fugle_marketdata.exceptions import FugleAPIError
+from fugle_marketdata.store import CandleStore
+from fugle_marketdata.rest.columnar import records_to_columns, to_epoch_ms
+from fugle_marketdata.store.candle_store import merge_ranges, missing_ranges
+
+
+def candles(*dates):
+    return {
+        'symbol': '2330',
+        'timeframe': 'D',
+        'data': [
+            {'date': d, 'open': 500.0 + i, 'high': 510.0 + i, 'low': 495.0 + i, 'close': 505.0 + i, 'volume': 1000 * (i + 1)}
+            for i, d in enumerate(dates)
+        ],
+    }
+
+
+@pytest.fixture
+def historical():
+    return MagicMock()
+
+
+@pytest.fixture
+def store(historical, tmp_path):
+    return CandleStore(historical, str(tmp_path))
+
+
+def store_path(store):
+    return pathlib.Path(store.root)
+
+
+class TestRanges:
+    def test_merge_ranges(self):
+        ranges = [(date(2024, 1, 5), date(2024, 1, 10)), (date(2024, 1, 1), date(2024, 1, 4)), (date(2024, 2, 1), date(2024, 2, 2))]
+        assert merge_ranges(ranges) == [(date(2024, 1, 1), date(2024, 1, 10)), (date(2024, 2, 1), date(2024, 2, 2))]
+
+    def test_missing_ranges(self):
+        covered = [(date(2024, 1, 5), date(2024, 1, 10)), (date(2024, 1, 20), date(2024, 1, 25))]
+        assert missing_ranges(covered, date(2024, 1, 1), date(2024, 1, 31)) == [
+            (date(2024, 1, 1), date(2024, 1, 4)),
+            (date(2024, 1, 11), date(2024, 1, 19)),
+            (date(2024, 1, 26), date(2024, 1, 31)),
+        ]
+        assert missing_ranges(covered, date(2024, 1, 6), date(2024, 1, 9)) == []
+
+
+class TestColumns:
+    def test_daily_dates(self):
+        assert to_epoch_ms(['2024-01-02']).tolist() == [1704124800000]
+
+    def test_intraday_timestamps(self):
+        assert to_epoch_ms(['2024-01-02T09:00:00.000+08:00']).tolist() == [1704157200000]
+
+    def test_dtypes(self):
+        columns = records_to_columns(candles('2024-01-02', '2024-01-03')['data'])
+        assert columns['date'].dtype == np.int64
+        assert columns['close'].dtype == np.float64
+        assert columns['volume'].dtype == np.int64
+        assert columns['volume'].tolist() == [1000, 2000]
+
+
+class TestCandleStore:
+    def test_sync_and_query(self, store, historical):
+        historical.candles.return_value = candles('2024-01-02', '2024-01-03', '2024-01-04')
+        results = store.sync(['2330'], '2024-01-01', '2024-01-31')
+        assert results[0].ok and results[0].data == 3
+        historical.candles.assert_called_once_with(symbol='2330', timeframe='D', **{'from': '2024-01-01', 'to': '2024-01-31'})
+
+        data = store.query('2330', '2024-01-03', '2024-01-04')
+        assert data['close'].tolist() == [506.0, 507.0]
+        assert isinstance(data['close'], np.memmap)
+
+    def test_incremental_sync(self, store, historical):
+        historical.candles.return_value = candles('2024-01-02')
+        store.sync(['2330'], '2024-01-01', '2024-01-10')
+        historical.candles.return_value = candles('2024-01-15')
+        store.sync(['2330'], '2024-01-05', '2024-01-20')
+        # 第二次只抓取尚未同步的 01-11 ~ 01-20
+        assert historical.candles.call_args[1]['from'] == '2024-01-11'
+        assert historical.candles.call_args[1]['to'] == '2024-01-20'
+        assert store.coverage('2330') == [(date(2024, 1, 1), date(2024, 1, 20))]
+        assert len(store.query('2330')['date']) == 2
+
+        historical.candles.reset_mock()
+        store.sync(['2330'], '2024-01-03', '2024-01-18')
+        historical.candles.assert_not_called()
+
+    def test_overlapping_rows_are_deduplicated(self, store, historical):
+        store.write('2330', candles('2024-01-02', '2024-01-03')['data'], '2024-01-01', '2024-01-03')
+        updated = candles('2024-01-03')['data']
+        updated[0]['close'] = 999.0
+        store.write('2330', updated, '2024-01-03', '2024-01-03')
+        data = store.query('2330')
+        assert data['close'].tolist() == [505.0, 999.0]
+
+    def test_open_range_not_marked_synced(self, store, historical):
+        today = date.today()
+        historical.candles.return_value = candles()
+        store.sync(['2330'], today - timedelta(days=3), today + timedelta(days=1))
+        coverage = store.coverage('2330')
+        assert coverage[-1][1] < today
+
+    def test_per_symbol_errors(self, store, historical):
+        def fake_candles(**params):
+            if params['symbol'] == 'INVALID':
+                raise FugleAPIError('Resource Not Found', status_code=404)
+            return candles('2024-01-02')
+
+        historical.candles.side_effect = fake_candles
+        results = store.sync(['2330', 'INVALID'], '2024-01-01', '2024-01-05')
+        assert [r.ok for r in results] == [True, False]
+        assert store.coverage('INVALID') == []
+
+    def test_futopt_daily(self, historical, tmp_path):
+        store = CandleStore(historical, str(tmp_path), method='daily')
+        historical.daily.return_value = candles('2024-01-02')
+        store.sync(['TXF'], '2024-01-01', '2024-01-05')
+        assert 'timeframe' not in historical.daily.call_args[1]
+        assert store.query('TXF', timeframe=None)['open'].tolist() == [500.0]
+
+    def test_query_without_data(self, store):
+        assert store.query('2330') is None
+
+    def test_interrupted_write_keeps_previous_version(self, store, mocker):
+        store.write('2330', candles('2024-01-02', '2024-01-03', '2024-01-04')['data'], '2024-01-01', '2024-01-04')
+        save = np.save
+        calls = []
+
+        def failing_save(f, array):
+            calls.append(array)
+            if len(calls) == 2:
+                raise OSError('disk full')
+            save(f, array)
+
+        mocker.patch('fugle_marketdata.store.candle_store.np.save', side_effect=failing_save)
+        with pytest.raises(OSError):
+            store.write('2330', candles('2024-01-05', '2024-01-08')['data'], '2024-01-05', '2024-01-08')
+        mocker.stopall()
+
+        data = store.query('2330')
+        assert {field: len(array) for field, array in data.items()} == dict.fromkeys(data, 3)
+        assert store.coverage('2330') == [(date(2024, 1, 1), date(2024, 1, 4))]
+
+        store.write('2330', candles('2024-01-05', '2024-01-08')['data'], '2024-01-05', '2024-01-08')
+        assert len(store.query('2330')['close']) == 5
+        files = sorted(path.name for path in (store_path(store) / '2330' / 'D').iterdir())
+        assert files == sorted(['meta.json'] + [f'{field}.2.npy' for field in data])
+
+    def test_mismatched_columns_are_refetched(self, store, historical):
+        # 欄位筆數不一致，例如舊版格式逐一取代欄位檔時中途失敗
+        store.write('2330', candles('2024-01-02', '2024-01-03')['data'], '2024-01-01', '2024-01-03')
+        directory = store_path(store) / '2330' / 'D'
+        np.save(directory / 'date.1.npy', np.arange(5, dtype='int64'))
+        assert store.query('2330') is None
+
+        historical.candles.return_value = candles('2024-01-02', '2024-01-03')
+        store.sync(['2330'], '2024-01-01', '2024-01-03')
+        historical.candles.assert_called_once()
+        assert len(store.query('2330')['date']) == 2
@@ -0,0 +1,118 @@
+import asyncio
+import orjson
+import pytest
+from unittest.mock import MagicMock
+from urllib.parse import parse_qs, urlparse
+from fugle_marketdata import RestClient
+from fugle_marketdata.rest.chunking import merge_chunks, plan_chunks
+
+
+def candles_for(url):
+    # 依請求的 from / to 回傳區段首尾兩天的 K 線
+    query = parse_qs(urlparse(url).query)
+    start, end = query['from'][0], query['to'][0]
+    return {'symbol': '2330', 'timeframe': 'D', 'data': [{'date': end, 'close': 2.0}, {'date': start, 'close': 1.0}]}
+
+
+def mock_get(url, headers):
+    response = MagicMock()
+    response.status_code = 200
+    response.content = orjson.dumps(candles_for(url))
+    return response
+
+
+class TestPlanChunks:
+    def test_short_range_single_request(self):
+        params = {'from': '2024-01-01', 'to': '2024-06-30'}
+        assert plan_chunks(params) == [params]
+
+    def test_missing_range_single_request(self):
+        assert plan_chunks({'timeframe': 'D'}) == [{'timeframe': 'D'}]
+
+    def test_daily_split_by_year(self):
+        chunks = plan_chunks({'from': '2020-01-01', 'to': '2022-06-30', 'timeframe': 'D'})
+        assert [(c['from'], c['to']) for c in chunks] == [
+            ('2020-01-01', '2020-12-30'),
+            ('2020-12-31', '2021-12-30'),
+            ('2021-12-31', '2022-06-30'),
+        ]
+        assert all(c['timeframe'] == 'D' for c in chunks)
+
+    def test_intraday_timeframe_split(self):
+        chunks = plan_chunks({'from': '2024-01-01', 'to': '2024-03-01', 'timeframe': '5'})
+        assert len(chunks) == 3
+        assert chunks[0]['to'] == '2024-01-30'
+
+    def test_custom_chunk_days(self):
+        chunks = plan_chunks({'from': '2024-01-01', 'to': '2024-01-10'}, chunk_days=5)
+        assert [(c['from'], c['to']) for c in chunks] == [('2024-01-01', '2024-01-05'), ('2024-01-06', '2024-01-10')]
+
+
+class TestMergeChunks:
+    def test_dedupe_and_order(self):
+        responses = [
+            {'symbol': '2330', 'data': [{'date': '2024-01-03', 'close': 3}, {'date': '2024-01-02', 'close': 2}]},
+            {'symbol': '2330', 'data': [{'date': '2024-01-02', 'close': 2}, {'date': '2024-01-01', 'close': 1}]},
+        ]
+        merged = merge_chunks(responses, {})
+        assert merged['symbol'] == '2330'
+        assert [row['date'] for row in merged['data']] == ['2024-01-03', '2024-01-02', '2024-01-01']
+        ascending = merge_chunks(responses, {'sort': 'asc'})
+        assert [row['date'] for row in ascending['data']] == ['2024-01-01', '2024-01-02', '2024-01-03']
+
+
+class TestHistoricalChunking:
+    def test_candles_long_range(self, mocker):
+        client = RestClient(api_key='api-key')
+        get = mocker.patch('requests.Session.get', side_effect=mock_get)
+        result = client.stock.historical.candles(symbol='2330', **{'from': '2020-01-01', 'to': '2022-06-30'})
+        assert get.call_count == 3
+        assert result['symbol'] == '2330'
+        dates = [row['date'] for row in result['data']]
+        assert dates == sorted(dates, reverse=True)
+        assert dates[0] == '2022-06-30' and dates[-1] == '2020-01-01'
+
+    def test_candles_short_range_unchanged(self, mocker):
+        client = RestClient(api_key='api-key')
+        get = mocker.patch('requests.Session.get', side_effect=mock_get)
+        client.stock.historical.candles(symbol='2330', **{'from': '2024-01-01', 'to': '2024-01-31'})
+        get.assert_called_once_with(
+            'https://api.fugle.tw/marketdata/v1.0/stock/historical/candles/2330?from=2024-01-01&to=2024-01-31',
+            headers={'X-API-KEY': 'api-key'}
+        )
+
+    def test_iter_candles(self, mocker):
+        client = RestClient(api_key='api-key')
+        mocker.patch('requests.Session.get', side_effect=mock_get)
+        chunks = list(client.futopt.historical.iter_candles(symbol='TXF', chunk_days=10, **{'from': '2024-01-01', 'to': '2024-01-25'}))
+        assert len(chunks) == 3
+        assert sorted(chunk['data'][-1]['date'] for chunk in chunks) == ['2024-01-01', '2024-01-11', '2024-01-21']
+
+    def test_futopt_daily(self, mocker):
+        client = RestClient(api_key='api-key')
+        get = mocker.patch('requests.Session.get', side_effect=mock_get)
+        client.futopt.historical.daily(symbol='TXF', **{'from': '2022-01-01', 'to': '2023-12-31'})
+        assert get.call_count == 2
+
+
+class TestAsyncHistoricalChunking:
+    def test_candles_long_range(self, mocker):
+        pytest.importorskip('aiohttp')
+        import orjson
+        from fugle_marketdata import AsyncRestClient
+        from fugle_marketdata.rest.aio.transport import AsyncResponse, AsyncTransport
+
+        async def fake_get(url, headers):
+            return AsyncResponse(200, {}, orjson.dumps(candles_for(url)))
+
+        mocker.patch.object(AsyncTransport, 'get', side_effect=fake_get)
+        client = AsyncRestClient(api_key='api-key')
+
+        async def run():
+            merged = await client.stock.historical.candles(symbol='2330', **{'from': '2020-01-01', 'to': '2022-06-30'})
+            chunks = [c async for c in client.stock.historical.iter_candles(symbol='2330', **{'from': '2020-01-01', 'to': '2022-06-30'})]
+            return merged, chunks
+
+        merged, chunks = asyncio.run(run())
+        assert len(merged['data']) == 6
+        assert len(chunks) == 3
@@ -0,0 +1,80 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from fugle_marketdata import RestClient
+from fugle_marketdata.rest.columnar import Columns, to_columnar
+
+
+INTRADAY_CANDLES = {
+    'date': '2024-01-02',
+    'symbol': '2330',
+    'timeframe': '1',
+    'data': [
+        {'date': '2024-01-02T09:00:00.000+08:00', 'open': 590.0, 'high': 593.0, 'low': 589.0, 'close': 592.0, 'volume': 2000, 'average': 591.2},
+        {'date': '2024-01-02T09:01:00.000+08:00', 'open': 592.0, 'high': 592.0, 'low': 590.0, 'close': 591.0, 'volume': 350, 'average': 591.1},
+    ],
+}
+
+TRADES = {
+    'symbol': '2330',
+    'data': [
+        {'bid': 591.0, 'ask': 592.0, 'price': 592.0, 'size': 3, 'volume': 2353, 'time': 1704157260000000, 'serial': 1200},
+        {'bid': 591.0, 'ask': 592.0, 'price': 591.0, 'size': 1, 'volume': 2350, 'time': 1704157200000000, 'serial': 1199},
+    ],
+}
+
+
+class TestToColumnar:
+    def test_candles(self):
+        columns = to_columnar(INTRADAY_CANDLES)
+        assert isinstance(columns, Columns)
+        assert columns.meta == {'date': '2024-01-02', 'symbol': '2330', 'timeframe': '1'}
+        assert columns['date'].tolist() == [1704157200000, 1704157260000]
+        assert columns['date'].dtype == np.int64
+        assert columns['close'].dtype == np.float64
+        assert columns['volume'].dtype == np.int64
+
+    def test_trades(self):
+        columns = to_columnar(TRADES)
+        assert 'date' not in columns
+        assert columns['time'].dtype == np.int64
+        assert columns['size'].tolist() == [3, 1]
+        assert columns['price'].tolist() == [592.0, 591.0]
+
+    def test_empty(self):
+        columns = to_columnar({'symbol': '2330', 'data': []})
+        assert dict(columns) == {}
+
+    def test_to_pandas(self):
+        pd = pytest.importorskip('pandas')
+        frame = to_columnar(INTRADAY_CANDLES).to_pandas()
+        assert list(frame['close']) == [592.0, 591.0]
+        assert str(frame['date'].dt.tz) == 'Asia/Taipei'
+
+
+class TestRestClientColumnar:
+    def test_intraday_candles(self, mocker, mock_response):
+        client = RestClient(api_key='api-key')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response(INTRADAY_CANDLES))
+        columns = client.stock.intraday.candles(symbol='2330', format='columnar')
+        # format 不會送到 API
+        mock_get.assert_called_once_with(
+            'https://api.fugle.tw/marketdata/v1.0/stock/intraday/candles/2330',
+            headers={'X-API-KEY': 'api-key'}
+        )
+        assert columns['open'].tolist() == [590.0, 592.0]
+
+    def test_historical_candles_chunked(self, mocker, mock_response):
+        client = RestClient(api_key='api-key')
+        mocker.patch('requests.Session.get', side_effect=[
+            mock_response({'symbol': '2330', 'data': [{'date': '2023-01-03', 'close': 2.0}]}),
+            mock_response({'symbol': '2330', 'data': [{'date': '2022-01-03', 'close': 1.0}]}),
+        ])
+        columns = client.stock.historical.candles(symbol='2330', format='columnar', **{'from': '2022-01-01', 'to': '2023-06-30'})
+        assert columns['close'].tolist() == [2.0, 1.0]
+
+    def test_unsupported_format(self, mocker):
+        client = RestClient(api_key='api-key')
+        with pytest.raises(ValueError):
+            client.stock.intraday.trades(symbol='2330', format='xml')
@@ -0,0 +1,120 @@
+import orjson
+import pytest
+from fugle_marketdata import RestClient, ConditionalConfig, CacheConfig
+from fugle_marketdata.rest import MemoryCacheBackend
+from fugle_marketdata.rest.conditional import ConditionalCache
+from fugle_marketdata.rest.session import ACCEPT_ENCODING, create_session
+
+
+BODY = orjson.dumps({'data': [{'symbol': '2330'}] * 100})
+
+
+class TestConditionalCache:
+    def test_prepare_without_validator(self):
+        cache = ConditionalCache()
+        headers = {'X-API-KEY': 'key'}
+        assert cache.prepare('https://x/a', headers) == (headers, None)
+
+    def test_stores_validators_and_reuses_on_304(self, mock_response):
+        cache = ConditionalCache()
+        headers = {'ETag': '"v1"', 'Last-Modified': 'Wed, 01 May 2024 00:00:00 GMT', 'Content-Length': '300'}
+        assert cache.resolve('https://x/a', mock_response(BODY, headers=headers)) == BODY
+
+        prepared, _ = cache.prepare('https://x/a', {'X-API-KEY': 'key'})
+        assert prepared == {
+            'X-API-KEY': 'key',
+            'If-None-Match': '"v1"',
+            'If-Modified-Since': 'Wed, 01 May 2024 00:00:00 GMT',
+        }
+
+        assert cache.resolve('https://x/a', mock_response(b'', status_code=304)) == BODY
+        stats = cache.stats()
+        assert stats['requests'] == 2
+        assert stats['not_modified'] == 1
+        assert stats['bytes_received'] == 300
+        assert stats['bytes_decoded'] == len(BODY)
+        assert stats['bytes_reused'] == len(BODY)
+        assert stats['bytes_saved'] == 2 * len(BODY) - 300
+
+    def test_response_without_validator_drops_entry(self, mock_response):
+        cache = ConditionalCache()
+        cache.resolve('https://x/a', mock_response(BODY, headers={'ETag': '"v1"'}))
+        cache.resolve('https://x/a', mock_response(BODY))
+        assert cache.prepare('https://x/a', {}) == ({}, None)
+
+    def test_error_response_keeps_entry(self, mock_response):
+        cache = ConditionalCache()
+        cache.resolve('https://x/a', mock_response(BODY, headers={'ETag': '"v1"'}))
+        cache.resolve('https://x/a', mock_response(b'{}', status_code=500))
+        assert cache.prepare('https://x/a', {})[0] == {'If-None-Match': '"v1"'}
+
+    def test_lru_eviction(self, mock_response):
+        cache = ConditionalCache(ConditionalConfig(max_entries=2))
+        for url in ['a', 'b', 'c']:
+            cache.resolve(url, mock_response(BODY, headers={'ETag': url}))
+        assert cache.prepare('a', {}) == ({}, None)
+        assert cache.stats()['size'] == 2
+
+    def test_not_modified_after_eviction_during_request(self, mock_response):
+        cache = ConditionalCache(ConditionalConfig(max_entries=1))
+        cache.resolve('a', mock_response(BODY, headers={'ETag': '"v1"'}))
+        headers, validator = cache.prepare('a', {})
+        # 請求期間其他 URL 的回應淘汰了 a
+        cache.resolve('b', mock_response(b'{}', headers={'ETag': '"b"'}))
+        assert cache.resolve('a', mock_response(b'', status_code=304), validator) == BODY
+        assert cache.prepare('a', {})[0] == {'If-None-Match': '"v1"'}
+
+    def test_invalid_max_entries(self):
+        with pytest.raises(ValueError):
+            ConditionalConfig(max_entries=0)
+
+
+class TestAcceptEncoding:
+    def test_session_negotiates_compression(self):
+        session = create_session()
+        assert session.headers['Accept-Encoding'] == ACCEPT_ENCODING
+        assert 'gzip' in ACCEPT_ENCODING
+
+
+class TestRestClientConditional:
+    def test_disabled_by_default(self):
+        client = RestClient(api_key='test-api-key')
+        assert client.conditional_cache is None
+
+    def test_revalidates_with_etag(self, mocker, mock_response):
+        client = RestClient(api_key='test-api-key', conditional=ConditionalConfig())
+        get = mocker.patch('requests.Session.get', side_effect=[
+            mock_response(b'{"symbol":"2330"}', headers={'ETag': '"v1"'}),
+            mock_response(b'', status_code=304),
+        ])
+
+        assert client.stock.intraday.quote(symbol='2330') == {'symbol': '2330'}
+        assert client.stock.intraday.quote(symbol='2330') == {'symbol': '2330'}
+
+        first_headers = get.call_args_list[0][1]['headers']
+        second_headers = get.call_args_list[1][1]['headers']
+        assert 'If-None-Match' not in first_headers
+        assert second_headers['If-None-Match'] == '"v1"'
+        assert second_headers['X-API-KEY'] == 'test-api-key'
+        # 共用的 headers 不應被修改
+        assert 'If-None-Match' not in client.stock.intraday.headers
+        assert client.conditional_cache.stats()['not_modified'] == 1
+
+    def test_expired_cache_entry_revalidated(self, mocker, mock_response):
+        now = [0.0]
+        client = RestClient(
+            api_key='test-api-key',
+            cache=CacheConfig(policies={'intraday/tickers': 60}, backend=MemoryCacheBackend(clock=lambda: now[0])),
+            conditional=ConditionalConfig(),
+        )
+        get = mocker.patch('requests.Session.get', side_effect=[
+            mock_response(BODY, headers={'ETag': '"v1"'}),
+            mock_response(b'', status_code=304),
+        ])
+        first = client.stock.intraday.tickers(type='EQUITY')
+        assert client.stock.intraday.tickers(type='EQUITY') == first
+        assert get.call_count == 1
+
+        now[0] = 120
+        assert client.stock.intraday.tickers(type='EQUITY') == first
+        assert get.call_count == 2
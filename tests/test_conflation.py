@@ -0,0 +1,110 @@
+import threading
+import pytest
+
+from fugle_marketdata import ConflationConfig
+from fugle_marketdata.websocket.conflation import LatestTable
+from fugle_marketdata.websocket.stock.client import WebSocketStockClient
+
+
+class TestConflationConfig:
+    def test_defaults(self):
+        config = ConflationConfig()
+        assert config.channels == ('books', 'aggregates')
+        assert config.interval == 0.1
+
+    def test_invalid_interval(self):
+        with pytest.raises(ValueError):
+            ConflationConfig(interval=0)
+
+
+class TestLatestTable:
+    def test_keeps_latest_and_counts_skipped(self):
+        table = LatestTable(ConflationConfig())
+        table.update(('books', '2330'), 1)
+        table.update(('books', '2330'), 2)
+        table.update(('books', '2317'), 3)
+        assert table.get('books', '2330') == 2
+        assert table.drain() == {('books', '2330'): 2, ('books', '2317'): 3}
+        assert table.drain() == {}
+        table.update(('books', '2330'), 4)
+        assert table.drain() == {('books', '2330'): 4}
+        assert table.items() == {('books', '2330'): 4, ('books', '2317'): 3}
+        assert table.stats() == {'size': 2, 'pending': 0, 'updates': 4, 'skipped': 1}
+
+    def test_notifies_at_capped_rate(self):
+        table = LatestTable(ConflationConfig(interval=0.05))
+        notified = threading.Event()
+        changes = []
+
+        def listener(values):
+            changes.append(values)
+            notified.set()
+
+        table.on_update(listener)
+        for price in range(100):
+            table.update(('books', '2330'), price)
+        assert notified.wait(5)
+        table.close()
+        # 一個間隔內的更新合併為一次通知
+        assert changes[0] == {('books', '2330'): 99}
+
+    def test_listener_errors_reported(self):
+        errors = []
+        table = LatestTable(ConflationConfig(interval=0.01), on_error=errors.append)
+        reported = threading.Event()
+
+        def listener(values):
+            reported.set()
+            raise RuntimeError('boom')
+
+        table.on_update(listener)
+        table.update(('books', '2330'), 1)
+        assert reported.wait(5)
+        table.close()
+        assert [str(error) for error in errors] == ['boom']
+
+    def test_restarts_after_close(self):
+        table = LatestTable(ConflationConfig(interval=0.01))
+        notified = threading.Event()
+        table.on_update(lambda values: notified.set())
+        table.close()
+        table.update(('books', '2330'), 1)
+        assert not notified.wait(0.05)
+        table.open()
+        assert notified.wait(5)
+        table.close()
+
+    def test_open_without_listeners_does_not_start(self):
+        table = LatestTable(ConflationConfig(interval=0.01))
+        table.open()
+        assert table._LatestTable__thread is None
+
+
+class TestWebSocketClientConflation:
+    def test_conflated_channels_skip_listeners(self, data_message, deliver):
+        stock = WebSocketStockClient(api_key='api-key', message_format='dict', conflate=ConflationConfig(channels=['books']))
+        messages = []
+        stock.on('message', messages.append)
+        for price in range(10):
+            deliver(stock, data_message('books', '2330', bids=[{'price': price}]))
+        deliver(stock, data_message('trades', '2330', price=580))
+
+        assert [m['channel'] for m in messages] == ['trades']
+        assert stock.latest.get('books', '2330')['data']['bids'] == [{'price': 9}]
+        assert stock.latest.stats()['skipped'] == 9
+
+    def test_disabled_by_default(self):
+        assert WebSocketStockClient(api_key='api-key').latest is None
+
+    def test_disconnect_stops_notifier(self, fake_ws, data_message, deliver):
+        stock = WebSocketStockClient(api_key='api-key', conflate=ConflationConfig(channels=['books'], interval=0.01))
+        notified = threading.Event()
+        stock.latest.on_update(lambda values: notified.set())
+        stock.connect()
+        stock.disconnect()
+        assert not any(thread.name == 'fugle-conflation' for thread in threading.enumerate())
+
+        stock.connect()
+        deliver(stock, data_message('books', '2330', bids=[]))
+        assert notified.wait(5)
+        stock.disconnect()
@@ -0,0 +1,239 @@
+import threading
+import time
+import orjson
+import pytest
+
+from fugle_marketdata import DispatchConfig
+from fugle_marketdata.websocket.dispatch import Dispatcher
+from fugle_marketdata.websocket.stock.client import WebSocketStockClient
+
+
+class TestDispatchConfig:
+    def test_defaults(self):
+        config = DispatchConfig()
+        assert (config.workers, config.maxsize, config.overflow, config.ordered) == (4, 10000, 'block', False)
+
+    @pytest.mark.parametrize('kwargs', [{'workers': 0}, {'maxsize': 0}, {'overflow': 'drop_newest'}])
+    def test_invalid(self, kwargs):
+        with pytest.raises(ValueError):
+            DispatchConfig(**kwargs)
+
+
+class TestDispatcher:
+    def blocked_dispatcher(self, **config):
+        # 第一個訊息佔住唯一的 worker，其後的訊息留在佇列中
+        gate, started, handled = threading.Event(), threading.Event(), []
+
+        def handler(value):
+            if value == 'first':
+                started.set()
+                gate.wait(5)
+            handled.append(value)
+
+        dispatcher = Dispatcher(handler, DispatchConfig(workers=1, **config))
+        dispatcher.put(None, ('first',))
+        started.wait(5)
+        return dispatcher, gate, handled
+
+    def test_drop_oldest(self):
+        dispatcher, gate, handled = self.blocked_dispatcher(maxsize=2, overflow='drop_oldest')
+        for value in ['a', 'b', 'c']:
+            dispatcher.put(None, (value,))
+        assert dispatcher.stats() == {'depth': 2, 'dropped': 1, 'coalesced': 0, 'workers': 1}
+        gate.set()
+        assert dispatcher.join(5)
+        assert handled == ['first', 'b', 'c']
+
+    def test_coalesce_latest_per_key(self):
+        dispatcher, gate, handled = self.blocked_dispatcher(maxsize=2, overflow='coalesce')
+        dispatcher.put('2330', ('2330-1',))
+        dispatcher.put('2317', ('2317-1',))
+        dispatcher.put('2330', ('2330-2',))
+        dispatcher.put('2330', ('2330-3',))
+        assert dispatcher.coalesced == 2
+        dispatcher.put('2454', ('2454-1',))
+        assert dispatcher.dropped == 1
+        gate.set()
+        assert dispatcher.join(5)
+        assert handled == ['first', '2317-1', '2454-1']
+
+    def test_block_until_space(self):
+        dispatcher, gate, handled = self.blocked_dispatcher(maxsize=1, overflow='block')
+        dispatcher.put(None, ('a',))
+        producer = threading.Thread(target=dispatcher.put, args=(None, ('b',)))
+        producer.start()
+        producer.join(0.2)
+        assert producer.is_alive()
+        gate.set()
+        producer.join(5)
+        assert dispatcher.join(5)
+        assert handled == ['first', 'a', 'b']
+        assert dispatcher.dropped == 0
+
+    def test_ordered_keeps_per_key_order(self):
+        handled = {}
+        lock = threading.Lock()
+
+        def handler(key, value):
+            time.sleep(0.001)
+            with lock:
+                handled.setdefault(key, []).append(value)
+
+        dispatcher = Dispatcher(handler, DispatchConfig(workers=4, ordered=True))
+        for value in range(20):
+            for key in ['2330', '2317', '2454']:
+                dispatcher.put(key, (key, value))
+        assert dispatcher.join(5)
+        assert len(dispatcher.threads) == 4
+        assert handled == {key: list(range(20)) for key in ['2330', '2317', '2454']}
+
+    def test_handler_errors_reported(self):
+        errors = []
+
+        def handler():
+            raise RuntimeError('boom')
+
+        dispatcher = Dispatcher(handler, DispatchConfig(workers=1), on_error=errors.append)
+        dispatcher.put(None, ())
+        assert dispatcher.join(5)
+        assert [str(error) for error in errors] == ['boom']
+
+    def test_handler_errors_logged_by_default(self, caplog):
+        def handler():
+            raise RuntimeError('boom')
+
+        dispatcher = Dispatcher(handler, DispatchConfig(workers=1))
+        dispatcher.put(None, ())
+        assert dispatcher.join(5)
+        assert [(record.name, record.levelname) for record in caplog.records] == [('fugle_marketdata.websocket.dispatch', 'ERROR')]
+        assert 'boom' in caplog.text
+
+    def test_close_drains_queue(self):
+        handled = []
+        dispatcher = Dispatcher(handled.append, DispatchConfig(workers=2))
+        for value in range(10):
+            dispatcher.put(None, (value,))
+        dispatcher.close()
+        assert sorted(handled) == list(range(10))
+
+    def test_put_after_close_dropped(self):
+        handled = []
+        dispatcher = Dispatcher(handled.append, DispatchConfig(workers=1))
+        dispatcher.close()
+        dispatcher.put(None, ('late',))
+        assert dispatcher.stats() == {'depth': 0, 'dropped': 1, 'coalesced': 0, 'workers': 0}
+        assert handled == []
+
+    def test_close_releases_blocked_put(self):
+        dispatcher, gate, handled = self.blocked_dispatcher(maxsize=1)
+        dispatcher.put(None, ('queued',))
+        blocked = threading.Thread(target=dispatcher.put, args=(None, ('blocked',)))
+        blocked.start()
+        closing = threading.Thread(target=dispatcher.close)
+        closing.start()
+        blocked.join(5)
+        assert not blocked.is_alive()
+        gate.set()
+        closing.join(5)
+        assert handled == ['first', 'queued']
+        assert dispatcher.dropped == 1
+
+    def test_reopen_restarts_workers(self):
+        handled = []
+        dispatcher = Dispatcher(handled.append, DispatchConfig(workers=2))
+        dispatcher.put(None, (1,))
+        dispatcher.close()
+        assert dispatcher.threads == []
+        dispatcher.open()
+        dispatcher.put(None, (2,))
+        assert dispatcher.join(5)
+        assert len(dispatcher.threads) == 2
+        assert sorted(handled) == [1, 2]
+        dispatcher.close()
+
+
+class TestWebSocketClientDispatch:
+    def test_listeners_run_off_reader_thread(self, data_message, deliver):
+        stock = WebSocketStockClient(api_key='api-key', dispatch=DispatchConfig(workers=2))
+        threads = []
+        stock.on('message', lambda message: threads.append(threading.current_thread()))
+        deliver(stock, data_message('trades', '2330', price=580))
+        assert stock.dispatcher.join(5)
+        assert threads and threads[0] is not threading.current_thread()
+
+    def test_slow_listener_does_not_block_reads(self, data_message, deliver):
+        stock = WebSocketStockClient(api_key='api-key', message_format='dict', dispatch=DispatchConfig(workers=1, maxsize=2, overflow='coalesce'))
+        gate = threading.Event()
+        received = []
+
+        def slow(message):
+            gate.wait(5)
+            received.append(message['data']['price'])
+
+        stock.on_channel('trades', slow, symbol='2330')
+        started_at = time.monotonic()
+        for price in range(100):
+            deliver(stock, data_message('trades', '2330', price=price))
+        assert time.monotonic() - started_at < 1
+        gate.set()
+        assert stock.dispatcher.join(5)
+        # 處理中的第一筆，之後只剩佇列中最新的訊息
+        assert received[0] == 0
+        assert received[-1] == 99
+        assert stock.dispatcher.coalesced + stock.dispatcher.dropped == 100 - len(received)
+
+    def test_control_messages_handled_inline(self, deliver):
+        stock = WebSocketStockClient(api_key='api-key', dispatch=DispatchConfig(workers=1))
+        stock.missed_pongs = 3
+        deliver(stock, orjson.dumps({'event': 'pong', 'data': {}}).decode())
+        assert stock.missed_pongs == 0
+
+    def test_listener_error_emitted(self, data_message, deliver):
+        stock = WebSocketStockClient(api_key='api-key', dispatch=DispatchConfig(workers=1))
+        errors = []
+        stock.on('error', errors.append)
+
+        def fail(message):
+            raise RuntimeError('boom')
+
+        stock.on('message', fail)
+        deliver(stock, data_message('trades', '2330', price=580))
+        assert stock.dispatcher.join(5)
+        assert [str(error) for error in errors] == ['boom']
+
+    def test_disconnect_stops_workers(self, data_message, deliver):
+        stock = WebSocketStockClient(api_key='api-key', dispatch=DispatchConfig(workers=2))
+        received = []
+        stock.on('message', received.append)
+        deliver(stock, data_message('trades', '2330', price=580))
+        threads = list(stock.dispatcher.threads)
+        stock.disconnect()
+        assert not any(thread.is_alive() for thread in threads)
+        assert len(received) == 1
+        deliver(stock, data_message('trades', '2330', price=581))
+        assert stock.dispatcher.stats()['workers'] == 0
+        assert len(received) == 1
+
+    def test_connect_after_disconnect_restarts_workers(self, fake_ws, data_message, deliver):
+        stock = WebSocketStockClient(api_key='api-key', dispatch=DispatchConfig(workers=1))
+        received = []
+        stock.on_channel('trades', received.append)
+        stock.connect()
+        stock.disconnect()
+        stock.connect()
+        deliver(stock, data_message('trades', '2330', price=580))
+        assert stock.dispatcher.join(5)
+        assert len(received) == 1
+        stock.disconnect()
+
+    def test_listener_error_logged_without_error_listener(self, caplog, data_message, deliver):
+        stock = WebSocketStockClient(api_key='api-key', dispatch=DispatchConfig(workers=1))
+
+        def fail(message):
+            raise RuntimeError('boom')
+
+        stock.on('message', fail)
+        deliver(stock, data_message('trades', '2330', price=580))
+        assert stock.dispatcher.join(5)
+        assert [(record.name, record.levelname) for record in caplog.records] == [('fugle_marketdata.websocket.client', 'ERROR')]
+        assert 'boom' in caplog.text
@@ -1,10 +1,11 @@
-from fugle_marketdata import RestClient
+from fugle_marketdata import RestClient, ConnectionPoolConfig
 from fugle_marketdata.rest.stock import RestStockClient
 
 import pytest
 import requests
 from unittest.mock import MagicMock
 
+
 @pytest.fixture
 def api_key_client():
     return RestClient(api_key='api-key')
@@ -76,36 +77,36 @@ class TestStockRestIntradayClient:
         assert hasattr(stock.intraday, 'trades')
         assert hasattr(stock.intraday, 'volumes')
 
-    def test_intraday_tickers_api_key(self, mocker, api_key_client):
+    def test_intraday_tickers_api_key(self, mocker, api_key_client, mock_response):
         stock = api_key_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.intraday.tickers(type='INDEX')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/intraday/tickers?type=INDEX',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_intraday_tickers_bearer_token(self, bearer_client, mocker):
+    def test_intraday_tickers_bearer_token(self, bearer_client, mocker, mock_response):
         stock = bearer_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.intraday.tickers(type='INDEX')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/intraday/tickers?type=INDEX',
             headers={'Authorization': 'Bearer bearer-token'}
         )
 
-    def test_intraday_ticker_api_key(self, mocker, api_key_client):
+    def test_intraday_ticker_api_key(self, mocker, api_key_client, mock_response):
         stock = api_key_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.intraday.ticker(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/intraday/ticker/2330',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_intraday_ticker_bearer_token(self, bearer_client, mocker):
+    def test_intraday_ticker_bearer_token(self, bearer_client, mocker, mock_response):
         stock = bearer_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.intraday.ticker(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/intraday/ticker/2330',
@@ -113,63 +114,63 @@ class TestStockRestIntradayClient:
         )
 
 
-    def test_intraday_quote_api_key(self, mocker, api_key_client):
+    def test_intraday_quote_api_key(self, mocker, api_key_client, mock_response):
         stock = api_key_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.intraday.quote(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/intraday/quote/2330',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_intraday_quote_bearer_token(self, bearer_client, mocker):
+    def test_intraday_quote_bearer_token(self, bearer_client, mocker, mock_response):
         stock = bearer_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.intraday.quote(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/intraday/quote/2330',
             headers={'Authorization': 'Bearer bearer-token'}
         )
 
-    def test_intraday_trades_api_key(self, mocker, api_key_client):
+    def test_intraday_trades_api_key(self, mocker, api_key_client, mock_response):
         stock = api_key_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.intraday.trades(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/intraday/trades/2330',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_intraday_trades_bearer_token(self, bearer_client, mocker):
+    def test_intraday_trades_bearer_token(self, bearer_client, mocker, mock_response):
         stock = bearer_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.intraday.trades(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/intraday/trades/2330',
             headers={'Authorization': 'Bearer bearer-token'}
         )
 
-    def test_intraday_volumes_api_key(self, mocker, api_key_client):
+    def test_intraday_volumes_api_key(self, mocker, api_key_client, mock_response):
         stock = api_key_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.intraday.volumes(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/intraday/volumes/2330',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_intraday_volumes_bearer_token(self, bearer_client, mocker):
+    def test_intraday_volumes_bearer_token(self, bearer_client, mocker, mock_response):
         stock = bearer_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.intraday.volumes(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/intraday/volumes/2330',
             headers={'Authorization': 'Bearer bearer-token'}
         )
 
-    def test_intraday_quote_custom_base_url(self, mocker, custom_base_url_client):
+    def test_intraday_quote_custom_base_url(self, mocker, custom_base_url_client, mock_response):
         stock = custom_base_url_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.intraday.quote(symbol='2330')
         mock_get.assert_called_once_with(
             'https://custom-api.example.com/v2.0/stock/intraday/quote/2330',
@@ -182,36 +183,36 @@ class TestStockRestHistoricalClient:
         assert hasattr(stock.historical, 'candles')
         assert hasattr(stock.historical, 'stats')
 
-    def test_historical_candles_api_key(self, mocker, api_key_client):
+    def test_historical_candles_api_key(self, mocker, api_key_client, mock_response):
         stock = api_key_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.historical.candles(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/historical/candles/2330',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_historical_candles_bearer_token(self, bearer_client, mocker):
+    def test_historical_candles_bearer_token(self, bearer_client, mocker, mock_response):
         stock = bearer_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.historical.candles(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/historical/candles/2330',
             headers={'Authorization': 'Bearer bearer-token'}
         )
 
-    def test_historical_stats_api_key(self, mocker, api_key_client):
+    def test_historical_stats_api_key(self, mocker, api_key_client, mock_response):
         stock = api_key_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.historical.stats(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/historical/stats/2330',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_historical_stats_bearer_token(self, bearer_client, mocker):
+    def test_historical_stats_bearer_token(self, bearer_client, mocker, mock_response):
         stock = bearer_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.historical.stats(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/historical/stats/2330',
@@ -225,54 +226,54 @@ class TestStockRestSnapshotClient:
         assert hasattr(stock.snapshot, 'movers')
         assert hasattr(stock.snapshot, 'actives')
 
-    def test_snapshot_quotes_api_key(self, mocker, api_key_client):
+    def test_snapshot_quotes_api_key(self, mocker, api_key_client, mock_response):
         stock = api_key_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.snapshot.quotes(market='TSE')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/snapshot/quotes/TSE',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_snapshot_quotes_bearer_token(self, bearer_client, mocker):
+    def test_snapshot_quotes_bearer_token(self, bearer_client, mocker, mock_response):
         stock = bearer_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.snapshot.quotes(market='TSE')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/snapshot/quotes/TSE',
             headers={'Authorization': 'Bearer bearer-token'}
         )
 
-    def test_snapshot_movers_api_key(self, mocker, api_key_client):
+    def test_snapshot_movers_api_key(self, mocker, api_key_client, mock_response):
         stock = api_key_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.snapshot.movers(market='TSE', change='percent', direction='up')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/snapshot/movers/TSE?change=percent&direction=up',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_snapshot_movers_bearer_token(self, bearer_client, mocker):
+    def test_snapshot_movers_bearer_token(self, bearer_client, mocker, mock_response):
         stock = bearer_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.snapshot.movers(market='TSE', change='percent', direction='up')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/snapshot/movers/TSE?change=percent&direction=up',
             headers={'Authorization': 'Bearer bearer-token'}
         )
 
-    def test_snapshot_actives_api_key(self, mocker, api_key_client):
+    def test_snapshot_actives_api_key(self, mocker, api_key_client, mock_response):
         stock = api_key_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.snapshot.actives(market='TSE', trade='volume')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/snapshot/actives/TSE?trade=volume',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_snapshot_actives_bearer_token(self, bearer_client, mocker):
+    def test_snapshot_actives_bearer_token(self, bearer_client, mocker, mock_response):
         stock = bearer_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.snapshot.actives(market='TSE', trade='volume')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/snapshot/actives/TSE?trade=volume',
@@ -290,63 +291,63 @@ class TestFutOptRestIntradayClient:
         assert hasattr(futopt.intraday, 'trades')
         assert hasattr(futopt.intraday, 'volumes')
 
-    def test_intraday_products_api_key(self, mocker, api_key_client):
+    def test_intraday_products_api_key(self, mocker, api_key_client, mock_response):
         futopt = api_key_client.futopt
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         futopt.intraday.products(type='OPTION')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/futopt/intraday/products?type=OPTION',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_intraday_tickers_api_key(self, mocker, api_key_client):
+    def test_intraday_tickers_api_key(self, mocker, api_key_client, mock_response):
         futopt = api_key_client.futopt
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         futopt.intraday.tickers(type='OPTION')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/futopt/intraday/tickers?type=OPTION',
             headers={'X-API-KEY': 'api-key'}
         )
     
-    def test_intraday_ticker_api_key(self, mocker, api_key_client):
+    def test_intraday_ticker_api_key(self, mocker, api_key_client, mock_response):
         futopt = api_key_client.futopt
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         futopt.intraday.ticker(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/futopt/intraday/ticker/2330',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_intraday_quote_api_key(self, mocker, api_key_client):
+    def test_intraday_quote_api_key(self, mocker, api_key_client, mock_response):
         futopt = api_key_client.futopt
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         futopt.intraday.quote(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/futopt/intraday/quote/2330',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_intraday_candles_api_key(self, mocker, api_key_client):
+    def test_intraday_candles_api_key(self, mocker, api_key_client, mock_response):
         futopt = api_key_client.futopt
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         futopt.intraday.candles(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/futopt/intraday/candles/2330',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_intraday_trades_api_key(self, mocker, api_key_client):
+    def test_intraday_trades_api_key(self, mocker, api_key_client, mock_response):
         futopt = api_key_client.futopt
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         futopt.intraday.trades(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/futopt/intraday/trades/2330',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_intraday_volumes_api_key(self, mocker, api_key_client):
+    def test_intraday_volumes_api_key(self, mocker, api_key_client, mock_response):
         futopt = api_key_client.futopt
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         futopt.intraday.volumes(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/futopt/intraday/volumes/2330',
@@ -359,36 +360,36 @@ class TestFutOptRestHistoricalClient:
         assert hasattr(futopt.historical, 'candles')
         assert hasattr(futopt.historical, 'daily')
 
-    def test_historical_candles_api_key(self, mocker, api_key_client):
+    def test_historical_candles_api_key(self, mocker, api_key_client, mock_response):
         futopt = api_key_client.futopt
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         futopt.historical.candles(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/futopt/historical/candles/2330',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_historical_candles_bearer_token(self, bearer_client, mocker):
+    def test_historical_candles_bearer_token(self, bearer_client, mocker, mock_response):
         futopt = bearer_client.futopt
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         futopt.historical.candles(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/futopt/historical/candles/2330',
             headers={'Authorization': 'Bearer bearer-token'}
         )
 
-    def test_historical_daily_api_key(self, mocker, api_key_client):
+    def test_historical_daily_api_key(self, mocker, api_key_client, mock_response):
         futopt = api_key_client.futopt
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         futopt.historical.daily(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/futopt/historical/daily/2330',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_historical_daily_bearer_token(self, bearer_client, mocker):
+    def test_historical_daily_bearer_token(self, bearer_client, mocker, mock_response):
         futopt = bearer_client.futopt
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         futopt.historical.daily(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/futopt/historical/daily/2330',
@@ -405,90 +406,90 @@ class TestStockRestTechnicalClient:
         assert hasattr(stock.technical, 'macd')
         assert hasattr(stock.technical, 'bb')
 
-    def test_technical_sma_api_key(self, mocker, api_key_client):
+    def test_technical_sma_api_key(self, mocker, api_key_client, mock_response):
         stock = api_key_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.technical.sma(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/technical/sma/2330',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_technical_sma_bearer_token(self, mocker, bearer_client):
+    def test_technical_sma_bearer_token(self, mocker, bearer_client, mock_response):
         stock = bearer_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.technical.sma(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/technical/sma/2330',
             headers={'Authorization': 'Bearer bearer-token'}
         )
 
-    def test_technical_rsi_api_key(self, mocker, api_key_client):
+    def test_technical_rsi_api_key(self, mocker, api_key_client, mock_response):
         stock = api_key_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.technical.rsi(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/technical/rsi/2330',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_technical_rsi_bearer_token(self, mocker, bearer_client):
+    def test_technical_rsi_bearer_token(self, mocker, bearer_client, mock_response):
         stock = bearer_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.technical.rsi(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/technical/rsi/2330',
             headers={'Authorization': 'Bearer bearer-token'}
         )
 
-    def test_technical_kdj_api_key(self, mocker, api_key_client):
+    def test_technical_kdj_api_key(self, mocker, api_key_client, mock_response):
         stock = api_key_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.technical.kdj(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/technical/kdj/2330',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_technical_kdj_bearer_token(self, mocker, bearer_client):
+    def test_technical_kdj_bearer_token(self, mocker, bearer_client, mock_response):
         stock = bearer_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.technical.kdj(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/technical/kdj/2330',
             headers={'Authorization': 'Bearer bearer-token'}
         )
 
-    def test_technical_macd_api_key(self, mocker, api_key_client):
+    def test_technical_macd_api_key(self, mocker, api_key_client, mock_response):
         stock = api_key_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.technical.macd(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/technical/macd/2330',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_technical_macd_bearer_token(self, mocker, bearer_client):
+    def test_technical_macd_bearer_token(self, mocker, bearer_client, mock_response):
         stock = bearer_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.technical.macd(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/technical/macd/2330',
             headers={'Authorization': 'Bearer bearer-token'}
         )
 
-    def test_technical_bb_api_key(self, mocker, api_key_client):
+    def test_technical_bb_api_key(self, mocker, api_key_client, mock_response):
         stock = api_key_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.technical.bb(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/technical/bb/2330',
             headers={'X-API-KEY': 'api-key'}
         )
 
-    def test_technical_bb_bearer_token(self, mocker, bearer_client):
+    def test_technical_bb_bearer_token(self, mocker, bearer_client, mock_response):
         stock = bearer_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         stock.technical.bb(symbol='2330')
         mock_get.assert_called_once_with(
             'https://api.fugle.tw/marketdata/v1.0/stock/technical/bb/2330',
@@ -552,10 +553,10 @@ class TestRestClientRegressionTests:
         assert stock.config['bearer_token'] == 'bearer-token'
         assert 'api_key' not in stock.config
 
-    def test_existing_api_endpoints_still_work(self, mocker, api_key_client):
+    def test_existing_api_endpoints_still_work(self, mocker, api_key_client, mock_response):
         # 回歸測試：確保現有的 API 端點仍然正常工作
         stock = api_key_client.stock
-        mock_get = mocker.patch('requests.get')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
         
         # 測試幾個主要的 API 端點
         stock.intraday.quote(symbol='2330')
@@ -596,3 +597,110 @@ class TestRestClientUrlNormalization:
         assert stock.config['base_url'] == 'https://api.example.com/api/v2/stock'
         futopt = client.futopt
         assert futopt.config['base_url'] == 'https://api.example.com/api/v2/futopt'
+
+
+class TestRestClientConnectionPool:
+    def test_resources_share_session(self, api_key_client):
+        # 測試 stock / futopt 的所有資源共用同一個 session
+        session = api_key_client.session
+        assert api_key_client.stock.intraday.session is session
+        assert api_key_client.stock.historical.session is session
+        assert api_key_client.futopt.intraday.session is session
+
+    def test_connection_pool_config(self):
+        # 測試連線池設定是否套用至 adapter
+        config = ConnectionPoolConfig(pool_connections=4, pool_maxsize=32, timeout=3.5)
+        client = RestClient(api_key='api-key', connection_pool=config)
+        adapter = client.session.get_adapter('https://api.fugle.tw')
+        assert adapter._pool_connections == 4
+        assert adapter._pool_maxsize == 32
+        assert adapter.timeout == 3.5
+
+    def test_keep_alive_disabled(self):
+        client = RestClient(api_key='api-key', connection_pool=ConnectionPoolConfig(keep_alive=False))
+        assert client.session.headers['Connection'] == 'close'
+
+    def test_default_timeout_applied(self, mocker):
+        config = ConnectionPoolConfig(timeout=2)
+        client = RestClient(api_key='api-key', connection_pool=config)
+        mock_send = mocker.patch('requests.adapters.HTTPAdapter.send')
+        adapter = client.session.get_adapter('https://api.fugle.tw')
+        adapter.send(MagicMock())
+        assert mock_send.call_args[1]['timeout'] == 2
+
+    def test_close(self, api_key_client):
+        session = api_key_client.session
+        stock = api_key_client.stock
+        api_key_client.close()
+        assert api_key_client.session is not session
+        assert api_key_client.stock is not stock
+
+    def test_context_manager(self, mocker):
+        mock_close = mocker.patch('requests.Session.close')
+        with RestClient(api_key='api-key') as client:
+            client.stock
+        mock_close.assert_called_once()
+
+
+class TestRestClientBatch:
+    def test_quote_many_ordered(self, mocker, api_key_client, mock_response):
+        # 測試批次請求依輸入順序回傳結果
+        def fake_get(url, headers):
+            return mock_response({'symbol': url.rsplit('/', 1)[-1]})
+
+        mocker.patch('requests.Session.get', side_effect=fake_get)
+        symbols = ['2330', '2317', '2454', '0050']
+        results = api_key_client.stock.intraday.quote_many(symbols=symbols, concurrency=3)
+        assert [r.symbol for r in results] == symbols
+        assert [r.data['symbol'] for r in results] == symbols
+        assert all(r.ok for r in results)
+
+    def test_candles_many_passes_params(self, mocker, api_key_client, mock_response):
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response())
+        api_key_client.stock.historical.candles_many(symbols=['2330'], timeframe='D')
+        mock_get.assert_called_once_with(
+            'https://api.fugle.tw/marketdata/v1.0/stock/historical/candles/2330?timeframe=D',
+            headers={'X-API-KEY': 'api-key'}
+        )
+
+    def test_per_symbol_error_capture(self, mocker, api_key_client, mock_response):
+        def fake_get(url, headers):
+            if url.endswith('/INVALID'):
+                return mock_response({'message': 'Resource Not Found'}, status_code=404)
+            return mock_response({'ok': True})
+
+        mocker.patch('requests.Session.get', side_effect=fake_get)
+        results = api_key_client.stock.technical.sma_many(symbols=['2330', 'INVALID'])
+        assert results[0].ok
+        assert not results[1].ok
+        assert results[1].error.status_code == 404
+        assert results[1].error.message == 'Resource Not Found'
+
+    def test_stream(self, mocker, api_key_client, mock_response):
+        mocker.patch('requests.Session.get', return_value=mock_response({'ok': True}))
+        stream = api_key_client.futopt.intraday.quote_many(symbols=['TXFA4', 'MXFA4'], stream=True)
+        assert sorted(r.symbol for r in stream) == ['MXFA4', 'TXFA4']
+
+    def test_invalid_concurrency(self, api_key_client):
+        with pytest.raises(ValueError):
+            api_key_client.stock.intraday.quote_many(symbols=['2330'], concurrency=0)
+
+
+class TestRestClientResourceCaching:
+    def test_stock_resources_memoized(self, api_key_client):
+        stock = api_key_client.stock
+        assert stock.intraday is stock.intraday
+        assert stock.historical is stock.historical
+        assert stock.snapshot is stock.snapshot
+        assert stock.technical is stock.technical
+        assert stock.corporate_actions is stock.corporate_actions
+
+    def test_futopt_resources_memoized(self, api_key_client):
+        futopt = api_key_client.futopt
+        assert futopt.intraday is futopt.intraday
+        assert futopt.historical is futopt.historical
+
+    def test_precomputed_headers(self, api_key_client, bearer_client):
+        assert api_key_client.stock.intraday.headers == {'X-API-KEY': 'api-key'}
+        assert bearer_client.futopt.historical.headers == {'Authorization': 'Bearer bearer-token'}
+        assert api_key_client.stock.intraday.base_url == 'https://api.fugle.tw/marketdata/v1.0/stock'
@@ -0,0 +1,241 @@
+import glob
+import json
+import math
+import os
+import pytest
+from unittest.mock import MagicMock
+
+np = pytest.importorskip('numpy')
+
+from fugle_marketdata.exceptions import FugleAPIError
+from fugle_marketdata.indicators import LocalTechnical, functions
+from fugle_marketdata.indicators.engine import warmup_days
+from fugle_marketdata.rest.columnar import Columns, records_to_columns
+from fugle_marketdata.store import CandleStore
+
+# 已公開的指標計算結果: {"source", "indicator", "params", "tolerance"?, "candles": [...], "response": {...}}
+# response 與 technical/* 的回傳格式相同，可直接放入以 API 錄製的回應
+FIXTURES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'fixtures', 'technical', '*.json')))
+
+
+# 逐筆計算的參考實作，用於驗證向量化結果
+
+def ref_sma(close, period):
+    return [None if i < period - 1 else sum(close[i - period + 1:i + 1]) / period for i in range(len(close))]
+
+
+def ref_ema(values, period, offset=0):
+    out = [None] * len(values)
+    start = offset + period - 1
+    if start >= len(values):
+        return out
+    out[start] = sum(values[offset:start + 1]) / period
+    alpha = 2 / (period + 1)
+    for i in range(start + 1, len(values)):
+        out[i] = alpha * values[i] + (1 - alpha) * out[i - 1]
+    return out
+
+
+def ref_rsi(close, period):
+    out = [None] * len(close)
+    changes = [close[i] - close[i - 1] for i in range(1, len(close))]
+    if len(changes) < period:
+        return out
+    gain = sum(max(c, 0) for c in changes[:period]) / period
+    loss = sum(max(-c, 0) for c in changes[:period]) / period
+    out[period] = 100 * gain / (gain + loss)
+    for i in range(period, len(changes)):
+        gain = (gain * (period - 1) + max(changes[i], 0)) / period
+        loss = (loss * (period - 1) + max(-changes[i], 0)) / period
+        out[i + 1] = 100 * gain / (gain + loss)
+    return out
+
+
+def ref_kdj(high, low, close, r, k_period, d_period):
+    k_out, d_out = [None] * len(close), [None] * len(close)
+    k, d = 50.0, 50.0
+    for i in range(r - 1, len(close)):
+        highest, lowest = max(high[i - r + 1:i + 1]), min(low[i - r + 1:i + 1])
+        rsv = (close[i] - lowest) / (highest - lowest) * 100
+        k = (k_period - 1) / k_period * k + rsv / k_period
+        d = (d_period - 1) / d_period * d + k / d_period
+        k_out[i], d_out[i] = k, d
+    return k_out, d_out
+
+
+def ref_bb(close, period, std_dev):
+    middle = ref_sma(close, period)
+    upper, lower = [None] * len(close), [None] * len(close)
+    for i in range(period - 1, len(close)):
+        window = close[i - period + 1:i + 1]
+        sd = math.sqrt(sum((x - middle[i]) ** 2 for x in window) / period)
+        upper[i], lower[i] = middle[i] + std_dev * sd, middle[i] - std_dev * sd
+    return upper, middle, lower
+
+
+def assert_matches(actual, expected):
+    assert len(actual) == len(expected)
+    for a, e in zip(actual, expected):
+        if e is None:
+            assert np.isnan(a)
+        else:
+            assert a == pytest.approx(e, rel=1e-9, abs=1e-9)
+
+
+class TestFunctions:
+    @pytest.fixture(autouse=True)
+    def prices(self, random_walk):
+        self.high, self.low, self.close = random_walk(300)
+
+    def test_sma(self):
+        assert_matches(functions.sma(self.close, 20), ref_sma(self.close, 20))
+
+    def test_ema(self):
+        assert_matches(functions.ema(self.close, 12), ref_ema(self.close, 12))
+
+    def test_rsi(self):
+        assert_matches(functions.rsi(self.close, 14), ref_rsi(self.close, 14))
+
+    def test_kdj(self):
+        result = functions.kdj(self.high, self.low, self.close, 9, 3, 3)
+        k, d = ref_kdj(self.high, self.low, self.close, 9, 3, 3)
+        assert_matches(result['k'], k)
+        assert_matches(result['d'], d)
+        assert_matches(result['j'], [None if a is None else 3 * a - 2 * b for a, b in zip(k, d)])
+
+    def test_macd(self):
+        result = functions.macd(self.close, 12, 26, 9)
+        fast, slow = ref_ema(self.close, 12), ref_ema(self.close, 26)
+        line = [None if s is None else f - s for f, s in zip(fast, slow)]
+        assert_matches(result['macdLine'], line)
+        signal = ref_ema([0.0 if v is None else v for v in line], 9, offset=25)
+        assert_matches(result['signalLine'], signal)
+
+    def test_bb(self):
+        result = functions.bb(self.close, 20, 2)
+        upper, middle, lower = ref_bb(self.close, 20, 2)
+        assert_matches(result['upper'], upper)
+        assert_matches(result['middle'], middle)
+        assert_matches(result['lower'], lower)
+
+    def test_two_dimensional_matches_rows(self, random_walk):
+        series = [random_walk(120, seed=i)[2] for i in range(5)]
+        batched = functions.macd(np.array(series))
+        for row, close in enumerate(series):
+            single = functions.macd(close)
+            np.testing.assert_allclose(batched['signalLine'][row], single['signalLine'], equal_nan=True)
+
+    def test_short_input_is_nan(self):
+        assert np.isnan(functions.sma([1.0, 2.0], 5)).all()
+        assert np.isnan(functions.rsi([1.0, 2.0], 5)).all()
+        assert np.isnan(functions.kdj([1.0], [1.0], [1.0])['k']).all()
+
+    def test_invalid_period(self):
+        with pytest.raises(ValueError):
+            functions.sma([1.0], 0)
+
+
+@pytest.fixture
+def candle_response(random_walk):
+    def create(symbol, length, seed=0):
+        high, low, close = random_walk(length, seed)
+        dates = np.datetime_as_string(np.datetime64('2023-01-02') + np.arange(length), unit='D').tolist()
+        records = [
+            {'date': d, 'open': c, 'high': h, 'low': l, 'close': c, 'volume': 1000}
+            for d, h, l, c in zip(dates, high, low, close)
+        ]
+        return records
+
+    return create
+
+
+def fake_historical(records_by_symbol):
+    historical = MagicMock()
+
+    def candles(**params):
+        records = records_by_symbol[params['symbol']]
+        if records is None:
+            raise FugleAPIError('Not Found', status_code=404)
+        start = params.get('from')
+        records = [r for r in records if start is None or r['date'] >= start]
+        return Columns(records_to_columns(records), {'symbol': params['symbol']})
+
+    historical.candles.side_effect = candles
+    return historical
+
+
+class TestLocalTechnical:
+    def test_requires_source(self):
+        with pytest.raises(ValueError):
+            LocalTechnical()
+
+    def test_response_shape_matches_api(self, candle_response):
+        records = candle_response('2330', 200)
+        historical = fake_historical({'2330': records})
+        technical = LocalTechnical(historical=historical)
+        result = technical.sma(symbol='2330', timeframe='D', period=5, **{'from': '2023-06-01', 'to': '2023-07-19'})
+
+        assert {k: v for k, v in result.items() if k != 'data'} == {
+            'symbol': '2330', 'from': '2023-06-01', 'to': '2023-07-19', 'timeframe': 'D', 'period': 5,
+        }
+        assert result['data'][0]['date'] == '2023-06-01'
+        assert set(result['data'][0]) == {'date', 'sma'}
+        closes = [r['close'] for r in records]
+        index = [r['date'] for r in records].index('2023-06-01')
+        assert result['data'][0]['sma'] == pytest.approx(sum(closes[index - 4:index + 1]) / 5)
+
+        params = historical.candles.call_args[1]
+        assert params['from'] < '2023-06-01'
+        assert params['format'] == 'columnar'
+
+    def test_unknown_param(self, candle_response):
+        technical = LocalTechnical(historical=fake_historical({'2330': candle_response('2330', 50)}))
+        with pytest.raises(ValueError):
+            technical.sma(symbol='2330', fast=3)
+
+    @pytest.mark.parametrize('name, fields', [
+        ('sma', {'sma'}), ('rsi', {'rsi'}), ('kdj', {'k', 'd', 'j'}),
+        ('macd', {'macdLine', 'signalLine'}), ('bb', {'upper', 'middle', 'lower'}),
+    ])
+    def test_many_matches_single(self, name, fields, candle_response):
+        records = {'2330': candle_response('2330', 300, 1), '2317': candle_response('2317', 300, 2),
+                   '6669': candle_response('6669', 150, 3), '9999': None}
+        technical = LocalTechnical(historical=fake_historical(records))
+        results = getattr(technical, f'{name}_many')(symbols=['2330', '2317', '6669', '9999'], timeframe='D')
+
+        assert [r.symbol for r in results] == ['2330', '2317', '6669', '9999']
+        assert not results[3].ok
+        for result in results[:3]:
+            single = getattr(technical, name)(symbol=result.symbol, timeframe='D')
+            assert result.data == single
+            assert set(result.data['data'][0]) == {'date'} | fields
+
+    def test_from_store(self, tmp_path, candle_response):
+        records = candle_response('2330', 100)
+        store = CandleStore(MagicMock(), str(tmp_path))
+        store.write('2330', records, records[0]['date'], records[-1]['date'])
+        technical = LocalTechnical(store=store)
+        result = technical.bb(symbol='2330', period=10, **{'from': '2023-02-01', 'to': '2023-03-01'})
+        assert result['data'][0]['date'] == '2023-02-01'
+        assert result['data'][-1]['date'] == '2023-03-01'
+        assert technical.bb_many(symbols=['0000'])[0].error is not None
+
+    def test_warmup_days(self):
+        assert warmup_days(20, 'D') == 38
+        assert warmup_days(4, 'W') == 35
+        assert warmup_days(270, '5') == warmup_days(5, 'D')
+
+
+@pytest.mark.parametrize('path', FIXTURES, ids=os.path.basename)
+def test_parity_with_published_values(path):
+    with open(path) as f:
+        fixture = json.load(f)
+    symbol = fixture['response']['symbol']
+    technical = LocalTechnical(historical=fake_historical({symbol: fixture['candles']}))
+    result = getattr(technical, fixture['indicator'])(symbol=symbol, **fixture['params'])
+    expected = fixture['response']['data']
+    assert [row['date'] for row in result['data']] == [row['date'] for row in expected]
+    for row, expected_row in zip(result['data'], expected):
+        for field, value in expected_row.items():
+            if field != 'date':
+                assert row[field] == pytest.approx(value, abs=fixture.get('tolerance', 0.01))
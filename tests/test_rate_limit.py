@@ -0,0 +1,112 @@
+import asyncio
+import pytest
+from fugle_marketdata import RestClient, RateLimitConfig
+from fugle_marketdata.rest.rate_limit import RateLimiter, parse_retry_after
+
+
+class TestRateLimitConfig:
+    def test_defaults(self):
+        config = RateLimitConfig(rate=10)
+        assert config.burst == 10
+        assert config.min_rate == 1
+        assert config.increase_step == 0.5
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            RateLimitConfig(rate=0)
+
+
+class TestRateLimiter:
+    def test_burst_then_paced(self, clock):
+        limiter = RateLimiter(RateLimitConfig(rate=10, burst=3), clock=clock)
+        assert [limiter.reserve() for _ in range(3)] == [0, 0, 0]
+        # 第 4、5 個請求需等待補充 token
+        assert limiter.reserve() == pytest.approx(0.1)
+        assert limiter.reserve() == pytest.approx(0.2)
+
+    def test_refill(self, clock):
+        limiter = RateLimiter(RateLimitConfig(rate=10, burst=2), clock=clock)
+        limiter.reserve()
+        limiter.reserve()
+        clock.now = 0.2
+        assert limiter.reserve() == 0
+
+    def test_429_decreases_rate(self, clock):
+        limiter = RateLimiter(RateLimitConfig(rate=10), clock=clock)
+        limiter.on_response(429, {})
+        assert limiter.rate == 5
+        assert limiter.throttled == 1
+        limiter.on_response(429, {})
+        limiter.on_response(429, {})
+        limiter.on_response(429, {})
+        assert limiter.rate == 1
+
+    def test_success_recovers_rate(self, clock):
+        limiter = RateLimiter(RateLimitConfig(rate=10, increase_step=2), clock=clock)
+        limiter.on_response(429, {})
+        limiter.on_response(200, {})
+        assert limiter.rate == 7
+        limiter.on_response(200, {})
+        limiter.on_response(200, {})
+        assert limiter.rate == 10
+
+    def test_non_adaptive(self, clock):
+        limiter = RateLimiter(RateLimitConfig(rate=10, adaptive=False), clock=clock)
+        limiter.on_response(429, {})
+        assert limiter.rate == 10
+
+    def test_retry_after_blocks(self, clock):
+        limiter = RateLimiter(RateLimitConfig(rate=100, burst=100), clock=clock)
+        limiter.on_response(429, {'Retry-After': '2'})
+        assert limiter.reserve() == pytest.approx(2)
+        clock.now = 2.5
+        assert limiter.reserve() == 0
+
+    def test_acquire_async(self, mocker, clock):
+        limiter = RateLimiter(RateLimitConfig(rate=10, burst=1), clock=clock)
+        mock_sleep = mocker.patch('asyncio.sleep')
+
+        async def run():
+            await limiter.acquire_async()
+            await limiter.acquire_async()
+
+        asyncio.run(run())
+        mock_sleep.assert_called_once_with(pytest.approx(0.1))
+
+
+class TestParseRetryAfter:
+    def test_seconds(self):
+        assert parse_retry_after('3') == 3
+
+    def test_http_date_in_past(self):
+        assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+
+    def test_invalid(self):
+        assert parse_retry_after('soon') is None
+        assert parse_retry_after(None) is None
+
+
+class TestRestClientRateLimit:
+    def test_limiter_shared_across_resources(self, mocker):
+        client = RestClient(api_key='api-key', rate_limit=RateLimitConfig(rate=5))
+        mock_acquire = mocker.patch.object(client.rate_limiter, 'acquire')
+        response = mocker.MagicMock(status_code=200, content=b'{}')
+        mocker.patch('requests.Session.get', return_value=response)
+        client.stock.intraday.quote(symbol='2330')
+        client.futopt.intraday.quote(symbol='TXFA4')
+        assert mock_acquire.call_count == 2
+        assert client.stock.intraday.config['rate_limiter'] is client.futopt.historical.config['rate_limiter']
+
+    def test_429_feeds_limiter(self, mocker):
+        client = RestClient(api_key='api-key', rate_limit=RateLimitConfig(rate=5))
+        response = mocker.MagicMock(status_code=429, headers={'Retry-After': '1'})
+        response.content = b'{"message": "Rate limit exceeded"}'
+        mocker.patch('requests.Session.get', return_value=response)
+        with pytest.raises(Exception):
+            client.stock.intraday.quote(symbol='2330')
+        assert client.rate_limiter.throttled == 1
+        assert client.rate_limiter.rate == 2.5
+
+    def test_without_rate_limit(self):
+        client = RestClient(api_key='api-key')
+        assert client.rate_limiter is None
@@ -0,0 +1,114 @@
+import asyncio
+import pytest
+import requests
+from unittest.mock import AsyncMock
+from fugle_marketdata import RestClient, RetryConfig, FugleAPIError
+from fugle_marketdata.rest.retry import RetryState
+
+
+class TestRetryConfig:
+    def test_backoff_without_jitter(self):
+        config = RetryConfig(backoff_base=1, backoff_multiplier=2, backoff_max=5, jitter=0)
+        assert [config.backoff(n) for n in range(1, 5)] == [1, 2, 4, 5]
+
+    def test_backoff_with_full_jitter(self):
+        config = RetryConfig(backoff_base=1, jitter=1)
+        assert all(0 <= config.backoff(3) <= 4 for _ in range(100))
+
+    def test_invalid_options(self):
+        with pytest.raises(ValueError):
+            RetryConfig(max_attempts=0)
+        with pytest.raises(ValueError):
+            RetryConfig(jitter=2)
+
+
+class TestRetryState:
+    def test_no_config_never_retries(self):
+        state = RetryState(None, 'url', (ConnectionError,))
+        state.begin()
+        assert state.next_delay(error=ConnectionError()) is None
+
+    def test_retry_after_extends_delay(self, mock_response):
+        state = RetryState(RetryConfig(jitter=0), 'url', ())
+        state.begin()
+        assert state.next_delay(response=mock_response(status_code=429, headers={'Retry-After': '7'})) == 7
+
+    def test_non_retryable_status(self, mock_response):
+        state = RetryState(RetryConfig(), 'url', ())
+        state.begin()
+        assert state.next_delay(response=mock_response(status_code=404)) is None
+
+    def test_deadline(self, mock_response):
+        state = RetryState(RetryConfig(backoff_base=10, jitter=0, deadline=5), 'url', ())
+        state.begin()
+        assert state.next_delay(response=mock_response(status_code=503)) is None
+
+
+class TestRestClientRetry:
+    def test_retries_5xx_until_success(self, mocker, mock_response):
+        events = []
+        client = RestClient(api_key='api-key', retry=RetryConfig(max_attempts=3, hook=events.append))
+        mock_sleep = mocker.patch('time.sleep')
+        mock_get = mocker.patch('requests.Session.get', side_effect=[
+            mock_response(status_code=502),
+            mock_response(status_code=503),
+            mock_response({'symbol': '2330'}),
+        ])
+        assert client.stock.intraday.quote(symbol='2330') == {'symbol': '2330'}
+        assert mock_get.call_count == 3
+        assert mock_sleep.call_count == 2
+        assert [(e.attempt, e.status_code, e.will_retry) for e in events] == [
+            (1, 502, True), (2, 503, True), (3, 200, False)
+        ]
+
+    def test_gives_up_after_max_attempts(self, mocker, mock_response):
+        client = RestClient(api_key='api-key', retry=RetryConfig(max_attempts=2))
+        mocker.patch('time.sleep')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response({'message': 'Bad Gateway'}, status_code=502))
+        with pytest.raises(FugleAPIError) as exc_info:
+            client.stock.intraday.quote(symbol='2330')
+        assert exc_info.value.status_code == 502
+        assert mock_get.call_count == 2
+
+    def test_retries_connection_error(self, mocker, mock_response):
+        client = RestClient(api_key='api-key', retry=RetryConfig())
+        mocker.patch('time.sleep')
+        mocker.patch('requests.Session.get', side_effect=[requests.exceptions.ConnectionError('reset'), mock_response([])])
+        assert client.stock.intraday.quote(symbol='2330') == []
+
+    def test_does_not_retry_other_exceptions(self, mocker):
+        client = RestClient(api_key='api-key', retry=RetryConfig())
+        mock_get = mocker.patch('requests.Session.get', side_effect=requests.exceptions.InvalidURL('bad'))
+        with pytest.raises(FugleAPIError):
+            client.stock.intraday.quote(symbol='2330')
+        assert mock_get.call_count == 1
+
+    def test_custom_retry_exceptions(self, mocker, mock_response):
+        client = RestClient(api_key='api-key', retry=RetryConfig(retry_exceptions=(requests.exceptions.InvalidURL,)))
+        mocker.patch('time.sleep')
+        mock_get = mocker.patch('requests.Session.get', side_effect=[requests.exceptions.InvalidURL('bad'), mock_response()])
+        client.stock.intraday.quote(symbol='2330')
+        assert mock_get.call_count == 2
+
+    def test_without_retry_config(self, mocker, mock_response):
+        client = RestClient(api_key='api-key')
+        mock_get = mocker.patch('requests.Session.get', return_value=mock_response(status_code=503))
+        with pytest.raises(FugleAPIError):
+            client.stock.intraday.quote(symbol='2330')
+        assert mock_get.call_count == 1
+
+
+class TestAsyncRestClientRetry:
+    def test_retries_5xx(self, mocker):
+        pytest.importorskip('aiohttp')
+        from fugle_marketdata import AsyncRestClient
+        from fugle_marketdata.rest.aio.transport import AsyncResponse, AsyncTransport
+
+        client = AsyncRestClient(api_key='api-key', retry=RetryConfig(max_attempts=2))
+        mocker.patch('asyncio.sleep', AsyncMock())
+        mock_get = mocker.patch.object(AsyncTransport, 'get', AsyncMock(side_effect=[
+            AsyncResponse(500, {}, b'{}'),
+            AsyncResponse(200, {}, b'{"ok": true}'),
+        ]))
+        assert asyncio.run(client.stock.intraday.quote(symbol='2330')) == {'ok': True}
+        assert mock_get.await_count == 2
@@ -0,0 +1,190 @@
+import asyncio
+import threading
+import time
+import pytest
+from fugle_marketdata import RestClient, AsyncRestClient, FugleAPIError
+from fugle_marketdata.rest.singleflight import SingleFlight
+
+
+def run_concurrently(fn, count):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = fn()
+        except Exception as error:
+            results[i] = error
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_result(self):
+        flight = SingleFlight()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return {'value': 1}
+
+        results = run_concurrently(lambda: flight.do('key', slow), 8)
+        assert len(calls) == 1
+        assert all(result == {'value': 1} for result in results)
+        assert flight.coalesced == 7
+        assert flight.calls == {}
+
+    def test_error_shared_and_not_cached(self):
+        flight = SingleFlight()
+        calls = []
+
+        def fail():
+            calls.append(1)
+            time.sleep(0.1)
+            raise ValueError('boom')
+
+        results = run_concurrently(lambda: flight.do('key', fail), 4)
+        assert len(calls) == 1
+        assert all(isinstance(result, ValueError) for result in results)
+        # 失敗後不保留結果，下一次呼叫重新執行
+        assert flight.do('key', lambda: 'ok') == 'ok'
+
+    def test_sequential_calls_not_coalesced(self):
+        flight = SingleFlight()
+        assert flight.do('key', lambda: 1) == 1
+        assert flight.do('key', lambda: 2) == 2
+        assert flight.coalesced == 0
+
+    def test_key_ignores_param_order(self):
+        assert SingleFlight.key_for('u', '/a', {'x': 1, 'y': 2}) == SingleFlight.key_for('u', 'a', {'y': 2, 'x': 1})
+
+    def test_async_calls_share_result(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'ok'
+
+        async def run():
+            return await asyncio.gather(*[flight.do_async('key', slow) for _ in range(5)])
+
+        assert asyncio.run(run()) == ['ok'] * 5
+        assert len(calls) == 1
+        assert flight.async_calls == {}
+
+    def test_cancelled_leader_does_not_cancel_followers(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'ok'
+
+        async def run():
+            leader = asyncio.ensure_future(flight.do_async('key', slow))
+            await asyncio.sleep(0)
+            followers = [asyncio.ensure_future(flight.do_async('key', slow)) for _ in range(3)]
+            await asyncio.sleep(0)
+            leader.cancel()
+            results = await asyncio.gather(*followers)
+            return leader.cancelled(), results
+
+        cancelled, results = asyncio.run(run())
+        assert cancelled
+        assert results == ['ok'] * 3
+        assert len(calls) == 1
+        assert flight.async_calls == {}
+
+    def test_async_error_shared(self):
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError('boom')
+
+        async def run():
+            return await asyncio.gather(*[flight.do_async('key', fail) for _ in range(3)], return_exceptions=True)
+
+        assert [str(error) for error in asyncio.run(run())] == ['boom'] * 3
+        assert flight.async_calls == {}
+
+
+class TestRestClientCoalesce:
+    def test_disabled_by_default(self):
+        client = RestClient(api_key='test-api-key')
+        assert client.single_flight is None
+        assert client.stock.intraday.single_flight is None
+
+    def test_identical_requests_coalesced(self, mocker, mock_response):
+        client = RestClient(api_key='test-api-key', coalesce=True)
+
+        def slow_get(url, headers=None):
+            time.sleep(0.1)
+            return mock_response({'symbol': '2330'})
+
+        get = mocker.patch('requests.Session.get', side_effect=slow_get)
+        results = run_concurrently(lambda: client.stock.intraday.quote(symbol='2330'), 6)
+        assert get.call_count == 1
+        assert all(result == {'symbol': '2330'} for result in results)
+
+    def test_different_params_not_coalesced(self, mocker, mock_response):
+        client = RestClient(api_key='test-api-key', coalesce=True)
+
+        def slow_get(url, headers=None):
+            time.sleep(0.05)
+            return mock_response({})
+
+        get = mocker.patch('requests.Session.get', side_effect=slow_get)
+        symbols = iter(['2330', '2317'])
+        lock = threading.Lock()
+
+        def call():
+            with lock:
+                symbol = next(symbols)
+            return client.stock.intraday.quote(symbol=symbol)
+
+        run_concurrently(call, 2)
+        assert get.call_count == 2
+
+    def test_error_propagates_to_all_callers(self, mocker, mock_response):
+        client = RestClient(api_key='test-api-key', coalesce=True)
+
+        def slow_get(url, headers=None):
+            time.sleep(0.1)
+            return mock_response({'message': 'Not Found'}, status_code=404)
+
+        get = mocker.patch('requests.Session.get', side_effect=slow_get)
+        results = run_concurrently(lambda: client.stock.intraday.quote(symbol='9999'), 4)
+        assert get.call_count == 1
+        assert all(isinstance(result, FugleAPIError) for result in results)
+
+
+class TestAsyncRestClientCoalesce:
+    def test_identical_requests_coalesced(self, mocker):
+        pytest.importorskip('aiohttp')
+        from fugle_marketdata.rest.aio.transport import AsyncResponse, AsyncTransport
+        calls = []
+
+        async def fake_get(self, url, headers=None):
+            calls.append(url)
+            await asyncio.sleep(0.05)
+            return AsyncResponse(200, {}, b'{"symbol": "2330"}')
+
+        mocker.patch.object(AsyncTransport, 'get', fake_get)
+        client = AsyncRestClient(api_key='test-api-key', coalesce=True)
+
+        async def run():
+            return await asyncio.gather(*[client.stock.intraday.quote(symbol='2330') for _ in range(5)])
+
+        assert asyncio.run(run()) == [{'symbol': '2330'}] * 5
+        assert len(calls) == 1
@@ -0,0 +1,118 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import MagicMock
+
+np = pytest.importorskip('numpy')
+
+from fugle_marketdata import RestClient
+from fugle_marketdata.rest.stock import SnapshotTracker
+
+
+def quotes(rows, time_=None):
+    return {'date': '2024-05-02', 'time': time_, 'market': 'TSE', 'data': rows}
+
+
+def row(symbol, close, volume=1000, **extra):
+    return {'type': 'EQUITY', 'symbol': symbol, 'name': symbol, 'closePrice': close, 'tradeVolume': volume, **extra}
+
+
+@pytest.fixture
+def snapshot():
+    return MagicMock()
+
+
+class TestSnapshotTracker:
+    def test_first_diff_marks_all_added(self, snapshot):
+        tracker = SnapshotTracker(snapshot, 'TSE')
+        result = tracker.diff(quotes([row('2330', 580.0), row('2317', 105.0)]))
+        assert result.added == ['2330', '2317']
+        assert result.changed == {}
+        assert result.removed == []
+        assert tracker.get('2330')['closePrice'] == 580.0
+
+    def test_only_changed_rows_and_fields(self, snapshot):
+        tracker = SnapshotTracker(snapshot, 'TSE')
+        tracker.diff(quotes([row('2330', 580.0), row('2317', 105.0), row('2454', 900.0)]))
+        result = tracker.diff(quotes([row('2330', 581.0), row('2317', 105.0), row('2454', 900.0, volume=2000)]))
+        assert result.changed == {'2330': {'closePrice': 581.0}, '2454': {'tradeVolume': 2000}}
+        assert result.added == [] and result.removed == []
+        assert len(result) == 2
+
+    def test_missing_values_are_not_changes(self, snapshot):
+        tracker = SnapshotTracker(snapshot, 'TSE')
+        tracker.diff(quotes([row('2330', None)]))
+        assert not tracker.diff(quotes([row('2330', None)]))
+        assert tracker.diff(quotes([row('2330', 580.0)])).changed == {'2330': {'closePrice': 580.0}}
+
+    def test_reordered_added_and_removed(self, snapshot):
+        tracker = SnapshotTracker(snapshot, 'TSE')
+        tracker.diff(quotes([row('2330', 580.0), row('2317', 105.0), row('2454', 900.0)]))
+        result = tracker.diff(quotes([row('2454', 901.0), row('2330', 580.0), row('1101', 40.0)]))
+        assert result.changed == {'2454': {'closePrice': 901.0}}
+        assert result.added == ['1101']
+        assert result.removed == ['2317']
+        assert tracker.get('2317') is None
+        assert tracker.get('1101')['closePrice'] == 40.0
+
+    def test_custom_fields(self, snapshot):
+        tracker = SnapshotTracker(snapshot, 'TSE', fields=['closePrice'])
+        tracker.diff(quotes([row('2330', 580.0)]))
+        assert not tracker.diff(quotes([row('2330', 580.0, volume=5000)]))
+
+    def test_callback_only_on_change(self, snapshot):
+        callback = MagicMock()
+        tracker = SnapshotTracker(snapshot, 'TSE', callback=callback)
+        tracker.diff(quotes([row('2330', 580.0)]))
+        tracker.diff(quotes([row('2330', 580.0)]))
+        assert callback.call_count == 1
+
+    def test_poll_forwards_params(self, snapshot):
+        snapshot.quotes.return_value = quotes([row('2330', 580.0)], time_=1)
+        tracker = SnapshotTracker(snapshot, 'TSE', type='COMMONSTOCK')
+        result = tracker.poll()
+        snapshot.quotes.assert_called_once_with(market='TSE', type='COMMONSTOCK')
+        assert result.time == 1
+
+    def test_watch_yields_non_empty_diffs(self, snapshot, mocker):
+        mocker.patch('time.sleep')
+        snapshot.quotes.side_effect = [
+            quotes([row('2330', 580.0)]),
+            quotes([row('2330', 580.0)]),
+            quotes([row('2330', 581.0)]),
+        ]
+        watcher = SnapshotTracker(snapshot, 'TSE').watch(interval=5)
+        assert next(watcher).added == ['2330']
+        assert next(watcher).changed == {'2330': {'closePrice': 581.0}}
+
+    def test_poll_async(self):
+        snapshot = MagicMock()
+
+        async def fake_quotes(**params):
+            return quotes([row('2330', 580.0)])
+
+        snapshot.quotes = fake_quotes
+        result = asyncio.run(SnapshotTracker(snapshot, 'TSE').poll_async())
+        assert result.added == ['2330']
+
+    def test_full_market_diff_is_fast(self, snapshot):
+        rows = [row(str(1000 + i), 100.0 + i, volume=i, openPrice=100.0, highPrice=110.0, lowPrice=90.0) for i in range(5000)]
+        tracker = SnapshotTracker(snapshot, 'TSE')
+        tracker.diff(quotes(rows))
+        updated = [dict(r) for r in rows]
+        for r in updated[::100]:
+            r['closePrice'] += 1
+        started_at = time.perf_counter()
+        result = tracker.diff(quotes(updated))
+        elapsed = time.perf_counter() - started_at
+        assert len(result) == 50
+        assert elapsed < 0.1
+
+
+class TestSnapshotTrack:
+    def test_track_returns_tracker(self):
+        client = RestClient(api_key='test-api-key')
+        tracker = client.stock.snapshot.track(market='TSE', type='COMMONSTOCK')
+        assert isinstance(tracker, SnapshotTracker)
+        assert tracker.snapshot is client.stock.snapshot
+        assert tracker.params == {'type': 'COMMONSTOCK'}
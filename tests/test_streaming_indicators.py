@@ -0,0 +1,154 @@
+import orjson
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from fugle_marketdata import WebSocketClient
+from fugle_marketdata.indicators import functions, IndicatorStream, SMA, EMA, RSI, KDJ, MACD, BB
+
+
+def assert_series(streamed, expected):
+    for value, reference in zip(streamed, np.asarray(expected).tolist()):
+        if np.isnan(reference):
+            assert value is None
+        else:
+            assert value == pytest.approx(reference, rel=1e-9, abs=1e-9)
+
+
+def stream_values(indicator, high, low, close, symbol='2330'):
+    return [indicator.commit(symbol, c, h, l) for h, l, c in zip(high, low, close)]
+
+
+class TestStreamingParity:
+    @pytest.fixture(autouse=True)
+    def prices(self, random_walk):
+        self.high, self.low, self.close = random_walk(200)
+
+    def test_sma(self):
+        assert_series(stream_values(SMA(20), self.high, self.low, self.close), functions.sma(self.close, 20))
+
+    def test_ema(self):
+        assert_series(stream_values(EMA(12), self.high, self.low, self.close), functions.ema(self.close, 12))
+
+    def test_rsi(self):
+        assert_series(stream_values(RSI(14), self.high, self.low, self.close), functions.rsi(self.close, 14))
+
+    @pytest.mark.parametrize('field', ['k', 'd', 'j'])
+    def test_kdj(self, field):
+        values = stream_values(KDJ(9, 3, 3), self.high, self.low, self.close)
+        expected = functions.kdj(self.high, self.low, self.close, 9, 3, 3)[field]
+        assert_series([v and v[field] for v in values], expected)
+
+    @pytest.mark.parametrize('field', ['macdLine', 'signalLine'])
+    def test_macd(self, field):
+        values = stream_values(MACD(12, 26, 9), self.high, self.low, self.close)
+        expected = functions.macd(self.close, 12, 26, 9)
+        # 串流版本在 signalLine 可計算前回傳 None
+        expected = np.where(np.isnan(expected['signalLine']), np.nan, expected[field])
+        assert_series([v and v[field] for v in values], expected)
+
+    @pytest.mark.parametrize('field', ['upper', 'middle', 'lower'])
+    def test_bb(self, field):
+        values = stream_values(BB(20, 2), self.high, self.low, self.close)
+        assert_series([v and v[field] for v in values], functions.bb(self.close, 20, 2)[field])
+
+
+class TestStreamingIndicator:
+    def test_peek_does_not_change_state(self):
+        sma = SMA(3)
+        for value in [1.0, 2.0]:
+            sma.commit('2330', value)
+        assert sma.peek('2330', 9.0) == pytest.approx(4.0)
+        assert sma.peek('2330', 3.0) == pytest.approx(2.0)
+        assert sma.commit('2330', 3.0) == pytest.approx(2.0)
+
+    def test_kdj_peek_restores_window(self, random_walk):
+        high, low, close = random_walk(30)
+        kdj = KDJ()
+        stream_values(kdj, high[:20], low[:20], close[:20])
+        kdj.peek('2330', 500.0, 1000.0, 0.1)
+        assert kdj.commit('2330', close[20], high[20], low[20]) == stream_values(KDJ(), high[:21], low[:21], close[:21])[-1]
+
+    def test_symbols_are_independent_and_grow(self):
+        sma = SMA(2)
+        for i in range(40):
+            sma.commit(str(i), float(i))
+        assert sma.capacity >= 40
+        assert [sma.commit(str(i), float(i) + 2) for i in range(40)] == [float(i) + 1 for i in range(40)]
+
+    def test_reset_symbol(self):
+        ema = EMA(2)
+        ema.commit('2330', 1.0)
+        ema.reset('2330')
+        assert ema.commit('2330', 5.0) is None
+
+    def test_invalid_period(self):
+        with pytest.raises(ValueError):
+            RSI(0)
+
+
+def candle_message(symbol, date, close, high=None, low=None):
+    return orjson.dumps({
+        'event': 'data',
+        'channel': 'candles',
+        'data': {'symbol': symbol, 'date': date, 'open': close, 'high': high or close, 'low': low or close, 'close': close, 'volume': 1},
+    }).decode()
+
+
+def trade_message(symbol, time, price):
+    return orjson.dumps({
+        'event': 'data',
+        'channel': 'trades',
+        'data': {'symbol': symbol, 'price': price, 'size': 1, 'time': time},
+    }).decode()
+
+
+class TestIndicatorStream:
+    def test_candle_updates_within_bar_are_provisional(self):
+        values = []
+        stream = IndicatorStream({'sma': SMA(2)}, callback=lambda symbol, bar, v: values.append((bar, v['sma'])))
+        stream.on_message(candle_message('2330', '09:00', 10.0))
+        stream.on_message(candle_message('2330', '09:01', 11.0))
+        stream.on_message(candle_message('2330', '09:01', 13.0))
+        stream.on_message(candle_message('2330', '09:02', 14.0))
+        assert values == [('09:00', None), ('09:01', 10.5), ('09:01', 11.5), ('09:02', 13.5)]
+        assert stream.latest['2330'] == {'sma': 13.5}
+
+    def test_closed_only(self):
+        values = []
+        stream = IndicatorStream({'sma': SMA(2)}, closed_only=True, callback=lambda symbol, bar, v: values.append((bar, v['sma'])))
+        for date, close in [('09:00', 10.0), ('09:01', 11.0), ('09:01', 13.0), ('09:02', 14.0)]:
+            stream.on_message(candle_message('2330', date, close))
+        assert values == [('09:00', None), ('09:01', 11.5)]
+
+    def test_trades_aggregated_into_bars(self):
+        stream = IndicatorStream({'kdj': KDJ(2, 1, 1), 'sma': SMA(2)}, channel='trades', interval=60)
+        minute = 60 * 1000000
+        stream.on_message(trade_message('2330', 0, 10.0))
+        stream.on_message(trade_message('2330', 10, 12.0))
+        stream.on_message(trade_message('2330', 20, 9.0))
+        assert stream.pending['2330'] == (0, 9.0, 12.0, 9.0)
+        values = stream.on_message(trade_message('2330', minute + 5, 11.0))
+        assert stream.latest['2330']['sma'] == pytest.approx(10.0)
+        # 第二根 K 棒的 RSV 以兩根 K 棒的最高 12、最低 9 計算
+        assert stream.latest['2330']['kdj']['k'] == pytest.approx((11.0 - 9.0) / 3 * 100)
+
+    def test_ignores_other_channels(self):
+        stream = IndicatorStream({'sma': SMA(2)})
+        stream.on_message(trade_message('2330', 0, 10.0))
+        stream.on_message(orjson.dumps({'event': 'authenticated', 'data': {}}).decode())
+        assert stream.latest == {}
+
+    def test_invalid_channel(self):
+        with pytest.raises(ValueError):
+            IndicatorStream({}, channel='books')
+
+    def test_attach_to_websocket_client(self):
+        stock = WebSocketClient(api_key='api-key').stock
+        stream = IndicatorStream({'ema': EMA(1)}).attach(stock)
+        stock.ee.emit('message', candle_message('2330', '09:00', 10.0))
+        assert stream.latest['2330'] == {'ema': 10.0}
+
+        stream.detach()
+        stock.ee.emit('message', candle_message('2330', '09:01', 12.0))
+        assert stream.latest['2330'] == {'ema': 10.0}
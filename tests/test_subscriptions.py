@@ -0,0 +1,117 @@
+import orjson
+import pytest
+
+from fugle_marketdata.websocket.stock.client import WebSocketStockClient
+from fugle_marketdata.websocket.subscriptions import SubscriptionRegistry, _normalize
+
+
+ODD_LOT = (('intradayOddLot', True),)
+
+
+def acknowledge(client, items):
+    client._WebSocketClient__on_message(None, orjson.dumps({'event': 'subscribed', 'data': items}).decode())
+
+
+def sent(app, event):
+    return [message['data'] for message in app.sent if message['event'] == event]
+
+
+@pytest.fixture
+def stock(fake_ws):
+    return WebSocketStockClient(api_key='api-key', base_url='wss://example.com', max_symbols_per_frame=2)
+
+
+class TestSubscriptionRegistry:
+    def test_normalize(self):
+        assert _normalize({'trades': ['2330', '2317']}) == {('trades', '2330', ()): {'channel': 'trades'}, ('trades', '2317', ()): {'channel': 'trades'}}
+        assert _normalize([{'channel': 'books', 'symbol': '2330', 'intradayOddLot': True}]) == {('books', '2330', ODD_LOT): {'channel': 'books', 'intradayOddLot': True}}
+
+    def test_diff(self):
+        registry = SubscriptionRegistry()
+        registry.add(_normalize({'trades': ['2330', '2317'], 'books': ['2330']}))
+        added, removed = registry.diff(_normalize([{'channel': 'trades', 'symbols': ['2330', '2454']}, {'channel': 'books', 'symbol': '2330', 'intradayOddLot': True}]))
+        assert added == {('trades', '2454', ()): {'channel': 'trades'}, ('books', '2330', ODD_LOT): {'channel': 'books', 'intradayOddLot': True}}
+        assert sorted(removed) == [('books', '2330', ()), ('trades', '2317', ())]
+
+    def test_frames_grouped_and_chunked(self):
+        registry = SubscriptionRegistry(max_symbols=2)
+        frames = registry.subscribe_frames(_normalize({'trades': ['1', '2', '3'], 'books': ['1']}))
+        assert frames == [{'channel': 'trades', 'symbols': ['1', '2']}, {'channel': 'trades', 'symbol': '3'}, {'channel': 'books', 'symbol': '1'}]
+        assert registry.unsubscribe_frames(['a', 'b', 'c']) == [{'ids': ['a', 'b']}, {'id': 'c'}]
+
+    def test_params_are_part_of_key(self):
+        registry = SubscriptionRegistry()
+        registry.add(_normalize([{'channel': 'trades', 'symbol': '2330'}, {'channel': 'trades', 'symbol': '2330', 'intradayOddLot': True}]))
+        assert len(registry.items()) == 2
+        assert registry.subscribe_frames(registry.items()) == [
+            {'channel': 'trades', 'symbol': '2330'},
+            {'channel': 'trades', 'symbol': '2330', 'intradayOddLot': True},
+        ]
+        registry.acknowledge([
+            {'id': 'odd', 'channel': 'trades', 'symbol': '2330', 'intradayOddLot': True},
+            {'id': 'regular', 'channel': 'trades', 'symbol': '2330'},
+        ])
+        assert registry.ids == {('trades', '2330', ()): 'regular', ('trades', '2330', ODD_LOT): 'odd'}
+
+    def test_invalid_max_symbols(self):
+        with pytest.raises(ValueError):
+            SubscriptionRegistry(max_symbols=0)
+
+
+class TestSetSubscriptions:
+    def test_sends_minimal_batched_diff(self, stock, fake_ws):
+        app = fake_ws[0]
+        result = stock.set_subscriptions({'trades': ['2330', '2317', '2454']})
+        assert result == {'subscribed': 3, 'unsubscribed': 0, 'frames': 2}
+        assert sent(app, 'subscribe') == [{'channel': 'trades', 'symbols': ['2330', '2317']}, {'channel': 'trades', 'symbol': '2454'}]
+        acknowledge(stock, [{'id': f'id-{symbol}', 'channel': 'trades', 'symbol': symbol} for symbol in ['2330', '2317', '2454']])
+
+        app.sent.clear()
+        result = stock.set_subscriptions({'trades': ['2330', '2882', '1301']})
+        assert result == {'subscribed': 2, 'unsubscribed': 2, 'frames': 2}
+        assert sent(app, 'unsubscribe') == [{'ids': ['id-2317', 'id-2454']}]
+        assert sent(app, 'subscribe') == [{'channel': 'trades', 'symbols': ['2882', '1301']}]
+        assert set(stock.tracked_subscriptions) == {('trades', '2330', ()), ('trades', '2882', ()), ('trades', '1301', ())}
+
+        app.sent.clear()
+        assert stock.set_subscriptions({'trades': ['2330', '2882', '1301']}) == {'subscribed': 0, 'unsubscribed': 0, 'frames': 0}
+        assert app.sent == []
+
+    def test_removed_before_acknowledged(self, stock, fake_ws):
+        app = fake_ws[0]
+        stock.set_subscriptions({'trades': ['2330']})
+        stock.set_subscriptions({})
+        assert sent(app, 'unsubscribe') == []
+        # 收到 id 後立即取消
+        acknowledge(stock, {'id': 'late', 'channel': 'trades', 'symbol': '2330'})
+        assert sent(app, 'unsubscribe') == [{'id': 'late'}]
+        assert stock.tracked_subscriptions == {}
+
+    def test_resubscribed_before_acknowledged(self, stock, fake_ws):
+        app = fake_ws[0]
+        stock.set_subscriptions({'trades': ['2330']})
+        stock.set_subscriptions({})
+        stock.set_subscriptions({'trades': ['2330']})
+        # 第一個回應屬於已取消的訂閱
+        acknowledge(stock, {'id': 'first', 'channel': 'trades', 'symbol': '2330'})
+        acknowledge(stock, {'id': 'second', 'channel': 'trades', 'symbol': '2330'})
+        assert sent(app, 'unsubscribe') == [{'id': 'first'}]
+        assert stock.registry.ids == {('trades', '2330', ()): 'second'}
+
+    def test_params_changed_before_acknowledged(self, stock, fake_ws):
+        app = fake_ws[0]
+        stock.set_subscriptions({'trades': ['2330']})
+        stock.set_subscriptions([{'channel': 'trades', 'symbol': '2330', 'intradayOddLot': True}])
+        acknowledge(stock, {'id': 'regular', 'channel': 'trades', 'symbol': '2330'})
+        acknowledge(stock, {'id': 'odd', 'channel': 'trades', 'symbol': '2330', 'intradayOddLot': True})
+        assert sent(app, 'unsubscribe') == [{'id': 'regular'}]
+        assert stock.registry.ids == {('trades', '2330', ODD_LOT): 'odd'}
+
+    def test_subscribe_chunks_large_requests(self, stock, fake_ws):
+        stock.subscribe({'channel': 'trades', 'symbols': ['1', '2', '3']})
+        stock.subscribe({'channel': 'books', 'symbols': ['1', '2']})
+        assert sent(fake_ws[0], 'subscribe') == [
+            {'channel': 'trades', 'symbols': ['1', '2']},
+            {'channel': 'trades', 'symbol': '3'},
+            {'channel': 'books', 'symbols': ['1', '2']},
+        ]
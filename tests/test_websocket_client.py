@@ -1,5 +1,8 @@
-import threading
+import time
+import orjson
 from fugle_marketdata import WebSocketClient
+from fugle_marketdata.constants import CONNECTION_CLOSED_MESSAGE, MISSING_CREDENTIALS_MESSAGE, UNAUTHENTICATED_MESSAGE
+from fugle_marketdata.websocket.client import AuthenticationState, HealthCheckConfig, ReconnectConfig
 from fugle_marketdata.websocket.futopt.client import WebSocketFutOptClient
 from fugle_marketdata.websocket.stock.client import WebSocketStockClient
 import pytest
@@ -179,4 +182,358 @@ class TestWebSocketClientUrlNormalization:
         stock = client.stock
         assert stock.config['base_url'] == 'wss://ws.example.com/api/v2/stock/streaming'
         futopt = client.futopt
-        assert futopt.config['base_url'] == 'wss://ws.example.com/api/v2/futopt/streaming'
\ No newline at end of file
+        assert futopt.config['base_url'] == 'wss://ws.example.com/api/v2/futopt/streaming'
+
+def timed_connect(client, **kwargs):
+    # 回傳 (wall time, 呼叫 connect 的執行緒所耗用的 CPU time)
+    wall, cpu = time.monotonic(), time.thread_time()
+    try:
+        client.connect(**kwargs)
+    finally:
+        wall, cpu = time.monotonic() - wall, time.thread_time() - cpu
+    return wall, cpu
+
+
+class TestWebSocketClientConnect:
+    def test_connect_waits_for_authentication(self, fake_ws):
+        stock = WebSocketStockClient(api_key='api-key', base_url='wss://example.com')
+        wall, cpu = timed_connect(stock, timeout=5)
+        assert stock.auth_status == AuthenticationState.AUTHENTICATED
+        assert fake_ws[0].sent[0] == {'event': 'auth', 'data': {'apikey': 'api-key'}}
+        assert set(stock.timings) == {'connect', 'authenticate', 'total'}
+        assert stock.timings['connect'] >= 0.04
+        assert stock.timings['total'] == pytest.approx(stock.timings['connect'] + stock.timings['authenticate'])
+        # 等待期間不應佔用 CPU
+        assert cpu < wall / 2
+        stock.disconnect()
+
+    def test_timeout_when_socket_never_opens(self, fake_ws):
+        stock = WebSocketStockClient(api_key='api-key', base_url='wss://example.com')
+        fake_ws[0].mode = 'never_open'
+        with pytest.raises(TimeoutError):
+            stock.connect(timeout=0.5)
+        assert fake_ws[0].closed
+        assert stock.auth_status == AuthenticationState.PENDING
+
+    def test_no_cpu_spin_while_waiting(self, fake_ws):
+        stock = WebSocketStockClient(api_key='api-key', base_url='wss://example.com')
+        fake_ws[0].mode = 'never_open'
+        cpu = time.thread_time()
+        wall = time.monotonic()
+        with pytest.raises(TimeoutError):
+            stock.connect(timeout=0.5)
+        cpu, wall = time.thread_time() - cpu, time.monotonic() - wall
+        assert wall >= 0.5
+        assert cpu < 0.05
+
+    def test_connect_timeout_from_config(self, fake_ws):
+        stock = WebSocketStockClient(api_key='api-key', base_url='wss://example.com', connect_timeout=0.2)
+        fake_ws[0].mode = 'never_open'
+        started_at = time.monotonic()
+        with pytest.raises(TimeoutError):
+            stock.connect()
+        assert time.monotonic() - started_at < 2
+
+    def test_unauthenticated_raises(self, fake_ws):
+        stock = WebSocketStockClient(api_key='bad-key', base_url='wss://example.com')
+        fake_ws[0].mode = 'reject'
+        with pytest.raises(Exception, match=UNAUTHENTICATED_MESSAGE):
+            stock.connect(timeout=5)
+        assert fake_ws[0].closed
+
+    def test_closed_before_authentication_raises(self, fake_ws):
+        stock = WebSocketStockClient(api_key='api-key', base_url='wss://example.com')
+        fake_ws[0].mode = 'close'
+        with pytest.raises(Exception, match=CONNECTION_CLOSED_MESSAGE):
+            stock.connect(timeout=5)
+
+    def test_missing_credentials_raises(self, fake_ws):
+        stock = WebSocketStockClient(base_url='wss://example.com')
+        with pytest.raises(Exception, match=MISSING_CREDENTIALS_MESSAGE):
+            stock.connect(timeout=5)
+
+    def test_reconnect_after_failure(self, fake_ws):
+        stock = WebSocketStockClient(api_key='api-key', base_url='wss://example.com')
+        fake_ws[0].mode = 'never_open'
+        with pytest.raises(TimeoutError):
+            stock.connect(timeout=0.2)
+        fake_ws[0].mode = 'authenticate'
+        stock.connect(timeout=5)
+        assert stock.auth_status == AuthenticationState.AUTHENTICATED
+        stock.disconnect()
+
+
+@pytest.fixture
+def count_loads(mocker):
+    return mocker.patch('fugle_marketdata.websocket.client.orjson.loads', side_effect=orjson.loads)
+
+
+class TestWebSocketClientMessages:
+    def test_raw_format_by_default(self, data_message, deliver):
+        stock = WebSocketStockClient(api_key='api-key')
+        received = []
+        stock.on('message', received.append)
+        deliver(stock, data_message('trades', '2330', price=580))
+        assert received == [data_message('trades', '2330', price=580)]
+
+    def test_dict_format_parses_once(self, count_loads, data_message, deliver):
+        stock = WebSocketStockClient(api_key='api-key', message_format='dict')
+        received = []
+        stock.on('message', lambda message: received.append(message))
+        stock.on('message', lambda message: received.append(message))
+        deliver(stock, data_message('trades', '2330', price=580))
+        assert received[0] is received[1]
+        assert received[0]['data'] == {'symbol': '2330', 'price': 580}
+        assert count_loads.call_count == 1
+
+    def test_lazy_format_defers_and_caches_decode(self, count_loads, data_message, deliver):
+        stock = WebSocketStockClient(api_key='api-key', message_format='lazy')
+        received = []
+        stock.on('message', received.append)
+        deliver(stock, data_message('trades', '2330', price=580))
+        # 行情資料不需在 client 內解析
+        assert count_loads.call_count == 0
+        message = received[0]
+        assert message.channel == 'trades'
+        assert message['data']['price'] == 580
+        assert message.get('event') == 'data'
+        assert count_loads.call_count == 1
+        assert str(message) == data_message('trades', '2330', price=580)
+
+    def test_control_messages_still_handled(self, deliver):
+        stock = WebSocketStockClient(api_key='api-key', message_format='lazy')
+        stock.missed_pongs = 2
+        deliver(stock, orjson.dumps({'event': 'pong', 'data': {}}).decode())
+        assert stock.missed_pongs == 0
+
+        authenticated = []
+        stock.on('authenticated', authenticated.append)
+        deliver(stock, orjson.dumps({'event': 'authenticated', 'data': {}}).decode())
+        assert authenticated == [{'event': 'authenticated', 'data': {}}]
+        assert stock.auth_status == AuthenticationState.AUTHENTICATED
+
+    def test_on_event_routes_by_event(self, data_message, deliver):
+        stock = WebSocketStockClient(api_key='api-key', message_format='dict')
+        data, snapshots = [], []
+        stock.on_event('data', data.append)
+        stock.on_event('snapshot', snapshots.append)
+        deliver(stock, data_message('trades', '2330', price=580))
+        deliver(stock, orjson.dumps({'event': 'snapshot', 'channel': 'trades', 'data': {'symbol': '2330'}}).decode())
+        deliver(stock, orjson.dumps({'event': 'subscribed', 'data': {'channel': 'trades'}}).decode())
+        assert [m['event'] for m in data] == ['data']
+        assert [m['event'] for m in snapshots] == ['snapshot']
+
+        stock.off_event('data', data.append)
+        deliver(stock, data_message('trades', '2330', price=581))
+        assert len(data) == 1
+
+    def test_data_with_other_key_order(self, deliver):
+        stock = WebSocketStockClient(api_key='api-key', message_format='dict')
+        data = []
+        stock.on_event('data', data.append)
+        deliver(stock, '{"channel":"trades","event":"data","data":{"symbol":"2330"}}')
+        assert data == [{'channel': 'trades', 'event': 'data', 'data': {'symbol': '2330'}}]
+
+    def test_invalid_message_format(self):
+        with pytest.raises(ValueError):
+            WebSocketStockClient(api_key='api-key', message_format='xml')
+
+
+class TestWebSocketClientChannelRouting:
+    def test_routes_by_channel_and_symbol(self, data_message, deliver):
+        stock = WebSocketStockClient(api_key='api-key', message_format='dict')
+        tsmc_trades, all_trades, books = [], [], []
+        stock.on_channel('trades', tsmc_trades.append, symbol='2330')
+        stock.on_channel('trades', all_trades.append)
+        stock.on_channel('books', books.append)
+
+        deliver(stock, data_message('trades', '2330', price=580))
+        deliver(stock, data_message('trades', '2317', price=100))
+        deliver(stock, data_message('books', '2330', bids=[]))
+
+        assert [m['data']['symbol'] for m in tsmc_trades] == ['2330']
+        assert [m['data']['symbol'] for m in all_trades] == ['2330', '2317']
+        assert [m['channel'] for m in books] == ['books']
+
+    def test_snapshot_routed_and_control_messages_ignored(self, deliver):
+        stock = WebSocketStockClient(api_key='api-key', message_format='dict')
+        received = []
+        stock.on_channel('trades', received.append, symbol='2330')
+        deliver(stock, orjson.dumps({'event': 'snapshot', 'channel': 'trades', 'data': {'symbol': '2330'}}).decode())
+        deliver(stock, orjson.dumps({'event': 'subscribed', 'data': {'channel': 'trades', 'symbol': '2330'}}).decode())
+        assert [m['event'] for m in received] == ['snapshot']
+
+    def test_off_channel(self, data_message, deliver):
+        stock = WebSocketStockClient(api_key='api-key')
+        received = []
+        stock.on_channel('trades', received.append, symbol='2330')
+        stock.off_channel('trades', received.append, symbol='2330')
+        deliver(stock, data_message('trades', '2330', price=580))
+        assert received == []
+
+    def test_no_decode_without_channel_listeners(self, count_loads, data_message, deliver):
+        stock = WebSocketStockClient(api_key='api-key', message_format='lazy')
+        stock.on_event('data', lambda message: None)
+        deliver(stock, data_message('trades', '2330', price=580))
+        assert count_loads.call_count == 0
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestWebSocketClientReconnect:
+    def connected(self, fake_ws, **config):
+        reconnect = ReconnectConfig(initial_delay=0.01, jitter=0, **config.pop('reconnect', {}))
+        stock = WebSocketStockClient(api_key='api-key', base_url='wss://example.com', reconnect=reconnect, **config)
+        stock.connect(timeout=5)
+        return stock, fake_ws[0]
+
+    def test_backoff_delay(self):
+        config = ReconnectConfig(initial_delay=1, multiplier=2, max_delay=5, jitter=0)
+        assert [config.delay(attempt) for attempt in range(1, 5)] == [1, 2, 4, 5]
+        assert 0.9 <= ReconnectConfig(initial_delay=1).delay(1) <= 1.1
+
+    def test_reconnect_replays_subscriptions_and_flags_gaps(self, fake_ws):
+        stock, app = self.connected(fake_ws)
+        reconnects = []
+        stock.on('reconnect', reconnects.append)
+        stock.subscribe({'channel': 'trades', 'symbols': ['2330', '2317']})
+        stock.subscribe({'channel': 'books', 'symbol': '2330', 'intradayOddLot': True})
+        app.sent.clear()
+
+        app.on_close(app, 1006, 'abnormal closure')
+        assert wait_until(lambda: reconnects)
+        assert stock.auth_status == AuthenticationState.AUTHENTICATED
+        assert [message['event'] for message in app.sent] == ['auth', 'subscribe', 'subscribe']
+        assert {'channel': 'trades', 'symbols': ['2330', '2317']} in [message['data'] for message in app.sent]
+        assert {'channel': 'books', 'symbol': '2330', 'intradayOddLot': True} in [message['data'] for message in app.sent]
+        assert set(reconnects[0]) == {('trades', '2330'), ('trades', '2317'), ('books', '2330')}
+        gap = stock.gaps[('trades', '2330')]
+        assert gap['from'] <= gap['to']
+        stock.disconnect()
+
+    def test_regular_and_odd_lot_both_replayed(self, fake_ws):
+        stock, app = self.connected(fake_ws)
+        reconnects = []
+        stock.on('reconnect', reconnects.append)
+        stock.subscribe({'channel': 'trades', 'symbol': '2330'})
+        stock.subscribe({'channel': 'trades', 'symbol': '2330', 'intradayOddLot': True})
+        app.sent.clear()
+
+        app.on_close(app, 1006, 'abnormal closure')
+        assert wait_until(lambda: reconnects)
+        assert [message['data'] for message in app.sent if message['event'] == 'subscribe'] == [
+            {'channel': 'trades', 'symbol': '2330'},
+            {'channel': 'trades', 'symbol': '2330', 'intradayOddLot': True},
+        ]
+        stock.disconnect()
+
+    def test_unsubscribed_symbols_not_replayed(self, fake_ws, deliver):
+        stock, app = self.connected(fake_ws)
+        stock.subscribe({'channel': 'trades', 'symbol': '2330'})
+        stock.subscribe({'channel': 'trades', 'symbol': '2317'})
+        deliver(stock, orjson.dumps({'event': 'subscribed', 'data': {'id': 'a', 'channel': 'trades', 'symbol': '2330'}}).decode())
+        stock.unsubscribe({'id': 'a'})
+        assert stock.tracked_subscriptions == {('trades', '2317', ()): {'channel': 'trades'}}
+
+    def test_disconnect_does_not_reconnect(self, fake_ws):
+        stock, app = self.connected(fake_ws)
+        reconnects = []
+        stock.on('reconnect', reconnects.append)
+        stock.disconnect()
+        app.on_close(app, 1000, 'normal closure')
+        time.sleep(0.1)
+        assert reconnects == []
+        assert [message['event'] for message in app.sent] == ['auth']
+
+    def test_gives_up_after_max_attempts(self, fake_ws):
+        stock, app = self.connected(fake_ws, connect_timeout=0.05, reconnect={'max_attempts': 2})
+        errors = []
+        stock.on('error', errors.append)
+        app.mode = 'never_open'
+        app.on_close(app, 1006, 'abnormal closure')
+        assert wait_until(lambda: errors)
+        assert 'after 2 attempts' in str(errors[0])
+        assert stock.auth_status == AuthenticationState.PENDING
+
+    def test_backfill_trades_in_gap(self, fake_ws, mocker):
+        rest = mocker.MagicMock()
+        inside = []
+
+        def trades(symbol, limit, offset):
+            # 重連至少需要 initial_delay 加上認證時間，1 毫秒前的成交必定在缺口內
+            now = time.time() * 1000000
+            inside.append({'price': 2, 'time': now - 1000})
+            return {'data': [{'price': 3, 'time': now + 10 * 1000000}, inside[0], {'price': 1, 'time': now - 60 * 1000000}]}
+
+        rest.intraday.trades.side_effect = trades
+        stock, app = self.connected(fake_ws, reconnect={'backfill': rest})
+        stock.subscribe({'channel': 'trades', 'symbol': '2330'})
+        backfills = []
+        stock.on('backfill', lambda symbol, trades: backfills.append((symbol, trades)))
+        app.on_close(app, 1006, 'abnormal closure')
+        assert wait_until(lambda: backfills)
+        rest.intraday.trades.assert_called_once_with(symbol='2330', limit=500, offset=0)
+        assert backfills == [('2330', inside)]
+        assert stock.gaps[('trades', '2330')]['complete'] is True
+        stock.disconnect()
+
+    def backfill_pages(self, mocker, pages_in_gap):
+        # 每頁 2 筆，由新到舊；前 pages_in_gap 頁都在缺口內，之後為斷線前的成交
+        rest = mocker.MagicMock()
+        calls = []
+
+        def trades(symbol, limit, offset):
+            calls.append((symbol, offset))
+            now = time.time() * 1000000
+            page = offset // limit
+            if page < pages_in_gap:
+                return {'data': [{'symbol': symbol, 'time': now - 1000 * (offset + i + 1)} for i in range(limit)]}
+            return {'data': [{'symbol': symbol, 'time': now - 3600 * 1000000 - i} for i in range(limit)]}
+
+        rest.intraday.trades.side_effect = trades
+        return rest, calls
+
+    def test_backfill_pages_until_gap_start(self, fake_ws, mocker):
+        rest, calls = self.backfill_pages(mocker, pages_in_gap=3)
+        stock, app = self.connected(fake_ws, reconnect={'backfill': rest, 'backfill_page_size': 2})
+        stock.subscribe({'channel': 'trades', 'symbols': ['2330', '2317']})
+        backfills = {}
+        stock.on('backfill', lambda symbol, trades: backfills.update({symbol: trades}))
+        app.on_close(app, 1006, 'abnormal closure')
+        assert wait_until(lambda: len(backfills) == 2)
+        assert sorted(calls) == sorted((symbol, offset) for symbol in ['2330', '2317'] for offset in [0, 2, 4, 6])
+        assert [len(trades) for trades in backfills.values()] == [6, 6]
+        assert all(stock.gaps[('trades', symbol)]['complete'] for symbol in ['2330', '2317'])
+        stock.disconnect()
+
+    def test_backfill_flags_incomplete_gap(self, fake_ws, mocker):
+        rest, calls = self.backfill_pages(mocker, pages_in_gap=10)
+        stock, app = self.connected(fake_ws, reconnect={'backfill': rest, 'backfill_page_size': 2, 'backfill_max_pages': 3})
+        stock.subscribe({'channel': 'trades', 'symbol': '2330'})
+        backfills, errors = [], []
+        stock.on('backfill', lambda symbol, trades: backfills.append(trades))
+        stock.on('error', errors.append)
+        app.on_close(app, 1006, 'abnormal closure')
+        assert wait_until(lambda: backfills)
+        assert len(calls) == 3 and len(backfills[0]) == 6
+        assert stock.gaps[('trades', '2330')]['complete'] is False
+        assert 'incomplete' in str(errors[0])
+        stock.disconnect()
+
+    def test_missed_pongs_close_without_raising(self, fake_ws):
+        health_check = HealthCheckConfig(enabled=True, ping_interval=20, max_missed_pongs=1)
+        stock = WebSocketStockClient(api_key='api-key', base_url='wss://example.com', health_check=health_check)
+        errors = []
+        stock.on('error', errors.append)
+        stock.connect(timeout=5)
+        assert wait_until(lambda: fake_ws[0].closed)
+        assert 'Did not receive pong' in str(errors[0])
+        assert [message['event'] for message in fake_ws[0].sent] == ['auth', 'ping']
+        stock.disconnect()
@@ -0,0 +1,158 @@
+import itertools
+import time
+import orjson
+import pytest
+
+from fugle_marketdata import WebSocketPool, ReconnectConfig
+from tests.conftest import FakeWebSocketApp
+
+
+class FakeStreamingApp(FakeWebSocketApp):
+    """除認證外，subscribe 時回應 subscribed 並配發訂閱 id"""
+
+    ids = itertools.count(1)
+
+    def send(self, data):
+        super().send(data)
+        message = orjson.loads(data)
+        if message['event'] != 'subscribe':
+            return
+        params = message['data']
+        symbols = params.get('symbols') or [params['symbol']]
+        extra = {'intradayOddLot': True} if params.get('intradayOddLot') else {}
+        items = [{'id': f'id-{next(self.ids)}', 'channel': params['channel'], 'symbol': symbol, **extra} for symbol in symbols]
+        reply = {'event': 'subscribed', 'data': items if len(items) > 1 else items[0]}
+        self.on_message(self, orjson.dumps(reply).decode())
+
+    def drop(self):
+        self.on_close(self, 1006, 'abnormal closure')
+
+    def frames(self, event):
+        return [message['data'] for message in self.sent if message['event'] == event]
+
+
+@pytest.fixture
+def apps(mocker):
+    apps = []
+
+    def create(*args, **kwargs):
+        app = FakeStreamingApp(*args, **kwargs)
+        apps.append(app)
+        return app
+
+    mocker.patch('fugle_marketdata.websocket.client.websocket.WebSocketApp', side_effect=create)
+    return apps
+
+
+@pytest.fixture
+def pool(apps):
+    pool = WebSocketPool(size=3, api_key='api-key')
+    pool.connect(timeout=5)
+    yield pool
+    pool.disconnect()
+
+
+SYMBOLS = ['2330', '2317', '2454', '2412', '2882', '1301', '2303', '3008', '2002', '1216']
+
+
+class TestWebSocketPool:
+    def test_connections_authenticate_separately(self, apps, pool):
+        assert len(apps) == 3
+        assert all(app.frames('auth') == [{'apikey': 'api-key'}] for app in apps)
+        assert pool.live == [True, True, True]
+
+    def test_subscribe_shards_by_hash(self, apps, pool):
+        pool.subscribe({'channel': 'trades', 'symbols': SYMBOLS})
+        sent = sorted(symbol for app in apps for frame in app.frames('subscribe') for symbol in frame.get('symbols') or [frame['symbol']])
+        assert sent == sorted(SYMBOLS)
+        # 每條連線只收到一個訊息，且分配結果固定
+        assert all(len(app.frames('subscribe')) <= 1 for app in apps)
+        assignments = pool.assignments()
+        assert sum(len(keys) for keys in assignments) == len(SYMBOLS)
+        for index, keys in enumerate(assignments):
+            assert all(pool.shard_for(symbol) == index for _, symbol, _ in keys)
+
+    def test_explicit_groups(self, apps):
+        pool = WebSocketPool(groups=[['2330'], ['2317', '2454']], size=1, api_key='api-key')
+        pool.connect(timeout=5)
+        pool.subscribe({'channel': 'books', 'symbols': ['2330', '2317', '2454'], 'intradayOddLot': True})
+        assert apps[0].frames('subscribe') == [{'channel': 'books', 'intradayOddLot': True, 'symbol': '2330'}]
+        assert apps[1].frames('subscribe') == [{'channel': 'books', 'intradayOddLot': True, 'symbols': ['2317', '2454']}]
+        pool.disconnect()
+
+    def test_unsubscribe_by_channel_and_symbol(self, apps, pool):
+        pool.subscribe({'channel': 'trades', 'symbols': SYMBOLS})
+        pool.unsubscribe({'channel': 'trades', 'symbols': SYMBOLS})
+        ids = [i for app in apps for frame in app.frames('unsubscribe') for i in frame.get('ids') or [frame['id']]]
+        assert len(ids) == len(SYMBOLS)
+        assert pool.subscriptions == {}
+
+    def test_merged_message_stream(self, apps, pool):
+        received = []
+        pool.on_channel('trades', received.append)
+        for index, app in enumerate(apps):
+            app.on_message(app, orjson.dumps({'event': 'data', 'channel': 'trades', 'data': {'symbol': str(index)}}).decode())
+        assert len(received) == 3
+
+    def test_rebalance_when_connection_drops(self, apps, pool):
+        pool.subscribe({'channel': 'trades', 'symbols': SYMBOLS})
+        dropped = max(range(3), key=lambda index: len(pool.assignments()[index]))
+        moved = {symbol for _, symbol, _ in pool.assignments()[dropped]}
+        before = [len(app.frames('subscribe')) for app in apps]
+        apps[dropped].drop()
+
+        assert pool.live[dropped] is False
+        assert pool.rebalances == 1
+        assert pool.assignments()[dropped] == []
+        resubscribed = {symbol for index, app in enumerate(apps) if index != dropped
+                        for frame in app.frames('subscribe')[before[index]:] for symbol in frame.get('symbols') or [frame['symbol']]}
+        assert resubscribed == moved
+        assert all(entry['id'] is not None for entry in pool.subscriptions.values())
+
+    def test_disconnect_does_not_rebalance(self, apps, pool):
+        pool.subscribe({'channel': 'trades', 'symbols': SYMBOLS})
+        pool.disconnect()
+        for app in apps:
+            app.drop()
+        assert pool.rebalances == 0
+
+    def test_reconnecting_connection_restores_itself(self, apps):
+        pool = WebSocketPool(size=2, api_key='api-key', reconnect=ReconnectConfig(initial_delay=0.01, jitter=0))
+        pool.connect(timeout=5)
+        pool.subscribe({'channel': 'trades', 'symbols': SYMBOLS})
+        before = [len(app.frames('subscribe')) for app in apps]
+        apps[0].drop()
+        assert pool.live[0] is False
+        deadline = time.monotonic() + 5
+        while not pool.live[0] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.live[0] is True
+        assert pool.rebalances == 0
+        # 由重連的連線自行重新訂閱，其他連線不受影響
+        assert len(apps[0].frames('subscribe')) == before[0] + 1
+        assert len(apps[1].frames('subscribe')) == before[1]
+        pool.disconnect()
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            WebSocketPool(size=0, api_key='api-key')
+
+
+class TestWebSocketPoolSetSubscriptions:
+    def test_set_subscriptions_diff(self, apps, pool):
+        assert pool.set_subscriptions({'trades': SYMBOLS[:6]}) == {'subscribed': 6, 'unsubscribed': 0}
+        assert pool.set_subscriptions({'trades': SYMBOLS[3:]}) == {'subscribed': 4, 'unsubscribed': 3}
+        assert set(pool.subscriptions) == {('trades', symbol, ()) for symbol in SYMBOLS[3:]}
+        unsubscribed = [i for app in apps for frame in app.frames('unsubscribe') for i in frame.get('ids') or [frame['id']]]
+        assert len(unsubscribed) == 3
+        assert pool.set_subscriptions({'trades': SYMBOLS[3:]}) == {'subscribed': 0, 'unsubscribed': 0}
+
+    def test_regular_and_odd_lot_tracked_separately(self, apps, pool):
+        desired = [{'channel': 'trades', 'symbol': '2330'}, {'channel': 'trades', 'symbol': '2330', 'intradayOddLot': True}]
+        assert pool.set_subscriptions(desired) == {'subscribed': 2, 'unsubscribed': 0}
+        ids = {key: entry['id'] for key, entry in pool.subscriptions.items()}
+        assert len(ids) == 2 and None not in ids.values() and len(set(ids.values())) == 2
+
+        assert pool.set_subscriptions(desired[:1]) == {'subscribed': 0, 'unsubscribed': 1}
+        unsubscribed = [frame['id'] for app in apps for frame in app.frames('unsubscribe')]
+        assert unsubscribed == [ids[('trades', '2330', (('intradayOddLot', True),))]]